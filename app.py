@@ -2,10 +2,23 @@
 """
 뉴스 크롤링 + 키워드 필터 + 종합 콘텐츠(블로그/스레드/카드뉴스) Streamlit 앱
 """
+import urllib.parse
+from typing import Optional
+
 import streamlit as st
 
-from crawler import crawl_articles, NewsArticle
-from content_synthesis import synthesize, SynthesizedContent
+from crawler import CrawlResult, NewsArticle
+from content_synthesis import SynthesizedContent
+from domain_health import get_domain_health
+from jobs import Job, get_job_manager, submit_crawl, submit_synthesis
+from startup import start_warmup, startup_stats
+from tracing import to_jsonl
+from url_resolver import get_url_resolver
+
+# 슬라이더 최대 기사 수 (많이 모을 때는 기간·언어판 피드까지 함께 읽음)
+MAX_ARTICLES = 200
+# 진행 중인 작업을 다시 확인하는 간격(초)
+JOB_POLL_SECONDS = 0.5
 
 
 def collect_all_keywords(articles: list[NewsArticle]) -> list[str]:
@@ -27,24 +40,146 @@ def filter_articles_by_keyword(articles: list[NewsArticle], selected: list[str])
     return [a for a in articles if selected_set & set(a.keywords)]
 
 
+def current_job(name: str) -> Optional[Job]:
+    """세션이 들고 있는 작업 id(crawl_job / synthesis_job)의 현재 상태. 없거나 지워졌으면 None"""
+    return get_job_manager().get(st.session_state.get(name))
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_crawl_progress() -> None:
+    """
+    수집 작업의 진행 상황을 주기적으로 다시 그림 (이 부분만 다시 실행).
+    작업이 끝나면 앱 전체를 다시 실행해 결과를 표시한다.
+    """
+    job = current_job("crawl_job")
+    if job is None or job.finished:
+        st.rerun()
+    st.caption(f"수집 중... ({job.done}/{job.total})")
+    for i, (finished, a) in sorted((job.partial or {}).items()):
+        mark = "✅" if finished else "⏳"
+        st.markdown(f"{mark} **{i + 1}. {a.title[:80]}**")
+        if a.summary:
+            st.caption(a.summary[:150])
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def show_synthesis_progress() -> None:
+    """종합 작업 진행 중: 생성 중인 블로그 글을 주기적으로 다시 그리고, 끝나면 앱 전체를 다시 실행"""
+    job = current_job("synthesis_job")
+    if job is None or job.finished:
+        st.rerun()
+    st.caption("종합 분석 중...")
+    if job.partial:
+        st.markdown("#### 📝 블로그 글 (생성 중...)")
+        st.markdown(job.partial)
+
+
+def _crawl_hosts(crawl_trace) -> list[str]:
+    """크롤에서 실제로 요청한 언론사 호스트 (풀린 뉴스 링크는 언론사 주소 기준)"""
+    resolver = get_url_resolver()
+    targets = (resolver.target(t.url) for t in crawl_trace.articles if t.url)
+    hosts = (urllib.parse.urlsplit(url).netloc for url in targets if resolver.key(url) is None)
+    return list(dict.fromkeys(h for h in hosts if h))
+
+
+def render_trace_panel(panel, articles: Optional[CrawlResult], syn: Optional[SynthesizedContent]) -> None:
+    """사이드바: 기동 예열 시간과 마지막 크롤·종합 실행의 단계별 시간·대체 사유"""
+    crawl_trace = getattr(articles, "trace", None)
+    syn_trace = getattr(syn, "trace", None)
+    with panel.container():
+        startup = startup_stats()
+        st.markdown("**기동 준비**")
+        total = startup["steps"].get("warmup", {}).get("ms")
+        st.caption(f"예열 {startup['warmup']}" + (f" · {total:.0f}ms" if total is not None else "")
+                   + f" · 가동 {startup['uptime_s']:.0f}초")
+        if startup["steps"]:
+            st.dataframe([{"step": name, **info} for name, info in startup["steps"].items()], width="stretch")
+        if crawl_trace is None and syn_trace is None:
+            st.caption("실행 기록이 아직 없습니다.")
+            return
+        if crawl_trace is not None:
+            st.markdown("**크롤**")
+            st.caption(
+                f"전체 {crawl_trace.total_ms:.0f}ms · RSS {crawl_trace.rss_ms:.0f}ms ({crawl_trace.rss_items}건, {crawl_trace.rss_source or '-'}, 피드 {crawl_trace.rss_feeds}개) · "
+                f"수집 {crawl_trace.fetch_ms:.0f}ms · 키워드 {crawl_trace.keywords_ms:.0f}ms · 대체 {crawl_trace.fallback_count}건"
+            )
+            if crawl_trace.reused_articles:
+                st.caption(f"증분: 새 기사 {crawl_trace.new_articles}건 · 저장소 재사용 {crawl_trace.reused_articles}건")
+            if crawl_trace.duplicates:
+                st.caption(
+                    f"중복 {crawl_trace.duplicates}건 합침 · 요청 {crawl_trace.fetches_saved}건 · "
+                    f"프롬프트 약 {crawl_trace.prompt_chars_saved}자 절약"
+                )
+            if crawl_trace.rss_error:
+                st.caption(f"RSS 오류: {crawl_trace.rss_error}")
+            st.dataframe([
+                {
+                    "url": t.url, "bytes": t.download_bytes, "download_ms": t.download_ms, "cache": t.cache,
+                    "parse_ms": t.parse_ms, "summarize_ms": t.summarize_ms, "keywords_ms": t.keywords_ms,
+                    "timeout_s": t.timeout_s, "fallbacks": ", ".join(t.fallbacks), "error": t.error,
+                }
+                for t in crawl_trace.articles
+            ], width="stretch")
+            hosts = _crawl_hosts(crawl_trace)
+            if hosts:
+                st.markdown("**언론사 도메인 상태**")
+                st.dataframe(get_domain_health().host_stats(hosts), width="stretch")
+        if syn_trace is not None:
+            st.markdown("**종합**")
+            st.caption(
+                f"{syn_trace.backend or '-'} {syn_trace.model} · {syn_trace.total_ms:.0f}ms"
+                + (f" (첫 응답 {syn_trace.first_token_ms:.0f}ms)" if syn_trace.streamed else "")
+                + f" · 캐시 {syn_trace.cache or '-'}"
+                + (f" · 기사 {syn_trace.digests}건 요점 {syn_trace.digest_ms:.0f}ms · 요청 {syn_trace.requests}개"
+                   f" · 프롬프트 약 {syn_trace.prompt_tokens}토큰({syn_trace.prompt_chars}자) · 응답 {syn_trace.completion_chars}자"
+                   if syn_trace.requests else "")
+            )
+            if syn_trace.error:
+                st.caption(f"오류: {syn_trace.error}")
+        traces = [t for t in (crawl_trace, syn_trace) if t is not None]
+        st.download_button("추적 기록 JSONL 내려받기", to_jsonl(traces), file_name="trace.jsonl",
+                           mime="application/x-ndjson", key="trace_jsonl")
+
+
 def main():
     st.set_page_config(page_title="뉴스 크롤링 & 콘텐츠 요약", layout="wide")
+    # 첫 검색 전에 무거운 모듈·모델을 백그라운드에서 불러 둠 (프로세스당 한 번)
+    start_warmup()
     st.title("🔍 뉴스 키워드 검색 & 콘텐츠 요약")
 
-    query = st.text_input("검색 키워드", placeholder="예: 인공지능 규제")
-    max_articles = st.slider("수집 기사 수", min_value=5, max_value=10, value=10)
+    show_trace = st.sidebar.checkbox("실행 추적 보기", value=False)
+    trace_panel = st.sidebar.empty()
 
-    if not query.strip():
-        st.info("검색 키워드를 입력한 뒤 실행하세요.")
+    query = st.text_input("검색 키워드", placeholder="예: 인공지능 규제")
+    max_articles = st.slider("수집 기사 수", min_value=5, max_value=MAX_ARTICLES, value=10)
+
+    # 세션에는 작업 id와 검색 조건만 두고, 기사·종합 결과는 공용 작업 저장소에서 읽는다
+    if query.strip() and st.button("뉴스 수집 및 분석 실행"):
+        st.session_state["crawl_params"] = (query.strip(), max_articles)
+        st.session_state["crawl_job"] = submit_crawl(query.strip(), max_articles)
+        st.session_state["synthesis_job"] = None
+
+    crawl_job = current_job("crawl_job")
+    if crawl_job is None and st.session_state.get("crawl_params"):
+        # 보관 기간이 지나 지워진 작업은 다시 실행 (검색어 결과 캐시에 있으면 바로 끝남)
+        st.session_state["crawl_job"] = submit_crawl(*st.session_state["crawl_params"])
+        crawl_job = current_job("crawl_job")
+    articles: Optional[CrawlResult] = crawl_job.result if crawl_job is not None and crawl_job.status == "done" else None
+    syn_job = current_job("synthesis_job") if articles else None
+    syn: Optional[SynthesizedContent] = syn_job.result if syn_job is not None and syn_job.status == "done" else None
+    if show_trace:
+        render_trace_panel(trace_panel, articles, syn)
+
+    if crawl_job is None:
+        if not query.strip():
+            st.info("검색 키워드를 입력한 뒤 실행하세요.")
         return
-
-    if st.button("뉴스 수집 및 분석 실행"):
-        with st.spinner("뉴스 수집 및 요약·키워드 추출 중..."):
-            articles = crawl_articles(query.strip(), max_articles=max_articles)
-            st.session_state["articles"] = articles
-            st.session_state["synthesized"] = None
-
-    articles: list[NewsArticle] = st.session_state.get("articles") or []
+    if not crawl_job.finished:
+        show_crawl_progress()
+        st.stop()
+    if crawl_job.status == "failed":
+        st.error(f"뉴스 수집 실패: {crawl_job.error}")
+        st.stop()
 
     if not articles:
         st.stop()
@@ -67,21 +202,24 @@ def main():
             st.write(summary_display)
             kw_display = ", ".join(a.keywords) if a.keywords else "추출된 키워드 없음"
             st.caption(f"핵심키워드: {kw_display}")
-            st.link_button("기사 보기", a.url)
+            if a.alternates:
+                st.caption("같은 기사: " + " · ".join(f"[{source or url}]({url})" for source, url in a.alternates))
+            st.link_button("기사 보기", a.canonical_url or a.url)
 
     st.divider()
     st.subheader("📋 종합 콘텐츠")
     st.caption("수집한 기사를 바탕으로 핵심 주제, 블로그 글, 스레드, 카드뉴스 초안을 생성합니다.")
 
-    if st.session_state.get("synthesized") is None:
+    if syn_job is None:
         if st.button("종합 콘텐츠 생성 (핵심 주제 + 블로그/스레드/카드뉴스)"):
-            with st.spinner("종합 분석 중..."):
-                syn = synthesize(articles)
-                st.session_state["synthesized"] = syn
-        else:
-            st.info("👆 위 버튼을 누르면 핵심 주제, 블로그 글(1200자 내외), 스레드(200자 내외), 인스타 카드뉴스 5장이 생성됩니다.")
+            st.session_state["synthesis_job"] = submit_synthesis(articles, crawl_job.id)
+            st.rerun()
+        st.info("👆 위 버튼을 누르면 핵심 주제, 블로그 글(1200자 내외), 스레드(200자 내외), 인스타 카드뉴스 5장이 생성됩니다.")
+    elif not syn_job.finished:
+        show_synthesis_progress()
+    elif syn_job.status == "failed":
+        st.error(f"종합 실패: {syn_job.error}")
 
-    syn: SynthesizedContent | None = st.session_state.get("synthesized")
     if syn:
         st.markdown("---")
         st.markdown("#### 🎯 핵심 주제")
@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""
+수집한 기사 저장소 (증분 크롤용, SQLite).
+정규 URL을 키로 추출한 제목·요약·키워드·본문과 내용 해시를 보관해, 같은 주제를 다시 검색할 때
+바뀌지 않은 기사는 내려받거나 다시 처리하지 않고 채운다.
+본문은 zlib으로 압축해 저장하고, 보관 기간·건수 한도를 넘으면 오래 안 쓴 기사부터 지운다.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+# 이 시간이 지난 기사는 다시 내려받아 확인 (내용이 같으면 키워드는 재사용)
+ARTICLE_STALE_AFTER = 24 * 60 * 60
+ARTICLE_STORE_MAX_AGE = 30 * 24 * 60 * 60
+ARTICLE_STORE_MAX_ENTRIES = 20_000
+
+
+def content_hash(title: str, summary: str, raw_text: str) -> str:
+    """본문(없으면 제목·요약) 기준 내용 해시"""
+    text = raw_text or f"{title}\n{summary}"
+    return hashlib.sha1(text.encode("utf-8", "replace")).hexdigest()
+
+
+@dataclass
+class StoredArticle:
+    """저장소의 기사 한 건"""
+    url: str
+    canonical_url: str
+    title: str
+    summary: str
+    keywords: list[str]
+    source: str
+    raw_text: str
+    content_hash: str
+    stored_at: float
+    fresh: bool
+
+
+class ArticleStore:
+    """정규 URL → 처리된 기사 (스레드 간 공유)"""
+
+    def __init__(
+        self,
+        path: str,
+        stale_after: float = ARTICLE_STALE_AFTER,
+        max_age: float = ARTICLE_STORE_MAX_AGE,
+        max_entries: int = ARTICLE_STORE_MAX_ENTRIES,
+    ):
+        self.stale_after = stale_after
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._counters = {"fresh": 0, "stale": 0, "missing": 0, "stored": 0, "unchanged": 0, "evicted": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS articles ("
+            " canonical_url TEXT PRIMARY KEY, url TEXT, content_hash TEXT, title TEXT, summary TEXT,"
+            " keywords TEXT, source TEXT, body BLOB, stored_at REAL, last_used REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_used ON articles(last_used)")
+        self._conn.commit()
+
+    def lookup(self, canonical_urls: Iterable[str]) -> dict[str, StoredArticle]:
+        """저장된 기사 (신선도와 무관, .fresh로 구분). 찾은 기사의 사용 시각을 갱신한다."""
+        keys = list(dict.fromkeys(u for u in canonical_urls if u))
+        if not keys:
+            return {}
+        now = time.time()
+        found: dict[str, StoredArticle] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT canonical_url, url, title, summary, keywords, source, body, content_hash, stored_at"
+                    f" FROM articles WHERE canonical_url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for key, url, title, summary, keywords, source, body, digest, stored_at in rows:
+                    found[key] = StoredArticle(
+                        url=url, canonical_url=key, title=title, summary=summary,
+                        keywords=keywords.split("\n") if keywords else [], source=source,
+                        raw_text=zlib.decompress(body).decode("utf-8") if body else "",
+                        content_hash=digest, stored_at=stored_at,
+                        fresh=now - stored_at < self.stale_after,
+                    )
+            if found:
+                self._conn.executemany("UPDATE articles SET last_used = ? WHERE canonical_url = ?",
+                                       [(now, key) for key in found])
+                self._conn.commit()
+            fresh = sum(1 for s in found.values() if s.fresh)
+            self._counters["fresh"] += fresh
+            self._counters["stale"] += len(found) - fresh
+            self._counters["missing"] += len(keys) - len(found)
+        return found
+
+    def put_many(self, articles: Iterable) -> int:
+        """
+        처리된 기사(NewsArticle과 같은 필드) 저장. canonical_url이 없는 기사는 건너뜀.
+        내용 해시가 같은 기사는 저장 시각만 갱신한다. 저장한 건수 반환.
+        """
+        now = time.time()
+        rows = []
+        for a in articles:
+            key = a.canonical_url
+            if not key:
+                continue
+            rows.append((
+                key, a.url, content_hash(a.title, a.summary, a.raw_text), a.title, a.summary,
+                "\n".join(a.keywords), a.source,
+                sqlite3.Binary(zlib.compress(a.raw_text.encode("utf-8"), 6)) if a.raw_text else None,
+                now, now,
+            ))
+        if not rows:
+            return 0
+        with self._lock:
+            hashes: dict[str, str] = {}
+            for start in range(0, len(rows), 500):
+                chunk = [r[0] for r in rows[start:start + 500]]
+                hashes.update(self._conn.execute(
+                    f"SELECT canonical_url, content_hash FROM articles WHERE canonical_url IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall())
+            # SET 식은 갱신 전 행을 읽으므로 last_used에도 새 시각을 직접 넣는다
+            unchanged = [(now, now, r[0]) for r in rows if hashes.get(r[0]) == r[2]]
+            changed = [r for r in rows if hashes.get(r[0]) != r[2]]
+            self._conn.executemany("UPDATE articles SET stored_at = ?, last_used = ? WHERE canonical_url = ?", unchanged)
+            self._conn.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", changed)
+            self._counters["stored"] += len(changed)
+            self._counters["unchanged"] += len(unchanged)
+            self._prune(now)
+            self._conn.commit()
+        return len(rows)
+
+    def _prune(self, now: float) -> None:
+        """보관 기간이 지난 기사와 건수 한도를 넘는 오래 안 쓴 기사 삭제 (lock 보유 상태에서 호출)"""
+        evicted = self._conn.execute("DELETE FROM articles WHERE stored_at < ?", (now - self.max_age,)).rowcount
+        total = self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        if total > self.max_entries:
+            excess = total - int(self.max_entries * 0.9)
+            evicted += self._conn.execute(
+                "DELETE FROM articles WHERE canonical_url IN"
+                " (SELECT canonical_url FROM articles ORDER BY last_used LIMIT ?)",
+                (excess,),
+            ).rowcount
+        self._counters["evicted"] += max(0, evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM articles"
+            ).fetchone()
+            return {**self._counters, "entries": entries, "body_bytes": size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.commit()
+
+
+_store: Optional[ArticleStore] = None
+_store_failed = False
+_store_lock = threading.Lock()
+
+
+def get_article_store() -> Optional[ArticleStore]:
+    """프로세스 공용 기사 저장소. 디스크를 쓸 수 없으면 None (증분 모드 없이 동작)."""
+    global _store, _store_failed
+    if _store is not None or _store_failed:
+        return _store
+    with _store_lock:
+        if _store is None and not _store_failed:
+            try:
+                from http_cache import CACHE_DIR
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                _store = ArticleStore(os.path.join(CACHE_DIR, "articles.sqlite"))
+            except Exception:
+                _store_failed = True
+    return _store
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+여러 검색어를 한 번에 크롤하는 배치 파이프라인 (예약 실행·캐시 예열용, 브라우저 없이).
+
+    python batch.py queries.jsonl -o results.jsonl --max-articles 10 --concurrency 8 --rate 10
+    python batch.py queries.txt -o results.parquet --format parquet --incremental
+
+검색어 파일은 JSONL({"query": "...", "max_articles": 10} 또는 JSON 문자열) 또는 한 줄에 검색어 하나.
+모든 검색어의 RSS를 동시에 받은 뒤 기사 URL을 정규 주소로 합쳐 여러 검색어에 걸친 기사는 한 번만 받고,
+기사는 묶음 단위로 파싱·요약·키워드 추출한다. 결과는 검색어의 기사가 모두 준비되는 대로
+(검색어, 순위, 기사) 한 행씩 써서 메모리에 쌓아 두지 않으며, 검색어 결과 캐시도 채워 앱이 바로 쓰게 한다.
+"""
+import argparse
+import json
+import sys
+import time
+from typing import Optional, TextIO
+
+from crawler import MAX_CONCURRENCY, MULTI_QUERY_CHUNK_SIZE, NewsArticle, RateLimiter, crawl_many
+
+# 한 번에 내려받아 처리하는 기사 수 (키워드 배치 크기이기도 함)
+BATCH_CHUNK_SIZE = MULTI_QUERY_CHUNK_SIZE
+# 전체 요청 속도 한도 (초당 요청 수, 0이면 제한 없음)
+BATCH_RATE_LIMIT = 10.0
+BATCH_MAX_ARTICLES = 10
+
+def read_queries(path: str, default_max_articles: int = BATCH_MAX_ARTICLES) -> list[tuple[str, int]]:
+    """검색어 파일 읽기 ("-"면 표준 입력). 빈 줄·#주석과 중복 검색어는 건너뜀. Returns: [(검색어, 기사 수), ...]"""
+    f = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        queries: dict[str, int] = {}
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            max_articles = default_max_articles
+            try:
+                item = json.loads(line)
+            except ValueError:
+                item = line
+            if isinstance(item, dict):
+                max_articles = int(item.get("max_articles") or default_max_articles)
+                item = item.get("query") or item.get("keyword") or ""
+            if isinstance(item, str) and item.strip():
+                queries.setdefault(item.strip(), max_articles)
+        return list(queries.items())
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def _article_row(query: str, rank: int, article: NewsArticle) -> dict:
+    return {
+        "query": query,
+        "rank": rank,
+        "title": article.title,
+        "url": article.url,
+        "canonical_url": article.canonical_url,
+        "source": article.source,
+        "summary": article.summary,
+        "keywords": list(article.keywords),
+        "alternates": [{"source": source, "url": url} for source, url in article.alternates],
+    }
+
+
+class _JsonlWriter:
+    def __init__(self, out: TextIO):
+        self.out = out
+
+    def write(self, rows: list[dict]) -> None:
+        for row in rows:
+            self.out.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+    def close(self) -> None:
+        pass
+
+
+class _ParquetWriter:
+    """검색어 하나의 결과를 row group 하나로 씀 (pyarrow 필요)"""
+
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        alternate = pa.struct([("source", pa.string()), ("url", pa.string())])
+        self.schema = pa.schema([
+            ("query", pa.string()), ("rank", pa.int32()), ("title", pa.string()), ("url", pa.string()),
+            ("canonical_url", pa.string()), ("source", pa.string()), ("summary", pa.string()),
+            ("keywords", pa.list_(pa.string())), ("alternates", pa.list_(alternate)),
+        ])
+        self._writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: list[dict]) -> None:
+        if rows:
+            self._writer.write_table(self._pa.Table.from_pylist(rows, schema=self.schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def run_batch(
+    queries: list[tuple[str, int]],
+    write,
+    concurrency: int = MAX_CONCURRENCY,
+    rate: float = BATCH_RATE_LIMIT,
+    workers: Optional[int] = None,
+    keyword_method: Optional[str] = None,
+    incremental: Optional[bool] = None,
+    chunk_size: int = BATCH_CHUNK_SIZE,
+    warm_cache: bool = True,
+) -> dict:
+    """
+    [(검색어, 기사 수), ...]를 crawler.crawl_many로 크롤. 검색어의 기사가 모두 준비되면 write(행 리스트)를 호출한다.
+    concurrency는 동시 요청 수, rate는 RSS·기사를 합친 초당 요청 수 한도.
+    workers·keyword_method·incremental은 crawl_articles와 같고, warm_cache면 검색어 결과 캐시에도 넣는다.
+    Returns: 실행 요약 (검색어·기사·공유 기사·재사용·작성 행 수, 소요 시간)
+    """
+    start = time.perf_counter()
+    cache = None
+    if warm_cache:
+        from result_cache import get_query_cache
+        cache = get_query_cache()
+    summary = {"queries": len(queries)}
+    written = 0
+    for query, max_articles, result in crawl_many(
+        queries, concurrency=concurrency, rate=rate, workers=workers, keyword_method=keyword_method,
+        incremental=incremental, chunk_size=chunk_size, summary=summary,
+    ):
+        write([_article_row(query, rank, a) for rank, a in enumerate(result, 1)])
+        written += len(result)
+        if cache is not None:
+            cache.put(query, max_articles, result)
+    return {
+        **{k: summary[k] for k in ("queries", "articles", "unique_articles", "shared_articles",
+                                   "reused_articles", "fetched_articles")},
+        "rows": written,
+        "keywords_ms": summary["keywords_ms"],
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="여러 검색어 배치 크롤 (결과를 JSONL/Parquet으로 저장)")
+    parser.add_argument("queries", help="검색어 파일 (JSONL 또는 한 줄에 하나, '-'면 표준 입력)")
+    parser.add_argument("-o", "--out", default="-", help="출력 파일 ('-'면 표준 출력, JSONL만)")
+    parser.add_argument("--format", choices=("jsonl", "parquet"), help="출력 형식 (기본: 확장자로 판단)")
+    parser.add_argument("--max-articles", type=int, default=BATCH_MAX_ARTICLES, help="검색어별 기사 수 기본값")
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--rate", type=float, default=BATCH_RATE_LIMIT, help="초당 요청 수 한도 (0이면 제한 없음)")
+    parser.add_argument("--chunk-size", type=int, default=BATCH_CHUNK_SIZE, help="한 번에 처리하는 기사 수")
+    parser.add_argument("--parse-workers", type=int, default=None, help="파싱 프로세스 풀 워커 수")
+    parser.add_argument("--keyword-method", default=None, help="auto / keybert / tfidf / frequency")
+    parser.add_argument("--incremental", action="store_true", help="기사 저장소의 기사 재사용")
+    parser.add_argument("--no-warm-cache", action="store_true", help="검색어 결과 캐시를 채우지 않음")
+    args = parser.parse_args(argv)
+
+    queries = read_queries(args.queries, args.max_articles)
+    if not queries:
+        print("검색어가 없습니다.", file=sys.stderr)
+        return 1
+    fmt = args.format or ("parquet" if args.out.endswith(".parquet") else "jsonl")
+    if fmt == "parquet":
+        if args.out == "-":
+            print("Parquet은 파일로만 쓸 수 있습니다.", file=sys.stderr)
+            return 1
+        try:
+            writer = _ParquetWriter(args.out)
+        except ImportError:
+            print("Parquet 출력에는 pyarrow가 필요합니다 (pip install pyarrow).", file=sys.stderr)
+            return 1
+        out = None
+    else:
+        out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+        writer = _JsonlWriter(out)
+    try:
+        summary = run_batch(
+            queries, writer.write,
+            concurrency=args.concurrency, rate=args.rate, workers=args.parse_workers,
+            keyword_method=args.keyword_method, incremental=args.incremental or None,
+            chunk_size=args.chunk_size, warm_cache=not args.no_warm_cache,
+        )
+    finally:
+        writer.close()
+        if out is not None and out is not sys.stdout:
+            out.close()
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
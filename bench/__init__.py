@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""오프라인 벤치마크 (녹화 코퍼스 + 로컬 대역 서버)"""
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+종합 단계 점검: openai 패키지나 네트워크 없이 가짜 chat-completions 클라이언트로
+content_synthesis의 결과물별 동시 요청, 토큰 예산 채우기, 생성 결과·요점 캐시와
+블로그 글 스트리밍(생성 중인 글이 순서대로 전달되는지, 작업 진행 상황에 남는지)을 확인한다.
+응답 내용은 대역 서버 스텁(bench.server)과 같으며, 실패한 항목이 있으면 종료 코드 1.
+
+    python -m bench.check_synthesis
+"""
+import json
+import os
+import sys
+import threading
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+from bench.server import _stub_completion
+
+STREAM_PIECE = 40  # 대역 서버 _send_stream과 같은 조각 크기
+
+
+class FakeClient:
+    """client.chat.completions.create만 흉내 내는 가짜 클라이언트. 받은 요청을 calls에 남긴다."""
+
+    def __init__(self, concurrent_parts: int = 0, blog: Optional[str] = None, on_piece: Optional[Callable[[], None]] = None):
+        self.calls: list[dict] = []
+        self.chunks: list[str] = []  # 스트리밍으로 보낸 조각 (순서대로)
+        self._lock = threading.Lock()
+        # concurrent_parts건의 스트리밍 아닌 요청이 모두 동시에 들어와야 통과하는 장벽
+        self._barrier = threading.Barrier(concurrent_parts, timeout=5) if concurrent_parts else None
+        # blog가 있으면 블로그 글을 바꾸고 JSON을 ASCII 이스케이프로 보냄 (\uXXXX가 조각 경계에 걸리게)
+        self.blog = blog
+        self.on_piece = on_piece  # 스트리밍 조각을 하나 보내기 직전마다 호출
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: list, temperature: Optional[float] = None, stream: bool = False):
+        data = _stub_completion({"messages": messages})
+        if self.blog is not None and "blog_post" in data:
+            data = {**data, "blog_post": self.blog}
+        content = json.dumps(data, ensure_ascii=self.blog is not None)
+        with self._lock:
+            self.calls.append({"prompt": messages[-1]["content"], "stream": stream, "thread": threading.current_thread().name})
+        if not stream:
+            if self._barrier is not None:
+                self._barrier.wait()
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        pieces = [content[i:i + STREAM_PIECE] for i in range(0, len(content), STREAM_PIECE)]
+        self.chunks.extend(pieces)
+        return self._stream(pieces)
+
+    def _stream(self, pieces: list[str]):
+        for piece in pieces:
+            if self.on_piece is not None:
+                self.on_piece()
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+def _articles(n: int) -> list:
+    """서로 다른 본문을 가진 기사 n건 (요점 추출 대상이 되도록 문장 여러 개)"""
+    from crawler import NewsArticle
+    return [
+        NewsArticle(title=f"인공지능 규제 기사 {i}", url=f"https://example.com/{i}", summary=f"요약 {i}",
+                    raw_text=" ".join(f"기사 {i}의 {k}번째 문장은 인공지능 규제와 산업 동향을 설명한다." for k in range(12)))
+        for i in range(n)
+    ]
+
+
+def _use_client(client) -> None:
+    """content_synthesis가 client를 공용 클라이언트로 쓰게 함 (키·주소가 같으면 새로 만들지 않음)"""
+    import content_synthesis
+    os.environ["OPENAI_API_KEY"] = "stub"
+    content_synthesis._client = client
+    content_synthesis._client_key = ("stub", os.environ.get("OPENAI_BASE_URL", ""))
+
+
+def run_checks() -> list[str]:
+    """점검 결과 줄 목록 ("ok ..." / "FAIL ...")"""
+    import content_synthesis as cs
+    results = []
+
+    def check(label: str, ok: bool, detail: str = "") -> None:
+        results.append(f"{'ok  ' if ok else 'FAIL'} {label}" + (f" ({detail})" if detail and not ok else ""))
+
+    cs.synthesis_cache.clear()
+    cs.digest_cache.clear()
+    others = [p for p in cs._PARTS if p != "blog_post"]
+
+    # 결과물별 요청: 블로그만 스트리밍, 나머지 셋은 동시에 (장벽을 함께 넘어야 함)
+    client = FakeClient(concurrent_parts=len(others))
+    _use_client(client)
+    articles = _articles(200)
+    result = cs.synthesize(articles, on_blog=lambda blog: None)
+    trace = result.trace
+    check("openai backend used", trace.backend == "openai", f"backend={trace.backend} error={trace.error}")
+    check("one request per part", len(client.calls) == len(cs._PARTS) and trace.requests == len(cs._PARTS),
+          f"calls={len(client.calls)} requests={trace.requests}")
+    streamed = [c for c in client.calls if c["stream"]]
+    check("only the blog request streams", len(streamed) == 1 and '"blog_post"' in streamed[0]["prompt"])
+    check("other parts ran concurrently", len({c["thread"] for c in client.calls if not c["stream"]}) == len(others))
+    stub = _stub_completion({"messages": [{"content": ""}]})
+    check("parts assembled", result.core_theme == stub["core_theme"] and result.blog_post == stub["blog_post"]
+          and result.thread_content == stub["thread_content"] and result.instagram_cards == stub["instagram_cards"])
+
+    # 토큰 예산: 기사 200건 중 예산에 드는 만큼만, 짧은 결과물에는 같은 요점 목록의 앞부분
+    blocks = cs._context_blocks(articles)
+    context, packed = cs._pack(blocks, cs.SYNTHESIS_TOKEN_BUDGET)
+    brief, brief_packed = cs._pack(blocks, cs.SYNTHESIS_BRIEF_TOKENS)
+    check("context within token budget", cs.estimate_tokens(context) <= cs.SYNTHESIS_TOKEN_BUDGET,
+          f"{cs.estimate_tokens(context)} > {cs.SYNTHESIS_TOKEN_BUDGET}")
+    check("budget packs a subset of articles", 0 < packed < len(articles) and trace.digests == packed,
+          f"packed={packed} trace={trace.digests}")
+    check("brief context is a prefix", 0 < brief_packed < packed and context.startswith(brief))
+    blog_prompt = streamed[0]["prompt"] if streamed else ""
+    check("blog prompt carries the full context", context in blog_prompt)
+    check("short parts carry the brief context",
+          all(brief in c["prompt"] and context not in c["prompt"] for c in client.calls if not c["stream"]))
+
+    # 캐시: 같은 기사 묶음은 요청 없이 생성 결과 캐시에서, 요점은 내용 해시로 재사용
+    digest_hits = cs.digest_cache.stats()["hit"]
+    again = FakeClient()
+    _use_client(again)
+    cached = cs.synthesize(articles)
+    check("second run is a cache hit", cached.trace.cache == "hit" and not again.calls,
+          f"cache={cached.trace.cache} calls={len(again.calls)}")
+    check("digests reused by content hash", cs.digest_cache.stats()["hit"] - digest_hits >= packed)
+    changed = _articles(200)
+    changed[0].title += " (수정)"
+    changed[1].raw_text = "본문이 바뀐 기사다. " * 6
+    digest_misses = cs.digest_cache.stats()["miss"]
+    cs.synthesize(changed)
+    check("changed articles miss the cache", len(again.calls) == len(cs._PARTS), f"calls={len(again.calls)}")
+    check("only the changed body is digested again", cs.digest_cache.stats()["miss"] - digest_misses == 1)
+    results += check_streaming()
+    return results
+
+
+# 이스케이프가 필요한 문자(줄바꿈, 따옴표, 역슬래시)와 한글이 섞인 블로그 글
+STREAM_BLOG = "".join(f'{k}번째 문단: "인공지능" 규제\\해설\n' for k in range(20))
+
+
+def check_streaming() -> list[str]:
+    """블로그 글 스트리밍: on_blog와 종합 작업의 partial로 생성 중인 글이 순서대로 전달되는지"""
+    import content_synthesis as cs
+    from jobs import get_job_manager, submit_synthesis
+    results = []
+
+    def check(label: str, ok: bool, detail: str = "") -> None:
+        results.append(f"{'ok  ' if ok else 'FAIL'} {label}" + (f" ({detail})" if detail and not ok else ""))
+
+    def in_order(partials: list[str], final: str) -> bool:
+        return bool(partials) and all(
+            a != b and b.startswith(a) for a, b in zip(partials, partials[1:])
+        ) and final.startswith(partials[-1])
+
+    articles = _articles(5)
+    cs.synthesis_cache.clear()
+    client = FakeClient(blog=STREAM_BLOG)
+    _use_client(client)
+    partials: list[str] = []
+    result = cs.synthesize(articles, on_blog=partials.append)
+    streamed = "".join(client.chunks)
+    check("stream split into several pieces", len(client.chunks) > 10, f"pieces={len(client.chunks)}")
+    check("partial blog reported in order", in_order(partials, result.blog_post), f"partials={len(partials)}")
+    check("last partial is the full blog", bool(partials) and partials[-1] == STREAM_BLOG)
+    check("final blog equals the concatenated stream",
+          result.blog_post == json.loads(streamed)["blog_post"] == STREAM_BLOG)
+    check("first token time recorded", result.trace.streamed and result.trace.first_token_ms > 0)
+
+    # 종합 작업: 조각을 보내기 직전마다 작업의 partial(지금까지의 블로그 글)을 읽어 둠
+    cs.synthesis_cache.clear()
+    manager = get_job_manager()
+    job_id: list[str] = []
+    ready = threading.Event()
+    seen: list[str] = []
+
+    def on_piece() -> None:
+        ready.wait(5)
+        partial = manager.get(job_id[0]).partial
+        if partial and (not seen or seen[-1] != partial):
+            seen.append(partial)
+
+    _use_client(FakeClient(blog=STREAM_BLOG, on_piece=on_piece))
+    job_id.append(submit_synthesis(articles, "check-streaming"))
+    ready.set()
+    job = manager.get(job_id[0])
+    while job is not None and not job.finished:
+        threading.Event().wait(0.01)
+        job = manager.get(job_id[0])
+    check("synthesis job finished", job is not None and job.status == "done", job.error if job else "evicted")
+    final = job.result.blog_post if job is not None and job.result is not None else ""
+    check("job partial reported in order", in_order(seen, final) and len(seen) > 5, f"partials={len(seen)}")
+    check("job result equals the streamed blog", final == STREAM_BLOG)
+    check("job partial cleared when done", job is not None and job.partial is None)
+    return results
+
+
+def main() -> int:
+    results = run_checks()
+    for line in results:
+        print(line)
+    return 1 if any(line.startswith("FAIL") for line in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+모듈 단위 점검: 네트워크·선택 의존성 없이 저장소, 토큰화, 피드 파싱, 도메인 상태 등
+작은 동작을 임시 디렉터리와 가짜 응답으로 확인한다. 실패한 항목이 있으면 종료 코드 1.
+
+    python -m bench.check_units
+"""
+import os
+import sqlite3
+import sys
+import tempfile
+from typing import Callable
+
+Check = Callable[[str, bool, str], None]
+_GROUPS: list[Callable[[Check], None]] = []
+
+
+def _group(fn: Callable[[Check], None]) -> Callable[[Check], None]:
+    _GROUPS.append(fn)
+    return fn
+
+
+def _article(url: str, raw_text: str):
+    from crawler import NewsArticle
+    return NewsArticle(title="제목", url=url, summary="요약", raw_text=raw_text, canonical_url=url)
+
+
+@_group
+def check_article_store(check: Check) -> None:
+    """바뀌지 않은 기사를 다시 저장하면 저장 시각과 사용 시각이 모두 새 시각이 되는지"""
+    from unittest import mock
+
+    import article_store
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "articles.sqlite")
+        store = article_store.ArticleStore(path)
+        article = _article("https://example.com/a", "본문")
+        with mock.patch.object(article_store.time, "time", return_value=100.0):
+            store.put_many([article])
+        with mock.patch.object(article_store.time, "time", return_value=999.0):
+            store.put_many([article])
+        row = sqlite3.connect(path).execute("SELECT stored_at, last_used FROM articles").fetchone()
+        check("unchanged article re-stored with the new time", row == (999.0, 999.0), f"row={row}")
+        check("unchanged article counted", store.stats()["unchanged"] == 1, str(store.stats()))
+
+
+@_group
+def check_tokens(check: Check) -> None:
+    """서술어 활용형은 버리고, 끝이 '다'·'할'인 명사(지명·국가명 등)는 키워드로 남기는지"""
+    from keyword_engine import _token
+    nouns = ["바다", "캐나다", "판다", "플로리다", "네바다", "르완다", "우간다", "역할"]
+    kept = [w for w in nouns if _token(w) != w]
+    check("nouns ending in 다/할 kept", not kept, f"dropped={kept}")
+    predicates = ["했다", "한다", "된다", "있다", "없다", "밝혔다", "말했다고", "올랐다", "보인다", "떨어졌다", "발표할", "추진하며"]
+    leaked = [w for w in predicates if _token(w) is not None]
+    check("predicates dropped regardless of length", not leaked, f"kept={leaked}")
+
+    josa_like = ["민주주의", "자본주의", "고양이", "전문가", "고속도로", "경기도"]
+    broken = {w: _token(w) for w in josa_like if _token(w) != w}
+    check("nouns ending like a particle kept whole", not broken, f"got={broken}")
+    stripped = {"민주주의가": "민주주의", "전문가의": "전문가", "고속도로로": "고속도로", "경기도는": "경기도",
+                "정부가": "정부", "기업의": "기업", "미국과": "미국", "대통령이": "대통령"}
+    wrong = {w: _token(w) for w, stem in stripped.items() if _token(w) != stem}
+    check("particles still stripped after nouns", not wrong, f"got={wrong}")
+
+
+@_group
+def check_idf_table(check: Check) -> None:
+    """토큰화 규칙 버전이 다른 문서 빈도 표는 열 때 비워지는지 (예전 규칙의 잘린 어간이 남지 않게)"""
+    import keyword_engine
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "idf.sqlite")
+        keyword_engine.IdfTable(path).add({"doc": ["민주주"]})
+        check("table kept under the same version", keyword_engine.IdfTable(path).stats() == {"docs": 1, "terms": 1})
+        conn = sqlite3.connect(path)
+        conn.execute("UPDATE meta SET value = '0' WHERE key = 'tokenizer'")
+        conn.commit()
+        check("table cleared when the tokenizer changes", keyword_engine.IdfTable(path).stats() == {"docs": 0, "terms": 0})
+
+
+@_group
+def check_feed_parsing(check: Check) -> None:
+    """피드 제목·요약의 HTML 참조(&nbsp; 등)에서 글이 끊기지 않는지, 빈·깨진 본문은 feedparser로 넘기는지"""
+    from unittest import mock
+
+    import feedparser
+
+    from crawler import _parse_feed
+    feed = (b"<rss><channel><item><title>A &nbsp;B &middot; C &amp; D &hellip; &bogus; E</title>"
+            b"<link>https://example.com/1</link><source>S&nbsp;1</source>"
+            b"<description>&lt;b&gt;x&lt;/b&gt;&nbsp;y</description></item></channel></rss>")
+    entries = _parse_feed(feed)
+    expected = [("A \xa0B · C & D … &bogus; E", "https://example.com/1", "S\xa01", "x y")]
+    check("entities in feed titles kept", entries == expected, f"got={entries}")
+    for label, body in (("empty", b""), ("broken", b"<<<not xml")):
+        with mock.patch.object(feedparser, "parse", wraps=feedparser.parse) as parse:
+            try:
+                result = _parse_feed(body)
+                ok, detail = parse.called and result == [], f"called={parse.called} result={result}"
+            except Exception as e:
+                ok, detail = False, f"{type(e).__name__}: {e}"
+        check(f"{label} feed falls back to feedparser", ok, detail)
+
+
+@_group
+def check_domain_health_redirect(check: Check) -> None:
+    """차단 시간이 지난 호스트의 시험 요청이 다른 호스트로 리다이렉트돼도 시험이 끝나고 차단기가 닫히는지"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from unittest import mock
+
+    import crawler
+    from domain_health import DomainHealth
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.headers.get("Host", "").startswith("127.0.0.1"):
+                self.send_response(301)
+                self.send_header("Location", f"http://localhost:{self.server.server_port}/page")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            body = b"<html><body>ok</body></html>"
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        host = f"127.0.0.1:{server.server_port}"
+        health = DomainHealth()
+        for _ in range(3):
+            health.record(host, 0.1, ok=False)
+        health._hosts[host].opened_until = 1.0  # 차단 시간이 지나 시험 요청을 기다리는 상태
+        with mock.patch.object(crawler, "get_domain_health", return_value=health), \
+                mock.patch.object(crawler, "get_http_cache", return_value=None):
+            fetched = crawler._fetch_bytes(f"http://{host}/article", timeout=5)
+        check("redirected trial fetched", fetched is not None and b"ok" in fetched[0])
+        check("trial host released after a cross-host redirect", host not in health._trials, f"trials={health._trials}")
+        check("breaker closed by the successful trial", health.allow(host) and health.stats()["closed"] == 1,
+              str(health.host_stats([host])))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@_group
+def check_streamed_keywords(check: Check) -> None:
+    """
+    iter_articles(앱의 스트리밍 경로)의 tfidf 키워드가 crawl_articles와 같은지.
+    본문이 거의 같아 합쳐지는 기사가 있어도 임시 키워드가 IDF 표에 들어가 결과가 달라지지 않아야 한다.
+    """
+    from unittest import mock
+
+    import crawler
+    import keyword_engine
+    seed = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "seed")
+    pages = {}
+    for name in ("ko-ai-law", "ko-ai-industry", "ko-large", "ko-paragraphs", "ko-short"):
+        with open(os.path.join(seed, f"{name}.html"), encoding="utf-8") as f:
+            pages[f"https://example.com/{name}"] = f.read()
+    # 다른 제목으로 실린 거의 같은 본문 (본문 지문으로 합쳐짐)
+    law = pages["https://example.com/ko-ai-law"]
+    pages["https://example.org/copy"] = law.replace("<p>", "<p>(연합뉴스 제공) ", 1)
+    tuples = [(f"기사 {k} {url.rsplit('/', 1)[-1]}", url, "매체", "") for k, url in enumerate(pages)]
+    tuples[-1] = ("전혀 다른 제목으로 나간 같은 기사", tuples[-1][1], "다른 매체", "")
+
+    def fetched(urls, **kwargs):
+        for i, url in enumerate(urls):
+            yield i, pages[url]
+
+    def crawl(streamed: bool) -> tuple[list[tuple[str, list[str]]], dict]:
+        table = keyword_engine._idf_table = keyword_engine.IdfTable()
+        options = dict(max_articles=len(tuples), workers=0, keyword_method="tfidf", incremental=False)
+        if streamed:
+            last = {}
+            for i, article in crawler.iter_articles("질의", **options):
+                last[i] = article
+            articles = [last[i] for i in sorted(last) if last[i] is not None]
+        else:
+            articles = crawler.crawl_articles("질의", **options)
+        return [(a.url, a.keywords) for a in articles], table.stats()
+
+    saved = keyword_engine._idf_table
+    try:
+        with mock.patch.object(crawler, "fetch_news_urls", return_value=tuples), \
+                mock.patch.object(crawler, "_iter_fetched", side_effect=fetched), \
+                mock.patch.object(crawler, "_store_articles"):
+            (batch, batch_table), (streamed, streamed_table) = crawl(False), crawl(True)
+    finally:
+        keyword_engine._idf_table = saved
+    check("near-duplicate body merged", len(batch) == len(tuples) - 1, f"articles={len(batch)}")
+    check("streaming adds the same documents to the IDF table", batch_table == streamed_table,
+          f"crawl={batch_table} iter={streamed_table}")
+    diff = [(a, b) for a, b in zip(batch, streamed) if a != b]
+    check("streamed tfidf keywords match crawl_articles", batch == streamed and not diff, f"diff={diff[:2]}")
+
+
+def run_checks() -> list[str]:
+    """점검 결과 줄 목록 ("ok ..." / "FAIL ...")"""
+    results = []
+
+    def check(label: str, ok: bool, detail: str = "") -> None:
+        results.append(f"{'ok  ' if ok else 'FAIL'} {label}" + (f" ({detail})" if detail and not ok else ""))
+
+    for group in _GROUPS:
+        try:
+            group(check)
+        except Exception as e:
+            check(group.__name__, False, f"{type(e).__name__}: {e}")
+    return results
+
+
+def main() -> int:
+    results = run_checks()
+    for line in results:
+        print(line)
+    return 1 if any(line.startswith("FAIL") for line in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+실제 Google News RSS와 기사 페이지를 녹화해 벤치마크 코퍼스로 저장.
+
+    python -m bench.record --name live-2026-10 "인공지능 규제" "반도체 수출" "ai regulation"
+
+피드의 기사 링크는 {{BASE}}/articles/<슬러그>로 바꿔 저장하며,
+원본 Content-Type(문자셋 포함)과 바이트를 그대로 보존한다.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import urllib.parse
+from typing import Optional
+
+import requests
+
+from bench.server import FIXTURES_DIR
+
+RSS_URL = "https://news.google.com/rss/search?q={q}&hl={hl}&gl={gl}&ceid={gl}:{hl}"
+
+
+def record(name: str, queries: list[str], max_items: int = 10, hl: str = "ko", gl: str = "KR") -> str:
+    from crawler import REQUEST_HEADERS
+
+    root = os.path.join(FIXTURES_DIR, name)
+    os.makedirs(root, exist_ok=True)
+    manifest = {"origin": f"recorded from news.google.com ({hl}-{gl})", "articles": {}, "feeds": {}}
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    for qi, query in enumerate(queries):
+        r = session.get(RSS_URL.format(q=urllib.parse.quote_plus(query), hl=hl, gl=gl), timeout=15)
+        r.raise_for_status()
+        feed = r.content
+        import feedparser
+        entries = feedparser.parse(feed).entries[:max_items]
+        for e in entries:
+            link = e.get("link")
+            if not link:
+                continue
+            slug = hashlib.sha1(link.encode()).hexdigest()[:12]
+            path = f"/articles/{slug}"
+            feed = feed.replace(link.encode(), b"{{BASE}}" + path.encode())
+            if path in manifest["articles"]:
+                continue
+            page = _fetch(session, link)
+            if page is None:
+                continue
+            body, content_type = page
+            filename = f"{slug}.html"
+            with open(os.path.join(root, filename), "wb") as f:
+                f.write(body)
+            manifest["articles"][path] = {"file": filename, "content_type": content_type, "source_url": link}
+        filename = f"rss-{qi}.xml"
+        with open(os.path.join(root, filename), "wb") as f:
+            f.write(feed)
+        manifest["feeds"][query] = filename
+    manifest["default_feed"] = queries[0]
+    with open(os.path.join(root, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    return root
+
+
+def _fetch(session: requests.Session, url: str) -> Optional[tuple[bytes, str]]:
+    try:
+        r = session.get(url, timeout=15)
+        r.raise_for_status()
+        return r.content, r.headers.get("Content-Type", "text/html")
+    except Exception:
+        return None
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Google News 코퍼스 녹화")
+    parser.add_argument("queries", nargs="+")
+    parser.add_argument("--name", required=True, help="bench/fixtures 아래 저장할 코퍼스 이름")
+    parser.add_argument("--max-items", type=int, default=10)
+    parser.add_argument("--hl", default="ko")
+    parser.add_argument("--gl", default="KR")
+    args = parser.parse_args(argv)
+    print(record(args.name, args.queries, args.max_items, args.hl, args.gl))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 벤치마크: 녹화 코퍼스를 로컬 대역 서버로 재생하면서
+fetch_news_urls → crawl_articles → summarize_text / extract_keywords → synthesize 단계별 지연을 측정.
+
+    python -m bench.run --iterations 3 --latency-ms 80 --jitter-ms 40 --fail-rate 0.1 \\
+        --save bench/baselines/local.json
+    python -m bench.run --compare bench/baselines/local.json
+    python -m bench.run --feed-items 80 --max-articles 80 --parse-workers 4   # 대규모 크롤 + 프로세스 풀
+    python -m bench.run --redirect-links   # Google 뉴스식 리다이렉트 링크 (두 번째 반복부터 언론사로 직행)
+    python -m bench.run --incremental      # 증분 크롤 (두 번째 반복부터 기사 저장소에서 채움)
+    python -m bench.run --llm-stub         # 대역 서버의 chat-completions 스텁으로 합성 (openai 패키지 필요)
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from bench.server import FaultConfig, StandInServer
+
+STAGES = ("fetch_news_urls", "crawl_articles", "summarize_text", "extract_keywords", "synthesize")
+
+
+def _percentile(sorted_samples: list[float], q: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    k = (len(sorted_samples) - 1) * q
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_samples) - 1)
+    return sorted_samples[lo] + (sorted_samples[hi] - sorted_samples[lo]) * (k - lo)
+
+
+def summarize_samples(samples: list[float], items: int) -> dict:
+    """초 단위 표본 → ms 단위 백분위와 처리량"""
+    s = sorted(samples)
+    total = sum(s)
+    return {
+        "count": len(s),
+        "p50_ms": round(_percentile(s, 0.50) * 1000, 3),
+        "p90_ms": round(_percentile(s, 0.90) * 1000, 3),
+        "p99_ms": round(_percentile(s, 0.99) * 1000, 3),
+        "mean_ms": round(total / len(s) * 1000, 3) if s else 0.0,
+        "max_ms": round(s[-1] * 1000, 3) if s else 0.0,
+        "items": items,
+        "throughput_per_s": round(items / total, 3) if total else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """프로세스 최대 RSS (MB). Linux는 KB, macOS는 바이트 단위로 보고된다."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class StageTimer:
+    """단계별 소요 시간과 처리 항목 수 누적"""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = {s: [] for s in STAGES}
+        self.items: dict[str, int] = {s: 0 for s in STAGES}
+        self.rss_after: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, stage: str, items: int = 1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[stage].append(time.perf_counter() - start)
+            self.items[stage] += items
+            self.rss_after[stage] = peak_rss_mb()
+
+    def report(self) -> dict:
+        return {
+            s: {**summarize_samples(self.samples[s], self.items[s]), "peak_rss_mb_after": self.rss_after.get(s, 0.0)}
+            for s in STAGES if self.samples[s]
+        }
+
+
+@contextmanager
+def _pointed_at(server: StandInServer, cache_dir: str, llm_stub: bool):
+    """파이프라인 모듈들이 대역 서버와 임시 캐시를 쓰도록 전환 (종료 시 원복)"""
+    saved_env = {k: os.environ.get(k) for k in ("NEWS_BASE_URL", "NEWS_CACHE_DIR", "OPENAI_API_KEY", "OPENAI_BASE_URL")}
+    os.environ["NEWS_BASE_URL"] = server.base_url
+    os.environ["NEWS_CACHE_DIR"] = cache_dir
+    if llm_stub:
+        os.environ["OPENAI_API_KEY"] = "stub"
+        os.environ["OPENAI_BASE_URL"] = server.base_url + "/v1"
+    else:
+        os.environ.pop("OPENAI_API_KEY", None)
+    import crawler
+    import http_cache
+    import article_store
+    import domain_health
+    import keyword_engine
+    import url_resolver
+    saved_base, saved_cache = crawler.GOOGLE_NEWS_BASE, (http_cache.CACHE_DIR, http_cache._cache, http_cache._cache_failed)
+    saved_idf, saved_resolver = keyword_engine._idf_table, url_resolver._resolver
+    saved_store = article_store._store, article_store._store_failed
+    saved_health = domain_health._health
+    crawler.GOOGLE_NEWS_BASE = server.base_url
+    http_cache.CACHE_DIR, http_cache._cache, http_cache._cache_failed = cache_dir, None, False
+    keyword_engine._idf_table = url_resolver._resolver = None
+    article_store._store, article_store._store_failed = None, False
+    domain_health._health = None
+    try:
+        yield
+    finally:
+        crawler.GOOGLE_NEWS_BASE = saved_base
+        http_cache.CACHE_DIR, http_cache._cache, http_cache._cache_failed = saved_cache
+        keyword_engine._idf_table, url_resolver._resolver = saved_idf, saved_resolver
+        article_store._store, article_store._store_failed = saved_store
+        domain_health._health = saved_health
+        for k, v in saved_env.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def run_benchmark(
+    corpus: str = "seed",
+    iterations: int = 3,
+    max_articles: int = 10,
+    faults: Optional[FaultConfig] = None,
+    warm_cache: bool = False,
+    llm_stub: bool = False,
+    feed_items: int = 0,
+    parse_workers: int = 0,
+    redirect_links: bool = False,
+    incremental: bool = False,
+) -> dict:
+    """
+    코퍼스의 모든 질의에 대해 파이프라인을 iterations회 실행하고 결과 dict 반환.
+    warm_cache=False면 매 반복 전에 HTTP 캐시를 비워 콜드 상태로 측정한다.
+    feed_items로 피드를 늘려 대규모 크롤을, parse_workers로 파싱 프로세스 풀을 측정한다
+    (풀 기동·모델 로드는 측정 전에 끝낸다). 늘린 피드의 복제본은 본문이 같으므로 중복 묶기 없이 크롤하고,
+    크롤마다 요청한 기사 수가 모두 돌아왔는지 확인한다 (모자라면 RuntimeError).
+    redirect_links면 피드 링크가 리다이렉트를 거치며, 풀어 둔 대응표는 반복 사이에 유지된다.
+    incremental이면 증분 크롤로 측정하며, 기사 저장소도 반복 사이에 유지된다.
+    llm_stub이면 openai 패키지가 있어야 하며(없으면 RuntimeError), 실제로 쓴 종합 방식별 횟수를 결과에 남긴다.
+    """
+    if llm_stub:
+        from startup import available
+        if not available("openai"):
+            raise RuntimeError("--llm-stub needs the openai package (pip install openai); "
+                               "without it synthesis would silently use the template path")
+    faults = faults or FaultConfig()
+    backends: dict[str, int] = {}
+    timer = StageTimer()
+    wall_start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as cache_dir, StandInServer(corpus, faults, feed_items=feed_items, redirect_links=redirect_links) as server, \
+            _pointed_at(server, cache_dir, llm_stub):
+        from content_synthesis import digest_cache, synthesis_cache, synthesize
+        from crawler import crawl_articles, fetch_news_urls
+        from http_cache import get_http_cache
+        from parse_pool import warm_parse_pool
+        from summarizer import extract_keywords, summarize_text
+        from article_store import get_article_store
+        from url_resolver import get_url_resolver
+        from domain_health import get_domain_health
+        from startup import startup_stats
+
+        pool_processes = warm_parse_pool(parse_workers) if parse_workers else 0
+
+        queries = server.corpus.queries
+        for _ in range(iterations):
+            cache = get_http_cache()
+            if cache and not warm_cache:
+                cache.clear()
+            if not warm_cache:
+                synthesis_cache.clear()
+                digest_cache.clear()
+            for query in queries:
+                with timer.measure("fetch_news_urls"):
+                    urls = fetch_news_urls(query, max_items=max_articles)
+                if cache and not warm_cache:
+                    cache.clear()
+                with timer.measure("crawl_articles", items=len(urls)):
+                    articles = crawl_articles(query, max_articles=max_articles, workers=parse_workers,
+                                              dedup=not feed_items, incremental=incremental)
+                expected = min(max_articles, server.feed_links(query))
+                if feed_items and (len(urls) < expected or len(articles) < expected):
+                    raise RuntimeError(f"{query}: requested {expected} articles, "
+                                       f"got {len(urls)} feed links and {len(articles)} articles")
+                for a in articles:
+                    if not a.raw_text:
+                        continue
+                    with timer.measure("summarize_text"):
+                        summarize_text(a.raw_text, max_sentences=3)
+                    with timer.measure("extract_keywords"):
+                        extract_keywords(a.title + "\n" + a.raw_text, top_n=5)
+                with timer.measure("synthesize", items=len(articles)):
+                    synthesized = synthesize(articles)
+                backends[synthesized.trace.backend] = backends.get(synthesized.trace.backend, 0) + 1
+        cache = get_http_cache()
+        cache_stats = cache.stats() if cache else {}
+        synthesis_stats = synthesis_cache.stats()
+        digest_stats = digest_cache.stats()
+        resolver_stats = get_url_resolver().stats()
+        store = get_article_store()
+        store_stats = store.stats() if store and incremental else {}
+        health_stats = get_domain_health().stats()
+        startup = startup_stats()
+        server_counters = dict(server.counters)
+
+    return {
+        "meta": {
+            "corpus": corpus,
+            "iterations": iterations,
+            "max_articles": max_articles,
+            "warm_cache": warm_cache,
+            "llm_stub": llm_stub,
+            "synthesis_backends": backends,
+            "feed_items": feed_items,
+            "parse_workers": parse_workers,
+            "redirect_links": redirect_links,
+            "incremental": incremental,
+            "parse_pool_processes": pool_processes,
+            "cpu_count": os.cpu_count(),
+            "faults": {
+                "latency_ms": faults.latency_ms, "jitter_ms": faults.jitter_ms,
+                "fail_rate": faults.fail_rate, "hang_rate": faults.hang_rate, "seed": faults.seed,
+            },
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "wall_seconds": round(time.perf_counter() - wall_start, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.report(),
+        "server": server_counters,
+        "http_cache": cache_stats,
+        "synthesis_cache": synthesis_stats,
+        "digest_cache": digest_stats,
+        "url_resolver": resolver_stats,
+        "article_store": store_stats,
+        "domain_health": health_stats,
+        "startup": startup,
+    }
+
+
+def compare(result: dict, baseline: dict, threshold: float = 0.2, min_delta_ms: float = 5.0) -> list[str]:
+    """
+    기준선 대비 threshold 비율 이상 나빠진 지표 목록.
+    단계 지연은 증가폭이 min_delta_ms 미만이면 측정 잡음으로 보고 무시한다.
+    """
+    regressions = []
+
+    def check(label: str, new: float, old: float, min_delta: float = 0.0):
+        if old and new > old * (1 + threshold) and new - old >= min_delta:
+            regressions.append(f"{label}: {old} → {new} (+{(new / old - 1) * 100:.0f}%)")
+
+    check("wall_seconds", result["wall_seconds"], baseline.get("wall_seconds", 0))
+    check("peak_rss_mb", result["peak_rss_mb"], baseline.get("peak_rss_mb", 0))
+    for stage, stats in result["stages"].items():
+        old = baseline.get("stages", {}).get(stage)
+        if not old:
+            continue
+        for key in ("p50_ms", "p90_ms"):
+            check(f"{stage}.{key}", stats[key], old.get(key, 0), min_delta_ms)
+    return regressions
+
+
+def _print_report(result: dict) -> None:
+    print(f"wall {result['wall_seconds']}s, peak RSS {result['peak_rss_mb']} MB")
+    print(f"{'stage':<18}{'n':>5}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'items/s':>10}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:<18}{s['count']:>5}{s['p50_ms']:>10.1f}{s['p90_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['throughput_per_s']:>10.1f}")
+    if result.get("http_cache"):
+        print("http cache:", result["http_cache"])
+    if result["meta"].get("synthesis_backends"):
+        print("synthesis backends:", result["meta"]["synthesis_backends"])
+    if result.get("synthesis_cache"):
+        print("synthesis cache:", result["synthesis_cache"])
+    if result.get("digest_cache"):
+        print("digest cache:", result["digest_cache"])
+    if result.get("url_resolver"):
+        print("url resolver:", result["url_resolver"])
+    if result.get("article_store"):
+        print("article store:", result["article_store"])
+    if result.get("domain_health"):
+        print("domain health:", result["domain_health"])
+    if result.get("startup", {}).get("steps"):
+        print("startup (ms):", {name: info["ms"] for name, info in result["startup"]["steps"].items()})
+    if result.get("server"):
+        print("server:", result["server"])
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="뉴스 파이프라인 오프라인 벤치마크")
+    parser.add_argument("--corpus", default="seed", help="bench/fixtures 아래 코퍼스 이름")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--max-articles", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--warm-cache", action="store_true", help="반복 사이에 HTTP 캐시를 비우지 않음")
+    parser.add_argument("--llm-stub", action="store_true", help="대역 서버의 chat-completions 스텁으로 합성")
+    parser.add_argument("--feed-items", type=int, default=0, help="피드 항목을 이 개수까지 복제 (50~100건 크롤 측정)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="파싱·요약 프로세스 풀 워커 수 (0이면 사용 안 함)")
+    parser.add_argument("--redirect-links", action="store_true", help="피드 링크를 리다이렉트 주소로 제공")
+    parser.add_argument("--incremental", action="store_true", help="증분 크롤 (기사 저장소 재사용)")
+    parser.add_argument("--save", metavar="PATH", help="결과를 기준선 JSON으로 저장")
+    parser.add_argument("--compare", metavar="PATH", help="기준선 JSON과 비교 (퇴행 시 종료 코드 1)")
+    parser.add_argument("--threshold", type=float, default=0.2, help="퇴행으로 볼 증가 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="단계 지연 비교 시 무시할 증가폭")
+    args = parser.parse_args(argv)
+
+    faults = FaultConfig(args.latency_ms, args.jitter_ms, args.fail_rate, args.hang_rate, args.hang_seconds, args.seed)
+    try:
+        result = run_benchmark(args.corpus, args.iterations, args.max_articles, faults, args.warm_cache, args.llm_stub,
+                               args.feed_items, args.parse_workers, args.redirect_links,
+                               args.incremental)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    _print_report(result)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"saved {args.save}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print("regressions:")
+            for line in regressions:
+                print("  " + line)
+            return 1
+        print(f"no regressions vs {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 로컬 대역 뉴스 서버.
+녹화된 코퍼스(manifest.json + RSS/기사 파일)를 Google News·언론사 대신 제공하고,
+응답 지연과 실패(5xx, 응답 없음)를 주입할 수 있다.
+기사 페이지는 뉴스 사이트와 다른 호스트(localhost:<포트>)의 언론사 주소로 제공한다.
+redirect_links면 피드 링크를 Google 뉴스처럼 /rss/articles/<id>로 바꾸고 언론사 주소로 302 리다이렉트한다.
+chat-completions 스텁(/v1/chat/completions, stream=True 지원)도 함께 제공한다.
+"""
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import urllib.parse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_STUB_COMPLETION = {
+    "core_theme": "인공지능 규제 정비와 산업계 반응",
+    "blog_post": "정부가 인공지능 기본법 시행령 초안을 공개했다. " * 30,
+    "thread_content": "AI 기본법 시행령 초안 공개, 업계는 환영 속 신고 절차 우려.",
+    "instagram_cards": ["시행령 초안 공개", "고영향 AI 범위", "사업자 의무", "업계 반응", "향후 일정"],
+}
+
+
+def _stub_completion(request: dict) -> dict:
+    """프롬프트의 JSON 예시에 나온 필드만 담은 응답 (필드별로 나눠 요청하면 그 필드만)"""
+    messages = request.get("messages") or [{}]
+    prompt = str(messages[-1].get("content", ""))
+    fields = {k: v for k, v in _STUB_COMPLETION.items() if f'"{k}"' in prompt}
+    return fields or _STUB_COMPLETION
+
+
+@dataclass
+class FaultConfig:
+    """지연·실패 주입 설정"""
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    fail_rate: float = 0.0
+    hang_rate: float = 0.0
+    hang_seconds: float = 30.0
+    seed: int = 0
+    rng: random.Random = field(default_factory=random.Random, repr=False)
+
+    def __post_init__(self):
+        self.rng.seed(self.seed)
+
+
+class Corpus:
+    """manifest.json으로 기술된 녹화 코퍼스"""
+
+    def __init__(self, name: str):
+        self.root = os.path.join(FIXTURES_DIR, name)
+        with open(os.path.join(self.root, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+    def read(self, filename: str) -> bytes:
+        with open(os.path.join(self.root, filename), "rb") as f:
+            return f.read()
+
+    def feed(self, query: str) -> Optional[bytes]:
+        feeds = self.manifest.get("feeds", {})
+        filename = feeds.get(query) or feeds.get(self.manifest.get("default_feed", ""))
+        return self.read(filename) if filename else None
+
+    def article(self, path: str) -> Optional[tuple[bytes, str]]:
+        entry = self.manifest.get("articles", {}).get(path)
+        if not entry:
+            return None
+        return self.read(entry["file"]), entry.get("content_type", "text/html")
+
+    @property
+    def queries(self) -> list[str]:
+        return list(self.manifest.get("feeds", {}))
+
+
+_WHEN_RE = re.compile(r"\s+when:\w+$")
+_ITEM_RE = re.compile(rb"<item>.*?</item>", re.S)
+_ITEM_LINK_RE = re.compile(rb"(<link>[^<]*|<guid[^>]*>[^<]*)")
+_ITEM_TITLE_END_RE = re.compile(rb"</title>")
+_COPY_RE = re.compile(r"--copy\d+(?=/|$)")
+
+
+def scale_feed(body: bytes, items: int) -> bytes:
+    """
+    피드 항목을 items개가 될 때까지 반복해 늘림 (대규모 크롤 측정용).
+    복제본은 기사 id에 --copyN을, 제목에 (N)을 붙여 서로 다른 링크·제목이 되지만 같은 기사 파일로 응답된다
+    (본문이 같으므로 본문 중복 묶기는 끄고 측정해야 한다).
+    """
+    found = _ITEM_RE.findall(body)
+    if not found or items <= len(found):
+        return body
+    extra = []
+    for k in range(len(found), items):
+        n = k // len(found)
+        item = _ITEM_LINK_RE.sub(lambda m: m.group(1) + b"--copy%d" % n, found[k % len(found)])
+        extra.append(_ITEM_TITLE_END_RE.sub(b" (%d)</title>" % n, item, count=1))
+    end = body.rfind(b"</item>") + len(b"</item>")
+    return body[:end] + b"".join(extra) + body[end:]
+
+
+def _make_handler(corpus: Corpus, faults: FaultConfig, counters: dict, feed_items: int = 0, redirect_links: bool = False):
+    lock = threading.Lock()
+
+    def count(name: str, n: int = 1) -> None:
+        with lock:
+            counters[name] = counters.get(name, 0) + n
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # 헤더와 본문을 따로 쓰므로 Nagle 지연(~40ms)이 측정에 섞이지 않게 끔
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def _inject(self) -> bool:
+            """지연·실패 주입. 요청을 실패로 끝냈으면 True"""
+            with lock:
+                roll = faults.rng.random()
+                delay = faults.latency_ms + faults.rng.uniform(0, faults.jitter_ms)
+            count("requests")
+            if delay:
+                time.sleep(delay / 1000.0)
+            if roll < faults.hang_rate:
+                count("hangs")
+                time.sleep(faults.hang_seconds)
+                return True
+            if roll < faults.hang_rate + faults.fail_rate:
+                count("failures")
+                self._send(503, b"injected failure", "text/plain")
+                return True
+            return False
+
+        def _send(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            try:
+                self.wfile.write(body)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _send_stream(self, model: str, content: str, piece: int = 40):
+            """stream=True 요청: server-sent events로 content를 조각내 전송"""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            try:
+                for i in range(0, len(content), piece):
+                    chunk = {
+                        "id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": {"content": content[i:i + piece]}, "finish_reason": None}],
+                    }
+                    self.wfile.write(b"data: " + json.dumps(chunk, ensure_ascii=False).encode() + b"\n\n")
+                    self.wfile.flush()
+                    if faults.latency_ms:
+                        time.sleep(faults.latency_ms / 1000.0 / 10)
+                self.wfile.write(b"data: [DONE]\n\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _base(self) -> str:
+            return f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address}"
+
+        def _publisher_base(self) -> str:
+            """언론사 역할 호스트: 같은 서버를 다른 이름으로 (뉴스 링크·도메인 상태가 뉴스 사이트와 구분되게)"""
+            return f"http://localhost:{self.server.server_address[1]}"
+
+        def do_GET(self):
+            parts = urllib.parse.urlsplit(self.path)
+            if parts.path == "/rss/search":
+                query = urllib.parse.parse_qs(parts.query).get("q", [""])[0]
+                # 기간 제한 피드(검색어 when:7d)와 다른 언어판도 같은 녹화 피드로 응답
+                body = corpus.feed(_WHEN_RE.sub("", query))
+                if body is None:
+                    return self._send(404, b"", "text/plain")
+                if self._inject():
+                    return
+                if redirect_links:
+                    body = body.replace(b"{{BASE}}/articles/", b"{{BASE}}/rss/articles/")
+                else:
+                    body = body.replace(b"{{BASE}}/articles/", self._publisher_base().encode() + b"/articles/")
+                body = body.replace(b"{{BASE}}", self._base().encode())
+                if feed_items:
+                    body = scale_feed(body, feed_items)
+                return self._send(200, body, "application/rss+xml; charset=utf-8")
+            if parts.path == "/search":
+                return self._send(200, b"<html><body></body></html>", "text/html; charset=utf-8")
+            if parts.path.startswith("/rss/articles/"):
+                count("redirects")
+                location = self._publisher_base() + parts.path[len("/rss"):] + ("?" + parts.query if parts.query else "")
+                self.send_response(302)
+                self.send_header("Location", location)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            found = corpus.article(_COPY_RE.sub("", parts.path))
+            if found is None:
+                return self._send(404, b"not found", "text/plain")
+            if self._inject():
+                return
+            body, content_type = found
+            self._send(200, body, content_type)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = self.rfile.read(length) if length else b""
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                return self._send(404, b"", "text/plain")
+            if self._inject():
+                return
+            try:
+                request = json.loads(payload or b"{}")
+            except ValueError:
+                request = {}
+            count("completions")
+            count("completion_prompt_bytes", len(payload))
+            content = json.dumps(_stub_completion(request), ensure_ascii=False)
+            if request.get("stream"):
+                return self._send_stream(request.get("model", "stub"), content)
+            body = json.dumps({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": content}}],
+                "usage": {"prompt_tokens": len(payload) // 4, "completion_tokens": len(content) // 4,
+                          "total_tokens": (len(payload) + len(content)) // 4},
+            }, ensure_ascii=False).encode()
+            self._send(200, body, "application/json")
+
+    return Handler
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 조기 종료(바이트 상한, 마감 시간)하면 연결이 끊기는 것이 정상
+        exc = sys.exc_info()[1]
+        if not isinstance(exc, (ConnectionError, TimeoutError)):
+            super().handle_error(request, client_address)
+
+
+class StandInServer:
+    """백그라운드 스레드에서 도는 대역 서버 (with 문으로 사용)"""
+
+    def __init__(self, corpus: str = "seed", faults: Optional[FaultConfig] = None, port: int = 0, feed_items: int = 0,
+                 redirect_links: bool = False):
+        self.corpus = Corpus(corpus)
+        self.faults = faults or FaultConfig()
+        self.counters: dict = {}
+        self.feed_items = feed_items
+        handler = _make_handler(self.corpus, self.faults, self.counters, feed_items, redirect_links)
+        self._server = _QuietServer(("127.0.0.1", port), handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def feed_links(self, query: str) -> int:
+        """질의 피드(늘린 경우 늘린 뒤)에 있는 서로 다른 기사 링크 수"""
+        body = self.corpus.feed(query) or b""
+        if self.feed_items:
+            body = scale_feed(body, self.feed_items)
+        return len({link for item in _ITEM_RE.findall(body) for link in re.findall(rb"<link>([^<]*)</link>", item)})
+
+    def start(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="녹화 코퍼스를 제공하는 로컬 뉴스 서버")
+    parser.add_argument("--corpus", default="seed")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--hang-rate", type=float, default=0.0)
+    parser.add_argument("--feed-items", type=int, default=0, help="피드 항목을 이 개수까지 복제")
+    parser.add_argument("--redirect-links", action="store_true", help="피드 링크를 리다이렉트 주소로 제공")
+    args = parser.parse_args()
+    faults = FaultConfig(args.latency_ms, args.jitter_ms, args.fail_rate, args.hang_rate)
+    server = StandInServer(args.corpus, faults, args.port, args.feed_items, args.redirect_links)
+    print(f"serving {args.corpus} at {server.base_url} (NEWS_BASE_URL={server.base_url})")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
@@ -1,12 +1,39 @@
 # -*- coding: utf-8 -*-
 """
-뉴스 기사들을 종합해 핵심 주제, 블로그 글(1200자), 스레드(~200자), 인스타 5장 카드뉴스 생성
+뉴스 기사들을 종합해 핵심 주제, 블로그 글(1200자), 스레드(~200자), 인스타 5장 카드뉴스 생성.
+기사마다 본문에서 요점을 추출(내용 해시로 캐시, 여러 기사를 동시에)해 토큰 예산 안에 채워 넣고(map),
+네 가지 결과물을 각각 따로 동시에 요청한다(reduce).
 """
+import hashlib
+import json
 import os
-from dataclasses import dataclass
-from typing import List, Optional
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Callable, List, Optional
 
-from crawler import NewsArticle
+from article_store import content_hash
+from crawler import NewsArticle, _shared_executor
+from startup import optional_module
+from tracing import SynthesisTrace, describe_error, emit
+
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o-mini")
+# 프롬프트 문구를 바꾸면 올려서 이전 캐시 결과를 무효화
+PROMPT_VERSION = "2"
+SYNTHESIS_CACHE_TTL = 30 * 60
+SYNTHESIS_CACHE_MAX_CHARS = 2_000_000  # 캐시에 담긴 생성 결과 글자 수 합 상한
+# 블로그 글 요청에 넣는 기사 요점의 토큰 예산 (기사가 많으면 기사당 요점을 줄여 더 많이 담음)
+SYNTHESIS_TOKEN_BUDGET = int(os.environ.get("NEWS_SYNTHESIS_TOKENS", "2500"))
+SYNTHESIS_BRIEF_TOKENS = 600  # 핵심 주제·스레드·카드뉴스 요청에는 요점 목록의 앞부분만
+SYNTHESIS_WORKERS = 8  # 결과물별 동시 요청 (여러 종합 작업이 함께 씀)
+DIGEST_SENTENCES = 4  # 기사 한 건 요점으로 뽑는 본문 문장 수
+DIGEST_MAX_TOKENS = 200
+DIGEST_MIN_TOKENS = 60
+DIGEST_CHUNK = 8  # 요점 추출 작업 하나가 맡는 기사 수
+DIGEST_WORKERS = 4
+DIGEST_CACHE_MAX_ENTRIES = 4096
 
 
 @dataclass
@@ -16,78 +43,427 @@ class SynthesizedContent:
     blog_post: str
     thread_content: str
     instagram_cards: List[str]  # 5장 분량 텍스트
+    trace: Optional[SynthesisTrace] = field(default=None, compare=False, repr=False)
+
+
+_HANGUL = re.compile(r"[\u1100-\u11ff\u3131-\u318e\uac00-\ud7a3]")
+_SENTENCE_END = re.compile(r"(?<=[.!?。])\s+")
+
+
+def estimate_tokens(text: str) -> int:
+    """대략의 토큰 수 (한글은 글자당 1, 나머지는 4글자당 1)"""
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def _fit_tokens(text: str, max_tokens: int) -> str:
+    """문장 단위로 잘라 max_tokens 안에 맞춤 (첫 문장부터 넘치면 글자 단위로 자름)"""
+    total = estimate_tokens(text)
+    if total <= max_tokens:
+        return text
+    parts: list[str] = []
+    used = 0
+    for sentence in _SENTENCE_END.split(text):
+        n = estimate_tokens(sentence) + 1
+        if used + n > max_tokens:
+            break
+        parts.append(sentence)
+        used += n
+    if parts:
+        return " ".join(parts)
+    return text[:max(1, len(text) * max_tokens // total)].rstrip() + "…"
+
+
+class _DigestCache:
+    """기사 요점 캐시: 내용 해시 → 요점 (건수 상한, 오래 안 쓴 항목부터 제거)"""
 
+    def __init__(self, max_entries: int = DIGEST_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self.counters = {"hit": 0, "miss": 0, "evicted": 0}
 
-def _build_context(articles: List[NewsArticle], max_chars: int = 8000) -> str:
-    """기사 제목+요약으로 컨텍스트 문자열 생성"""
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            digest = self._entries.get(key)
+            if digest is None:
+                self.counters["miss"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hit"] += 1
+            return digest
+
+    def put(self, key: str, digest: str) -> None:
+        with self._lock:
+            self._entries[key] = digest
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evicted"] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+digest_cache = _DigestCache()
+
+
+def _digest_texts(texts: List[str]) -> List[str]:
+    """본문 묶음의 요점: 추출 요약 DIGEST_SENTENCES문장 (summarizer가 없으면 본문 앞부분)"""
+    summarizer = optional_module("summarizer")
+    picked: Optional[List[str]] = None
+    if summarizer is not None:
+        try:
+            picked = summarizer.summarize_texts(texts, max_sentences=DIGEST_SENTENCES)
+        except Exception:
+            picked = None
+    if picked is None:
+        picked = [" ".join(t.split()[:200]) for t in texts]
+    return [_fit_tokens(" ".join(p.split()), DIGEST_MAX_TOKENS) for p in picked]
+
+
+def _digests(articles: List[NewsArticle]) -> List[str]:
+    """
+    기사별 요점. 본문이 있으면 내용 해시로 캐시를 찾고, 없는 것만 DIGEST_CHUNK건씩 나눠 동시에 추출한다.
+    본문이 없는 기사는 요약을 그대로 쓴다.
+    """
+    digests = [(a.summary or "").strip() for a in articles]
+    missing: dict[str, list[int]] = {}  # 내용 해시 → 기사 순번 (같은 본문은 한 번만)
+    for i, a in enumerate(articles):
+        if not a.raw_text:
+            continue
+        key = content_hash(a.title, a.summary, a.raw_text)
+        cached = digest_cache.get(key)
+        if cached is not None:
+            digests[i] = cached
+        else:
+            missing.setdefault(key, []).append(i)
+    if not missing:
+        return digests
+    keys = list(missing)
+    chunks = [keys[j:j + DIGEST_CHUNK] for j in range(0, len(keys), DIGEST_CHUNK)]
+
+    def run(chunk: List[str]) -> List[str]:
+        return _digest_texts([articles[missing[key][0]].raw_text for key in chunk])
+
+    if len(chunks) == 1:
+        results = [run(chunks[0])]
+    else:
+        results = list(_shared_executor("digest", DIGEST_WORKERS).map(run, chunks))
+    for chunk, chunk_digests in zip(chunks, results):
+        for key, digest in zip(chunk, chunk_digests):
+            digest_cache.put(key, digest)
+            for i in missing[key]:
+                digests[i] = digest
+    return digests
+
+
+def _context_blocks(articles: List[NewsArticle]) -> List[str]:
+    """
+    프롬프트에 넣을 기사별 블록 (순위 순서). 예산을 기사 수로 나눠 기사당 요점 분량을 정하고
+    (DIGEST_MIN_TOKENS~DIGEST_MAX_TOKENS), 예산에 들어갈 수 없는 뒤쪽 기사는 요점을 만들지 않는다.
+    """
+    candidates = articles[:max(1, SYNTHESIS_TOKEN_BUDGET // DIGEST_MIN_TOKENS)]
+    per_article = min(DIGEST_MAX_TOKENS, max(DIGEST_MIN_TOKENS, SYNTHESIS_TOKEN_BUDGET // max(1, len(candidates))))
+    return [
+        f"[기사{i}] {a.title.strip()}\n{_fit_tokens(digest, per_article)}\n"
+        for i, (a, digest) in enumerate(zip(candidates, _digests(candidates)), 1)
+    ]
+
+
+def _pack(blocks: List[str], budget: int) -> tuple[str, int]:
+    """앞에서부터 토큰 예산에 들어가는 블록까지 이어 붙임. (컨텍스트, 담은 기사 수)"""
     parts = []
-    total = 0
-    for i, a in enumerate(articles, 1):
-        block = f"[기사{i}] 제목: {a.title}\n요약: {a.summary}\n"
-        if total + len(block) > max_chars:
+    used = 0
+    for block in blocks:
+        n = estimate_tokens(block)
+        if used + n > budget:
             break
         parts.append(block)
-        total += len(block)
-    return "\n".join(parts)
+        used += n
+    return "\n".join(parts), len(parts)
 
 
-def _synthesize_with_openai(articles: List[NewsArticle]) -> Optional[SynthesizedContent]:
-    """OpenAI API로 핵심 주제 + 블로그/스레드/카드뉴스 생성 (선택 사항)"""
+SYSTEM_PROMPT = (
+    "당신은 여러 뉴스 기사의 요점을 분석해 블로그 글, 스레드, 카드뉴스 같은 콘텐츠를 쓰는 전문가입니다. "
+    "한국어로만 답하고, JSON 형식으로만 답하세요."
+)
+
+# 결과물별 요청: 필드 이름 → (지시문, JSON 예시 값). 요점 목록을 앞에 두어 요청끼리 프롬프트 앞부분이 같다.
+_PARTS = {
+    "core_theme": ("기사들을 관통하는 핵심 주제를 한 문장으로 써줘.", '"핵심 주제 한 문장"'),
+    "blog_post": ("기사들을 종합한 1200자 내외의 블로그 글 전체를 써줘.", '"1200자 내외 블로그 글 전체"'),
+    "thread_content": ("스레드/트윗용으로 200자 내외 요약을 써줘.", '"200자 내외 스레드/트윗용 요약"'),
+    "instagram_cards": ("인스타그램 카드뉴스 5장에 들어갈 문장 5개를 써줘.",
+                        '["1장 텍스트", "2장 텍스트", "3장 텍스트", "4장 텍스트", "5장 텍스트"]'),
+}
+
+
+def _user_prompt(context: str, part: str) -> str:
+    instruction, example = _PARTS[part]
+    return (
+        "--- 기사 요점 ---\n" + context + "\n\n"
+        + instruction + " 다른 설명 없이 다음 JSON만 출력해줘.\n"
+        + "{\"" + part + "\": " + example + "}"
+    )
+
+
+def _read_api_key() -> str:
     api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY_FILE")
     if api_key and os.path.isfile(api_key):
         with open(api_key) as f:
             api_key = f.read().strip()
+    return api_key or ""
+
+
+_client = None
+_client_key: Optional[tuple] = None
+_client_lock = threading.Lock()
+
+
+def _get_openai_client():
+    """
+    OpenAI 클라이언트 싱글톤 (연결 풀 재사용).
+    API 키나 OPENAI_BASE_URL이 바뀌면 새로 만든다. 키가 없거나 패키지가 없으면 None.
+    """
+    global _client, _client_key
+    api_key = _read_api_key()
     if not api_key:
         return None
-    context = _build_context(articles)
+    key = (api_key, os.environ.get("OPENAI_BASE_URL", ""))
+    with _client_lock:
+        if _client is None or _client_key != key:
+            openai = optional_module("openai")
+            try:
+                _client = openai.OpenAI(api_key=api_key) if openai else None
+                _client_key = key if _client is not None else None
+            except Exception:
+                _client, _client_key = None, None
+        return _client
+
+
+class _SynthesisCache:
+    """생성 결과 캐시: TTL + 글자 수 합 상한 (오래 안 쓴 항목부터 제거)"""
+
+    def __init__(self, ttl: float = SYNTHESIS_CACHE_TTL, max_chars: int = SYNTHESIS_CACHE_MAX_CHARS):
+        self.ttl = ttl
+        self.max_chars = max_chars
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple[float, SynthesizedContent, int]]" = OrderedDict()
+        self._chars = 0
+        self.counters = {"hit": 0, "miss": 0, "evicted": 0}
+
+    @staticmethod
+    def key(context: str, model: str) -> str:
+        return hashlib.sha256(f"{model}\x1f{PROMPT_VERSION}\x1f{context}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[SynthesizedContent]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.time():
+                if entry is not None:
+                    self._drop(key)
+                self.counters["miss"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hit"] += 1
+            # 호출마다 .trace를 붙이므로 사본을 돌려줌
+            return replace(entry[1], trace=None)
+
+    def put(self, key: str, content: SynthesizedContent) -> None:
+        size = len(content.core_theme) + len(content.blog_post) + len(content.thread_content) + sum(map(len, content.instagram_cards))
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.time() + self.ttl, replace(content, trace=None), size)
+            self._chars += size
+            while self._chars > self.max_chars and len(self._entries) > 1:
+                self._drop(next(iter(self._entries)))
+                self.counters["evicted"] += 1
+
+    def _drop(self, key: str) -> None:
+        self._chars -= self._entries.pop(key)[2]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self.counters, "entries": len(self._entries), "chars": self._chars}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+synthesis_cache = _SynthesisCache()
+
+_BLOG_FIELD = re.compile(r'"blog_post"\s*:\s*"')
+
+
+def _partial_blog_post(content: str) -> str:
+    """생성 중인 JSON 텍스트에서 지금까지 나온 blog_post 값 (닫히지 않았어도)"""
+    m = _BLOG_FIELD.search(content)
+    if not m:
+        return ""
+    i = m.end()
+    escaped = False
+    while i < len(content):
+        c = content[i]
+        if escaped:
+            escaped = False
+        elif c == "\\":
+            escaped = True
+        elif c == '"':
+            break
+        i += 1
+    raw = content[m.end():i]
+    if escaped:
+        raw = raw[:-1]
+    # 잘린 \uXXXX 이스케이프는 다음 조각을 기다림
+    raw = re.sub(r"\\u[0-9a-fA-F]{0,3}$", "", raw)
     try:
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        sys = (
-            "당신은 뉴스 기사들을 분석해 하나의 핵심 주제를 뽑고, "
-            "블로그 글(1200자 내외), 스레드용 짧은 글(200자 내외), "
-            "인스타그램 카드뉴스 5장 분량의 문장 5개를 작성하는 전문가입니다. "
-            "한국어로만 답하고, JSON 형식으로만 답하세요."
-        )
-        user = (
-            "아래 뉴스 기사들(제목+요약)을 분석해서 다음 JSON만 출력해줘. "
-            "다른 설명 없이 JSON만.\n\n"
-            "{\n"
-            '  "core_theme": "핵심 주제 한 문장",\n'
-            '  "blog_post": "1200자 내외 블로그 글 전체",\n'
-            '  "thread_content": "200자 내외 스레드/트윗용 요약",\n'
-            '  "instagram_cards": ["1장 텍스트", "2장 텍스트", "3장 텍스트", "4장 텍스트", "5장 텍스트"]\n'
-            "}\n\n"
-            "--- 기사 목록 ---\n" + context
-        )
-        resp = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "system", "content": sys}, {"role": "user", "content": user}],
-            temperature=0.6,
-        )
-        import json
-        content = resp.choices[0].message.content
-        # JSON 블록만 추출
-        start = content.find("{")
-        end = content.rfind("}") + 1
-        if start >= 0 and end > start:
-            data = json.loads(content[start:end])
-            return SynthesizedContent(
-                core_theme=data.get("core_theme", ""),
-                blog_post=data.get("blog_post", ""),
-                thread_content=data.get("thread_content", ""),
-                instagram_cards=data.get("instagram_cards", [])[:5],
-            )
-    except Exception:
-        pass
-    return None
-
-
-def synthesize(articles: List[NewsArticle]) -> SynthesizedContent:
+        return json.loads('"' + raw + '"')
+    except ValueError:
+        return raw
+
+
+def _parse_part(content: str, part: str):
+    """응답 JSON에서 part 필드 값 (JSON이 없거나 필드가 없으면 ValueError)"""
+    start = content.find("{")
+    end = content.rfind("}") + 1
+    if start < 0 or end <= start:
+        raise ValueError(f"no JSON object in {part} completion")
+    value = json.loads(content[start:end]).get(part)
+    if part == "instagram_cards":
+        if not isinstance(value, list):
+            raise ValueError("instagram_cards is not a list")
+        return [str(card) for card in value][:5]
+    if not isinstance(value, str):
+        raise ValueError(f"{part} missing in completion")
+    return value
+
+
+def _request_part(client, model: str, part: str, context: str, on_blog: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    결과물 하나를 요청. on_blog가 있으면 스트리밍으로 받으며 지금까지의 블로그 글을 넘겨준다.
+    {"value", "completion_chars", "first_token_ms"} 반환.
+    """
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}, {"role": "user", "content": _user_prompt(context, part)}]
+    stats = {"first_token_ms": 0.0}
+    start = time.perf_counter()
+    if on_blog is None:
+        resp = client.chat.completions.create(model=model, messages=messages, temperature=0.6)
+        content = resp.choices[0].message.content or ""
+    else:
+        parts: list[str] = []
+        shown = ""
+        for chunk in client.chat.completions.create(model=model, messages=messages, temperature=0.6, stream=True):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            if not parts:
+                stats["first_token_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            parts.append(delta)
+            blog = _partial_blog_post("".join(parts))
+            if blog != shown:
+                shown = blog
+                on_blog(blog)
+        content = "".join(parts)
+    stats["completion_chars"] = len(content)
+    stats["value"] = _parse_part(content, part)
+    return stats
+
+
+def _synthesize_with_openai(
+    articles: List[NewsArticle],
+    trace: Optional[SynthesisTrace] = None,
+    on_blog: Optional[Callable[[str], None]] = None,
+) -> Optional[SynthesizedContent]:
+    """
+    OpenAI API로 핵심 주제 + 블로그/스레드/카드뉴스 생성 (선택 사항).
+    기사 요점을 토큰 예산에 맞춰 담고, 블로그 글은 전체 요점으로, 나머지 셋은 앞부분 요점으로
+    각각 따로 동시에 요청한다. 하나라도 실패하면 None (템플릿으로 대체).
+    같은 요점·모델·프롬프트 버전의 결과는 캐시에서 돌려준다.
+    on_blog가 있으면 블로그 글을 스트리밍으로 받으면서 지금까지의 글을 넘겨준다.
+    """
+    client = _get_openai_client()
+    if client is None:
+        return None
+    start = time.perf_counter()
+    blocks = _context_blocks(articles)
+    context, packed = _pack(blocks, SYNTHESIS_TOKEN_BUDGET)
+    brief, _ = _pack(blocks, SYNTHESIS_BRIEF_TOKENS)
+    model = OPENAI_MODEL
+    cache_key = synthesis_cache.key(context, model)
+    contexts = {part: context if part == "blog_post" else brief for part in _PARTS}
+    if trace is not None:
+        trace.model = model
+        trace.digest_ms = round((time.perf_counter() - start) * 1000, 3)
+        trace.digests = packed
+        trace.requests = len(_PARTS)
+        for part, ctx in contexts.items():
+            user = _user_prompt(ctx, part)
+            trace.prompt_chars += len(SYSTEM_PROMPT) + len(user)
+            trace.prompt_tokens += estimate_tokens(SYSTEM_PROMPT) + estimate_tokens(user)
+    cached = synthesis_cache.get(cache_key)
+    if cached is not None:
+        if trace is not None:
+            trace.cache = "hit"
+        return cached
+    if trace is not None:
+        trace.cache = "miss"
+        trace.streamed = on_blog is not None
+    # 블로그 글(가장 오래 걸림)은 이 스레드에서, 나머지는 공용 풀에서 동시에
+    executor = _shared_executor("synthesis", SYNTHESIS_WORKERS)
+    futures = {
+        part: executor.submit(_request_part, client, model, part, contexts[part])
+        for part in _PARTS if part != "blog_post"
+    }
+    outcomes: dict = {}
+    try:
+        outcomes["blog_post"] = _request_part(client, model, "blog_post", context, on_blog)
+    except Exception as e:
+        outcomes["blog_post"] = e
+    for part, future in futures.items():
+        try:
+            outcomes[part] = future.result()
+        except Exception as e:
+            outcomes[part] = e
+    errors = [f"{part}: {describe_error(o)}" for part, o in outcomes.items() if isinstance(o, Exception)]
+    if trace is not None:
+        trace.completion_chars = sum(o["completion_chars"] for o in outcomes.values() if not isinstance(o, Exception))
+        if not isinstance(outcomes["blog_post"], Exception):
+            trace.first_token_ms = outcomes["blog_post"]["first_token_ms"]
+        if errors:
+            trace.error = "; ".join(errors)[:300]
+    if errors:
+        return None
+    result = SynthesizedContent(**{part: outcomes[part]["value"] for part in _PARTS})
+    synthesis_cache.put(cache_key, result)
+    return result
+
+
+def synthesize(articles: List[NewsArticle], on_blog: Optional[Callable[[str], None]] = None) -> SynthesizedContent:
     """
     뉴스 기사들을 종합해 핵심 주제, 블로그(1200자), 스레드(200자), 인스타 5장 카드뉴스 생성.
     OPENAI_API_KEY가 있으면 GPT 활용, 없으면 템플릿 기반으로 생성.
+    on_blog를 주면 GPT 응답을 스트리밍으로 받으며 생성 중인 블로그 글을 계속 넘겨준다.
+    결과의 .trace에 사용한 방식, 프롬프트 크기, 소요 시간(SynthesisTrace)이 붙는다.
     """
+    trace = SynthesisTrace(articles=len(articles))
+    start = time.perf_counter()
+    result = _synthesize(articles, trace, on_blog)
+    trace.total_ms = round((time.perf_counter() - start) * 1000, 3)
+    result.trace = trace
+    emit(trace)
+    return result
+
+
+def _synthesize(articles: List[NewsArticle], trace: SynthesisTrace, on_blog: Optional[Callable[[str], None]] = None) -> SynthesizedContent:
     if not articles:
         return SynthesizedContent(
             core_theme="분석할 기사가 없습니다.",
@@ -96,9 +472,11 @@ def synthesize(articles: List[NewsArticle]) -> SynthesizedContent:
             instagram_cards=[],
         )
 
-    result = _synthesize_with_openai(articles)
+    result = _synthesize_with_openai(articles, trace, on_blog)
     if result:
+        trace.backend = "openai"
         return result
+    trace.backend = "template"
 
     # 템플릿 기반 (API 없을 때) – 실제 기사 제목·요약 반영
     titles = [a.title.strip() for a in articles if a.title.strip()][:5]
@@ -2,28 +2,65 @@
 """
 검색 키워드로 뉴스 기사 10개 크롤링 후 제목, 요약, 핵심키워드 추출
 """
+import codecs
+import html.entities
+import os
+import queue
 import re
+import threading
+import time
 import urllib.parse
-from dataclasses import dataclass, field
-from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
-import requests
-from bs4 import BeautifulSoup
+from article_store import StoredArticle, content_hash, get_article_store
+from dedup import BODY_MAX_DISTANCE, TITLE_MAX_DISTANCE, body_fingerprint, cluster, context_chars, title_fingerprint
+from domain_health import get_domain_health
+from html_extract import PageFields, extract_page
+from http_cache import get_http_cache
+from keyword_engine import frequency_keywords
+from parse_pool import PARSE_WORKERS, PageRecord, get_parse_pool, submit_page
+from startup import optional_module
+from tracing import ArticleTrace, CrawlTrace, describe_error, emit, timed
+from url_resolver import canonical_url, get_url_resolver
 
-# 요약/키워드는 summarizer 모듈에서 (선택 사용)
+# requests·BeautifulSoup은 처음 쓸 때 불러온다 (앱 기동을 가볍게, 예열은 startup 모듈이 맡음)
+if TYPE_CHECKING:
+    import requests
+    from bs4 import BeautifulSoup
+
+# 요약/키워드는 summarizer 모듈에서 (선택 사용, 불러오기 실패는 기억해 다시 시도하지 않음)
 def _summarize(text: str, max_sent: int = 3):
+    summarizer = optional_module("summarizer")
     try:
-        from summarizer import summarize_text
-        return summarize_text(text, max_sentences=max_sent)
+        return summarizer.summarize_text(text, max_sentences=max_sent) if summarizer else None
     except Exception:
         return None
 
-def _keywords(text: str, top_n: int = 5):
+def _summarize_batch(texts: list[str], max_sent: int = 3) -> list[Optional[str]]:
+    summarizer = optional_module("summarizer")
     try:
-        from summarizer import extract_keywords
-        return extract_keywords(text, top_n=top_n)
+        return summarizer.summarize_texts(texts, max_sentences=max_sent) if summarizer else [None for _ in texts]
     except Exception:
-        return []
+        return [None for _ in texts]
+
+def _keywords_batch(texts: list[str], top_n: int = 5, method: Optional[str] = None, update: bool = True) -> list[list[str]]:
+    summarizer = optional_module("summarizer")
+    try:
+        if summarizer is None:
+            return [[] for _ in texts]
+        return summarizer.extract_keywords_batch(texts, top_n=top_n, method=method, update=update)
+    except Exception:
+        return [[] for _ in texts]
+
+def _keywords_depend_on_batch(method: Optional[str] = None) -> bool:
+    """키워드가 함께 넘긴 기사 묶음에 따라 달라지는 방법(tfidf)인지"""
+    summarizer = optional_module("summarizer")
+    try:
+        return summarizer is not None and summarizer.resolve_keyword_method(method) == "tfidf"
+    except Exception:
+        return False
 
 
 USER_AGENT = (
@@ -31,6 +68,34 @@ USER_AGENT = (
     "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 REQUEST_HEADERS = {"User-Agent": USER_AGENT, "Accept-Language": "ko-KR,ko;q=0.9,en;q=0.8"}
+# 뉴스 검색 주소 (벤치마크에서는 로컬 대역 서버로 바꿔 씀)
+GOOGLE_NEWS_BASE = os.environ.get("NEWS_BASE_URL", "https://news.google.com").rstrip("/")
+
+# 동시 수집 설정: 전체 동시 요청 수, 호스트별 동시 요청 수, 크롤 전체 마감 시간(초)
+MAX_CONCURRENCY = 8
+PER_HOST_CONCURRENCY = 2
+CRAWL_DEADLINE = 20.0
+# 기사가 많으면 마감 시간을 동시 요청 한 바퀴(MAX_CONCURRENCY건)마다 이만큼 늘림
+CRAWL_ROUND_SECONDS = 3.0
+# "1"이면 그 호스트의 평소(p90)보다 늦는 기사 요청을 한 번 더 보내 먼저 온 응답을 씀
+HEDGE_REQUESTS = os.environ.get("NEWS_HEDGE_REQUESTS", "0") == "1"
+
+# 많은 기사를 모을 때 함께 읽는 피드 변형 (Google 뉴스 RSS는 피드 하나에 최대 100건).
+# MULTI_FEED_MIN_ITEMS보다 많이 요청했는데 기본 피드로 모자라면 기간 제한(when:<기간>) 피드를 동시에 받고,
+# NEWS_RSS_FOREIGN=1이면 다른 언어판 피드도 받는다. 판은 (hl, gl, ceid)이고 첫 번째가 기본판.
+MULTI_FEED_MIN_ITEMS = 30
+RSS_TIME_WINDOWS = ("1d", "7d", "30d")
+RSS_EDITIONS = (("ko", "KR", "KR:ko"), ("en-US", "US", "US:en"))
+RSS_FOREIGN_EDITIONS = os.environ.get("NEWS_RSS_FOREIGN", "0") == "1"
+
+# 기사 페이지 스트리밍 다운로드: 최대 바이트 수, 청크 크기,
+# </head> 이후 </article>이 이 크기 이상의 본문 영역을 닫으면 조기 종료
+MAX_DOWNLOAD_BYTES = 1536 * 1024
+STREAM_CHUNK_SIZE = 16 * 1024
+EARLY_STOP_MIN_BODY = 2048
+# 인코딩 선언을 찾을 앞부분 / 내용 기반 추정에 쓸 표본 크기
+CHARSET_SNIFF_BYTES = 4096
+CHARSET_DETECT_BYTES = 64 * 1024
 
 
 @dataclass
@@ -42,19 +107,378 @@ class NewsArticle:
     keywords: list[str] = field(default_factory=list)
     source: str = ""
     raw_text: str = ""
+    trace: Optional[ArticleTrace] = field(default=None, compare=False, repr=False)
+    # 같은 기사를 실은 다른 매체들: [(매체, URL), ...]
+    alternates: list[tuple[str, str]] = field(default_factory=list)
+    # 뉴스 리다이렉트를 푼 언론사 기사 주소 (추적용 쿼리 제거, 아직 모르면 url 기준)
+    canonical_url: str = ""
+
+
+class CrawlResult(list):
+    """crawl_articles 결과: NewsArticle 리스트에 크롤 실행 추적(trace)을 붙인 것"""
+
+    def __init__(self, articles=(), trace: Optional[CrawlTrace] = None):
+        super().__init__(articles)
+        self.trace = trace if trace is not None else CrawlTrace()
+
 
+_session: Optional["requests.Session"] = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> "requests.Session":
+    """keep-alive 커넥션 풀을 공유하는 프로세스 단위 세션"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=MAX_CONCURRENCY * 2, pool_maxsize=MAX_CONCURRENCY)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                s.headers.update(REQUEST_HEADERS)
+                _session = s
+    return _session
+
+
+_HEAD_END_RE = re.compile(rb"</head\s*>", re.I)
+_ARTICLE_OPEN_RE = re.compile(rb"<article[\s>]", re.I)
+_ARTICLE_CLOSE_RE = re.compile(rb"</article\s*>", re.I)
+
+
+def _read_body(r: "requests.Response", max_bytes: Optional[int]) -> bytes:
+    """
+    스트리밍 응답을 청크 단위로 읽음. max_bytes가 있으면 그만큼만 받고,
+    head 메타데이터와 첫 article 본문 영역이 모두 도착하면 더 받지 않는다.
+    """
+    if max_bytes is None:
+        return r.content
+    buf = bytearray()
+    head_end = article_open = -1
+    for chunk in r.iter_content(STREAM_CHUNK_SIZE):
+        # 청크 경계에 걸친 태그를 놓치지 않도록 조금 앞에서부터 검색
+        scan_from = max(0, len(buf) - 16)
+        buf += chunk
+        if len(buf) >= max_bytes:
+            return bytes(buf[:max_bytes])
+        if head_end < 0:
+            m = _HEAD_END_RE.search(buf, scan_from)
+            if not m:
+                continue
+            head_end = m.end()
+            scan_from = head_end
+        if article_open < 0:
+            m = _ARTICLE_OPEN_RE.search(buf, max(scan_from, head_end))
+            if not m:
+                continue
+            article_open = m.start()
+            scan_from = article_open
+        m = _ARTICLE_CLOSE_RE.search(buf, max(scan_from, article_open))
+        if m and m.start() - article_open >= EARLY_STOP_MIN_BODY:
+            return bytes(buf[:m.end()])
+    return bytes(buf)
+
+
+def _fetch_bytes(url: str, timeout: int = 10, kind: str = "article", trace: Optional[ArticleTrace] = None) -> Optional[tuple[bytes, str]]:
+    """
+    응답 본문과 Content-Type 반환 (디스크 캐시 경유, 캐시 키는 정규화한 최종 주소).
+    신선한 캐시는 그대로 쓰고, 만료된 항목은 ETag/Last-Modified로 조건부 GET 재검증.
+    뉴스 링크가 리다이렉트되면 도착한 주소를 url_resolver에 기록해 다음부터 언론사로 바로 요청한다.
+    기사 페이지는 스트리밍으로 MAX_DOWNLOAD_BYTES까지만 받는다.
+    기사 페이지는 도메인 상태(domain_health)에 따라 타임아웃을 줄이고, 차단기가 열린 호스트는
+    요청하지 않는다 (만료된 캐시가 있으면 그것을, 없으면 None을 돌려 RSS 요약으로 넘어가게 함).
+    상태는 차단기를 확인한 호스트(요청한 언론사)에 기록해 다른 호스트로 리다이렉트돼도 시험 요청이 끝나게 한다.
+    아직 풀지 못한 뉴스 링크는 차단기·적응형 타임아웃을 적용하지 않고 리다이렉트 뒤 도착한 언론사 호스트에
+    기록한다 (언론사 실패가 뉴스 사이트 전체를 막지 않게). 오류 응답도 도착 주소를 배운다.
+    trace가 주어지면 받은 바이트 수, 소요 시간, 상태 코드, 캐시 결과, 타임아웃, 실패 사유를 기록.
+    """
+    cache = get_http_cache()
+    cache_key = canonical_url(url)
+    cached = cache.lookup(cache_key) if cache else None
+    if cached and cached.fresh:
+        cache.record("hit")
+        if trace is not None:
+            trace.cache = "hit"
+        return cached.body, cached.content_type
+    health = get_domain_health() if kind == "article" else None
+    host = _health_host(url)
+    if health is not None and host:
+        if not health.allow(host):
+            if trace is not None:
+                trace.fallback("circuit_open")
+            if cached:
+                cache.record("stale")
+                if trace is not None:
+                    trace.cache = "stale"
+                return cached.body, cached.content_type
+            if trace is not None:
+                trace.error = "circuit open"
+            return None
+        timeout = health.timeout_for(host, timeout)
+    if trace is not None:
+        trace.timeout_s = timeout
+    start = time.perf_counter()
+    with timed(trace, "download_ms"):
+        try:
+            headers = cached.conditional_headers() if cached else {}
+            with _get_session().get(url, headers=headers, timeout=timeout, stream=True) as r:
+                if trace is not None:
+                    trace.http_status = r.status_code
+                if cached and r.status_code == 304:
+                    if health is not None:
+                        _record_health(health, host, r.url or url, time.perf_counter() - start, ok=True)
+                    cache.record("revalidated")
+                    cache.refresh(cache_key, kind, r.headers.get("ETag", ""), r.headers.get("Last-Modified", ""))
+                    if trace is not None:
+                        trace.cache = "revalidated"
+                    return cached.body, cached.content_type
+                r.raise_for_status()
+                body = _read_body(r, MAX_DOWNLOAD_BYTES if kind == "article" else None)
+                content_type = r.headers.get("Content-Type", "")
+                etag, last_modified = r.headers.get("ETag", ""), r.headers.get("Last-Modified", "")
+                final_url = r.url or url
+            if health is not None:
+                _record_health(health, host, final_url, time.perf_counter() - start, ok=True)
+            if kind == "article":
+                get_url_resolver().learn(url, final_url)
+            if trace is not None:
+                trace.download_bytes = len(body)
+            if cache:
+                outcome = "refreshed" if cached else "miss"
+                cache.record(outcome)
+                cache.store(canonical_url(final_url), kind, body, content_type, etag, last_modified)
+                if trace is not None:
+                    trace.cache = outcome
+            return body, content_type
+        except Exception as e:
+            response = getattr(e, "response", None)
+            final_url = getattr(response, "url", None) or ""
+            if kind == "article" and final_url:
+                get_url_resolver().learn(url, final_url)
+            if health is not None:
+                # 응답 없이 실패한 뉴스 링크는 어느 언론사에서 실패했는지 모르므로 기록하지 않음
+                _record_health(health, host, final_url or url, time.perf_counter() - start, ok=not _counts_against_host(e))
+            if trace is not None:
+                trace.error = describe_error(e)
+            return None
 
-def _fetch_html(url: str, timeout: int = 10) -> Optional[str]:
+
+def _health_host(url: str) -> str:
+    """도메인 상태를 적용·기록할 호스트. 뉴스 링크(리다이렉트 전 주소)는 언론사를 알 수 없으므로 ''"""
+    if not url or get_url_resolver().key(url) is not None:
+        return ""
+    return urllib.parse.urlsplit(url).netloc
+
+
+def _record_health(health, host: str, url: str, seconds: float, ok: bool) -> None:
+    """요청 결과를 allow()로 확인한 호스트에, 그런 호스트가 없는 뉴스 링크면 도착한 주소(url)의 호스트에 기록"""
+    host = host or _health_host(url)
+    if host:
+        health.record(host, seconds, ok=ok)
+
+
+def _counts_against_host(error: Exception) -> bool:
+    """호스트 상태에 실패로 셀 오류인지: 연결·타임아웃·5xx와 차단(403)·과다 요청(429). 404 같은 기사 문제는 제외"""
+    response = getattr(error, "response", None)
+    status = response.status_code if response is not None else 0
+    return not (400 <= status < 500 and status not in (403, 429))
+
+
+_HEADER_CHARSET_RE = re.compile(r"charset\s*=\s*[\"']?([\w.:-]+)", re.I)
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+# 선언은 euc-kr이어도 실제로는 확장 문자가 섞이는 경우가 많아 상위 호환 코덱 사용
+_CHARSET_ALIASES = {"euc-kr": "cp949", "euc_kr": "cp949", "ks_c_5601-1987": "cp949", "ksc5601": "cp949"}
+
+
+def _normalize_charset(name: str) -> Optional[str]:
+    name = _CHARSET_ALIASES.get(name.strip().lower(), name.strip().lower())
     try:
-        r = requests.get(url, headers=REQUEST_HEADERS, timeout=timeout)
-        r.raise_for_status()
-        r.encoding = r.apparent_encoding or "utf-8"
-        return r.text
-    except Exception:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def _detect_charset(body: bytes, content_type: str = "") -> str:
+    """
+    인코딩 결정: HTTP 헤더 charset → BOM → <meta charset> → 앞부분 표본의 내용 기반 추정 순.
+    """
+    m = _HEADER_CHARSET_RE.search(content_type or "")
+    if m and _normalize_charset(m.group(1)):
+        return _normalize_charset(m.group(1))
+    for bom, name in ((codecs.BOM_UTF8, "utf-8"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+        if body.startswith(bom):
+            return name
+    m = _META_CHARSET_RE.search(body, 0, CHARSET_SNIFF_BYTES)
+    if m and _normalize_charset(m.group(1).decode("ascii", "ignore")):
+        return _normalize_charset(m.group(1).decode("ascii", "ignore"))
+    from requests.compat import chardet
+    detected = chardet.detect(body[:CHARSET_DETECT_BYTES])["encoding"] if chardet is not None else None
+    return (detected and _normalize_charset(detected)) or "utf-8"
+
+
+def _decode_html(body: bytes, content_type: str = "") -> str:
+    """본문 바이트를 문자열로"""
+    return str(body, _detect_charset(body, content_type), errors="replace")
+
+
+def _fetch_html(url: str, timeout: int = 10, kind: str = "article", trace: Optional[ArticleTrace] = None) -> Optional[str]:
+    fetched = _fetch_bytes(url, timeout=timeout, kind=kind, trace=trace)
+    if fetched is None:
         return None
+    return _decode_html(*fetched)
+
+
+_executors: dict[str, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def _shared_executor(name: str, max_workers: int) -> ThreadPoolExecutor:
+    """크롤 사이에 재사용하는 프로세스 단위 스레드 풀 (용도별 하나)"""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _executors[name] = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+    return executor
+
+
+def _fetch_html_hedged(url: str, timeout: float, trace: Optional[ArticleTrace] = None) -> Optional[str]:
+    """
+    기사 페이지 요청이 그 호스트의 평소 응답 시간(p90)을 넘기면 같은 요청을 하나 더 보내 먼저 성공한 쪽을 씀.
+    기록이 적은 호스트는 한 번만 요청. 이긴 요청의 기록을 trace에 옮긴다.
+    """
+    health = get_domain_health()
+    host = _health_host(url)
+    delay = health.hedge_delay(host) if host else None
+    if delay is None or delay >= timeout:
+        return _fetch_html(url, timeout=timeout, trace=trace)
+    executor = _shared_executor("hedge", MAX_CONCURRENCY * 2)
+    attempt_traces = [ArticleTrace(url=url), ArticleTrace(url=url)]
+    attempts = [executor.submit(_fetch_html, url, timeout, "article", attempt_traces[0])]
+    done, _ = wait(attempts, timeout=delay)
+    if not done:
+        health.record_hedge()
+        attempts.append(executor.submit(_fetch_html, url, timeout, "article", attempt_traces[1]))
+    html, winner = None, 0
+    for fut in as_completed(attempts):
+        html = fut.result()
+        if html is not None:
+            winner = attempts.index(fut)
+            break
+    if trace is not None:
+        won = attempt_traces[winner]
+        trace.download_bytes, trace.download_ms, trace.http_status = won.download_bytes, won.download_ms, won.http_status
+        trace.cache, trace.timeout_s, trace.error = won.cache, won.timeout_s, won.error
+        for reason in won.fallbacks:
+            trace.fallback(reason)
+        if len(attempts) > 1:
+            trace.fallback("hedged")
+    return html
 
 
-def _get_article_text(soup: BeautifulSoup) -> str:
+def _crawl_deadline(articles: int) -> float:
+    """기사 수에 맞춘 크롤 마감 시간: CRAWL_DEADLINE, 동시 요청 한 바퀴마다 CRAWL_ROUND_SECONDS씩 (큰 쪽)"""
+    rounds = -(-articles // MAX_CONCURRENCY)
+    return max(CRAWL_DEADLINE, rounds * CRAWL_ROUND_SECONDS)
+
+
+def _iter_fetched(
+    urls: list[str],
+    max_workers: int = MAX_CONCURRENCY,
+    per_host: int = PER_HOST_CONCURRENCY,
+    deadline: float = CRAWL_DEADLINE,
+    traces: Optional[list[ArticleTrace]] = None,
+    limiter: Optional[Callable[[], None]] = None,
+) -> Iterator[tuple[int, Optional[str]]]:
+    """
+    URL 목록을 동시에 내려받아 완료되는 순서대로 (인덱스, html) 반환.
+    이미 풀어 둔 뉴스 링크는 언론사 주소로 바로 요청한다 (호스트별 제한도 그 주소 기준).
+    아직 풀지 못한 뉴스 링크는 리다이렉트 뒤 언론사가 제각각이므로 호스트별 제한 없이 전체 동시 요청 수만 적용한다.
+    마감 시간을 넘긴 URL은 (인덱스, None)으로 반환해 RSS 요약 경로로 넘긴다.
+    traces가 주어지면 같은 순번의 ArticleTrace에 다운로드 기록을 남긴다.
+    limiter가 있으면 요청마다 먼저 호출한다 (배치 크롤의 전체 요청 속도 제한).
+    """
+    if not urls:
+        return
+    resolver = get_url_resolver()
+    targets = [resolver.target(url) for url in urls]
+    host_slots: dict[str, threading.Semaphore] = {}
+    slots: list[Optional[threading.Semaphore]] = []
+    for url in targets:
+        if resolver.key(url) is not None:
+            slots.append(None)
+            continue
+        host = urllib.parse.urlsplit(url).netloc
+        slots.append(host_slots.setdefault(host, threading.Semaphore(max(1, per_host))))
+    end_at = time.monotonic() + deadline
+
+    def fetch(i: int) -> Optional[str]:
+        url = targets[i]
+        slot = slots[i]
+        remaining = end_at - time.monotonic()
+        if remaining <= 0 or (slot is not None and not slot.acquire(timeout=remaining)):
+            return None
+        try:
+            if limiter is not None:
+                limiter()
+            remaining = end_at - time.monotonic()
+            if remaining <= 0:
+                return None
+            trace = traces[i] if traces else None
+            timeout = min(10, max(1, int(remaining + 0.999)))
+            if HEDGE_REQUESTS:
+                return _fetch_html_hedged(url, timeout, trace=trace)
+            return _fetch_html(url, timeout=timeout, trace=trace)
+        finally:
+            if slot is not None:
+                slot.release()
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))))
+    # 완료된 future를 큐로 받아 기사 수가 많아도 완료 한 건당 O(1)로 처리
+    completed: "queue.SimpleQueue[Future]" = queue.SimpleQueue()
+    try:
+        pending = {executor.submit(fetch, i): i for i in range(len(urls))}
+        for fut in pending:
+            fut.add_done_callback(completed.put)
+        while pending:
+            remaining = end_at - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                fut = completed.get(timeout=remaining)
+            except queue.Empty:
+                break
+            i = pending.pop(fut)
+            try:
+                html = fut.result()
+            except Exception as e:
+                html = None
+                if traces:
+                    traces[i].error = describe_error(e)
+            if html is None and traces and not traces[i].error:
+                traces[i].fallback("deadline")
+            yield i, html
+        # 마감 초과분은 실패로 처리
+        for i in sorted(pending.values()):
+            if traces:
+                traces[i].fallback("deadline")
+            yield i, None
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _fetch_all(urls: list[str], **kwargs) -> list[Optional[str]]:
+    """_iter_fetched 결과를 입력 순서대로 정렬한 리스트"""
+    htmls: list[Optional[str]] = [None] * len(urls)
+    for i, html in _iter_fetched(urls, **kwargs):
+        htmls[i] = html
+    return htmls
+
+
+def _get_article_text(soup: "BeautifulSoup") -> str:
     """기사 본문 추출 (일반적인 뉴스 사이트 패턴)"""
     # 제거할 태그
     for tag in soup.find_all(["script", "style", "nav", "footer", "aside", "form"]):
@@ -78,7 +502,7 @@ def _get_article_text(soup: BeautifulSoup) -> str:
     return ""
 
 
-def _get_title(soup: BeautifulSoup, url: str) -> str:
+def _get_title(soup: "BeautifulSoup", url: str) -> str:
     """기사 제목 추출"""
     for tag in ["h1", "[property='og:title']", "title"]:
         if tag.startswith("["):
@@ -97,7 +521,7 @@ def _get_title(soup: BeautifulSoup, url: str) -> str:
     return "제목 없음"
 
 
-def _get_meta_description(soup: BeautifulSoup) -> str:
+def _get_meta_description(soup: "BeautifulSoup") -> str:
     """메타 디스크립션으로 요약 후보 확보"""
     for selector in ["meta[name='description']", "meta[property='og:description']"]:
         el = soup.select_one(selector)
@@ -106,13 +530,35 @@ def _get_meta_description(soup: BeautifulSoup) -> str:
     return ""
 
 
-def _build_summary(soup: BeautifulSoup, body_text: str, title: str) -> str:
-    """요약문 생성: 메타 설명 우선, 없으면 본문 앞부분 또는 summarizer 사용"""
-    meta = _get_meta_description(soup)
+def _parse_page(html: str, url: str) -> PageFields:
+    """
+    페이지에서 제목·메타 설명·본문 추출.
+    html_extract의 단일 패스 추출기를 쓰고, 파싱에 실패하면 BeautifulSoup 경로로 대체.
+    """
+    fields = extract_page(html)
+    if fields is not None:
+        return fields
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, "lxml")
+    title = _get_title(soup, url)
+    body_text = _get_article_text(soup)
+    return PageFields(title=title, description=_get_meta_description(soup), body_text=body_text)
+
+
+def _needs_summarizer(meta: str, body_text: str) -> bool:
+    """_build_summary가 summarizer를 부르는 경우 (메타 설명이 짧고 본문이 있음)"""
+    return not (meta and len(meta) > 30) and bool(body_text) and len(body_text) > 50
+
+
+def _build_summary(meta: str, body_text: str, title: str, summarized: Optional[str] = None) -> str:
+    """
+    요약문 생성: 메타 설명 우선, 없으면 본문 앞부분 또는 summarizer 사용.
+    summarized가 있으면 미리 배치로 구한 본문 요약을 쓴다.
+    """
     if meta and len(meta) > 30:
         return meta[:400]
     if body_text and len(body_text) > 50:
-        s = _summarize(body_text, 3)
+        s = summarized if summarized is not None else _summarize(body_text, 3)
         if s:
             return s[:400]
         return body_text[:400].rsplit(".", 1)[0] + "." if "." in body_text[:400] else body_text[:400]
@@ -120,56 +566,220 @@ def _build_summary(soup: BeautifulSoup, body_text: str, title: str) -> str:
 
 
 def _strip_html(html: str) -> str:
+    """RSS 요약 HTML의 텍스트 (태그 사이는 공백 하나). lxml이 없으면 BeautifulSoup"""
     if not html or not html.strip():
         return ""
-    soup = BeautifulSoup(html, "lxml")
-    return soup.get_text(separator=" ", strip=True)[:500]
+    try:
+        import lxml.html
+        root = lxml.html.fragment_fromstring(html, create_parent="div")
+        return " ".join(t.strip() for t in root.itertext() if t.strip())[:500]
+    except ImportError:
+        parser = "html.parser"
+    except Exception:
+        parser = "lxml"
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, parser).get_text(separator=" ", strip=True)[:500]
+
+
+def _feed_entry(title: str, link: str, source: str, summary_html: str) -> tuple[str, str, str, str]:
+    title = (title or "").strip().replace("&#39;", "'").replace("&quot;", '"')[:200]
+    return title, link.strip(), (source or "").strip(), _strip_html(summary_html or "")
+
 
+_NAMED_ENTITY_RE = re.compile(rb"&([A-Za-z][A-Za-z0-9]{1,31});")
+_XML_ENTITIES = frozenset({b"amp", b"lt", b"gt", b"quot", b"apos"})
 
-def fetch_news_urls(query: str, max_items: int = 10) -> list[tuple[str, str, str, str]]:
+
+def _numeric_entities(body: bytes) -> bytes:
     """
-    Google News RSS 또는 뉴스 검색에서 기사 URL 수집.
-    Returns: [(title, url, source, rss_summary), ...]
+    XML에 없는 HTML 이름 참조(&nbsp;, &middot; 등)를 숫자 참조로, 모르는 이름은 글자 그대로(&amp;…)로 바꿈.
+    lxml은 정의되지 않은 참조에서 요소의 text를 끊고 뒤의 참조까지 잃는다.
     """
-    results: list[tuple[str, str, str, str]] = []
-    encoded = urllib.parse.quote_plus(query)
+    if b"&" not in body:
+        return body
+
+    def sub(m: "re.Match[bytes]") -> bytes:
+        name = m.group(1)
+        if name in _XML_ENTITIES:
+            return m.group(0)
+        codepoint = html.entities.name2codepoint.get(name.decode("ascii"))
+        return b"&#%d;" % codepoint if codepoint is not None else b"&amp;" + m.group(0)[1:]
+
+    return _NAMED_ENTITY_RE.sub(sub, body)
+
+
+def _item_text(item, tag: str) -> Optional[str]:
+    """<item>의 자식 요소 글 전체 (모르는 참조가 남아 있어도 그 뒤의 글까지)"""
+    el = item.find(tag)
+    return None if el is None else "".join(el.itertext())
 
-    # 1) Google News RSS (제목·요약 함께 수집)
-    rss_url = f"https://news.google.com/rss/search?q={encoded}&hl=ko&gl=KR&ceid=KR:ko"
+
+def _parse_feed(body: bytes, content_type: str = "") -> list[tuple[str, str, str, str]]:
+    """
+    RSS 바이트에서 [(제목, 링크, 매체, 요약), ...]. lxml로 <item>만 훑고,
+    항목을 찾지 못한 피드(Atom, 빈 본문, 심하게 깨진 XML)는 feedparser로 읽는다.
+    """
+    items = []
     try:
-        import feedparser
-        feed = feedparser.parse(rss_url, request_headers=REQUEST_HEADERS)
-        for e in feed.entries[:max_items]:
-            link = e.get("link") or (e.get("links") or [{}])[0].get("href")
-            if not link:
+        from lxml import etree
+    except ImportError:
+        etree = None
+    if etree is not None:
+        parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True, huge_tree=True)
+        try:
+            root = etree.fromstring(_numeric_entities(body), parser)
+        except etree.XMLSyntaxError:
+            root = None
+        items = list(root.iter("item")) if root is not None else []
+    entries = []
+    for item in items:
+        link = _item_text(item, "link") or ""
+        if not link.strip():
+            guid = item.find("guid")
+            if guid is None or guid.get("isPermaLink", "true") == "false":
                 continue
-            title = (e.get("title") or "").replace("&#39;", "'").replace("&quot;", '"')[:200]
-            rss_summary = _strip_html(e.get("summary") or e.get("description") or "")
-            src = e.get("source")
-            source = src.get("title", "") if isinstance(src, dict) else ""
-            results.append((title, link, source, rss_summary))
-        if len(results) >= max_items:
-            return results[:max_items]
-    except Exception:
-        pass
+            link = "".join(guid.itertext())
+        if link.strip():
+            entries.append(_feed_entry(
+                _item_text(item, "title"), link, _item_text(item, "source"), _item_text(item, "description")
+            ))
+    if items:
+        return entries
+
+    import feedparser
+    feed = feedparser.parse(body, response_headers={"content-type": content_type} if content_type else None)
+    for e in feed.entries:
+        link = e.get("link") or (e.get("links") or [{}])[0].get("href")
+        if not link:
+            continue
+        src = e.get("source")
+        source = src.get("title", "") if isinstance(src, dict) else ""
+        entries.append(_feed_entry(e.get("title"), link, source, e.get("summary") or e.get("description")))
+    return entries
+
+
+def _feed_urls(query: str, max_items: int) -> list[str]:
+    """
+    읽을 RSS 주소 (순위 순): 기본판 피드, 그리고 max_items가 MULTI_FEED_MIN_ITEMS를 넘으면
+    기본판의 기간 제한 피드들과 (RSS_FOREIGN_EDITIONS면) 다른 언어판 피드.
+    """
+    def feed(q: str, edition: tuple[str, str, str]) -> str:
+        hl, gl, ceid = edition
+        return f"{GOOGLE_NEWS_BASE}/rss/search?q={urllib.parse.quote_plus(q)}&hl={hl}&gl={gl}&ceid={ceid}"
+
+    urls = [feed(query, RSS_EDITIONS[0])]
+    if max_items > MULTI_FEED_MIN_ITEMS:
+        urls += [feed(f"{query} when:{window}", RSS_EDITIONS[0]) for window in RSS_TIME_WINDOWS]
+        if RSS_FOREIGN_EDITIONS:
+            urls += [feed(query, edition) for edition in RSS_EDITIONS[1:]]
+    return urls
 
-    # 2) Google News HTML 검색 결과 파싱 (RSS 실패 시)
-    search_url = f"https://news.google.com/search?q={encoded}&hl=ko&gl=KR&ceid=KR:ko"
-    html = _fetch_html(search_url)
-    if html:
-        soup = BeautifulSoup(html, "lxml")
-        for a in soup.select('a[href^="./articles/"]')[:max_items]:
-            href = a.get("href") or ""
-            if href.startswith("./"):
-                href = "https://news.google.com/" + href[2:]
-            title_el = a.select_one("h3") or a
-            title_text = title_el.get_text(strip=True)[:200] if title_el else ""
-            if href and title_text:
-                results.append((title_text, href, "Google News", ""))
-            if len(results) >= max_items:
-                break
 
-    return results[:max_items]
+def _search_entries(query: str, max_items: int) -> list[tuple[str, str, str, str]]:
+    """Google News HTML 검색 결과 파싱 (피드에서 모자랄 때)"""
+    encoded = urllib.parse.quote_plus(query)
+    search_url = f"{GOOGLE_NEWS_BASE}/search?q={encoded}&hl=ko&gl=KR&ceid=KR:ko"
+    html = _fetch_html(search_url, kind="search")
+    if not html:
+        return []
+    from bs4 import BeautifulSoup
+    entries = []
+    soup = BeautifulSoup(html, "lxml")
+    for a in soup.select('a[href^="./articles/"]')[:max_items]:
+        href = a.get("href") or ""
+        if href.startswith("./"):
+            href = GOOGLE_NEWS_BASE + "/" + href[2:]
+        title_el = a.select_one("h3") or a
+        title_text = title_el.get_text(strip=True)[:200] if title_el else ""
+        if href and title_text:
+            entries.append((title_text, href, "Google News", ""))
+    return entries
+
+
+def fetch_news_urls(
+    query: str,
+    max_items: int = 10,
+    trace: Optional[CrawlTrace] = None,
+    limiter: Optional[Callable[[], None]] = None,
+) -> list[tuple[str, str, str, str]]:
+    """
+    Google News RSS 또는 뉴스 검색에서 기사 URL 수집 (iter_news_urls 결과 목록).
+    Returns: [(title, url, source, rss_summary), ...]
+    """
+    with timed(trace, "rss_ms"):
+        results = list(iter_news_urls(query, max_items, trace, limiter))
+    if trace is not None:
+        trace.rss_items = len(results)
+    return results
+
+
+def iter_news_urls(
+    query: str,
+    max_items: int = 10,
+    trace: Optional[CrawlTrace] = None,
+    limiter: Optional[Callable[[], None]] = None,
+) -> Iterator[tuple[str, str, str, str]]:
+    """
+    기사 URL을 순위 순으로 최대 max_items개 스트리밍.
+    기본 피드를 먼저 받아 내보내고, 그것으로 모자랄 때만 나머지 피드 변형(_feed_urls)을 공용 세션으로
+    동시에 받아 앞 피드부터 피드 안 순위대로 중복 링크를 빼고 내보낸다. 피드에서 모자라면 HTML 검색 결과로 채운다.
+    trace에는 읽은 피드 수·출처·RSS 오류를 남기고, limiter가 있으면 요청마다 먼저 호출한다.
+    """
+    def fetch_feed(url: str) -> list[tuple[str, str, str, str]]:
+        if limiter is not None:
+            limiter()
+        fetched = _fetch_bytes(url, kind="rss")
+        if fetched is None:
+            raise ValueError("RSS fetch failed")
+        return _parse_feed(*fetched)
+
+    seen: set[str] = set()
+
+    def fresh(entries: list[tuple[str, str, str, str]]) -> Iterator[tuple[str, str, str, str]]:
+        for entry in entries:
+            key = _canonical(entry[1])
+            if key not in seen:
+                seen.add(key)
+                yield entry
+
+    feeds = _feed_urls(query, max_items)
+    executor = _shared_executor("feeds", MAX_CONCURRENCY)
+    futures = [executor.submit(fetch_feed, feeds[0])]
+    try:
+        k = 0
+        while k < len(futures):
+            fut = futures[k]
+            k += 1
+            try:
+                entries = fut.result()
+            except Exception as e:
+                entries = []
+                if trace is not None and not trace.rss_error:
+                    trace.rss_error = describe_error(e)
+            else:
+                if trace is not None:
+                    trace.rss_feeds += 1
+            for entry in fresh(entries):
+                if trace is not None:
+                    trace.rss_source = "rss"
+                yield entry
+                if len(seen) >= max_items:
+                    return
+            if k == 1:
+                # 기본 피드로 모자랄 때만 변형 피드를 받음
+                futures += [executor.submit(fetch_feed, url) for url in feeds[1:]]
+    finally:
+        for fut in futures:
+            fut.cancel()
+
+    if limiter is not None:
+        limiter()
+    for entry in fresh(_search_entries(query, max_items)):
+        if trace is not None and trace.rss_source != "rss":
+            trace.rss_source = "html"
+        yield entry
+        if len(seen) >= max_items:
+            return
 
 
 _GENERIC_TITLES = ("google news", "google 뉴스", "news", "loading", "제목 없음", "")
@@ -181,65 +791,688 @@ def _is_generic_title(title: str) -> bool:
     return t in _GENERIC_TITLES or t.startswith("google ") or "redirecting" in t
 
 
-def crawl_articles(query: str, max_articles: int = 10) -> list[NewsArticle]:
+def _fallback_keywords(text: str, top_n: int = 5) -> list[str]:
+    """summarizer를 쓸 수 없을 때 빈도 기반 키워드"""
+    return frequency_keywords(text, top_n)
+
+
+def _article_from_rss(title_from_rss: str, url: str, source: str, rss_summary: str, trace: Optional[ArticleTrace] = None) -> tuple[NewsArticle, str, str]:
     """
-    검색 키워드로 뉴스 10개 크롤링 후 각 기사별 제목, 요약, 핵심키워드 반환.
-    RSS 제목·요약을 우선 사용하고, 페이지에서 가져온 내용으로 보강.
+    본문을 불러오지 못한 기사: RSS 제목·요약만으로 구성.
+    Returns: (키워드 없는 기사, 키워드 추출용 텍스트, fallback 키워드용 텍스트)
     """
-    url_tuples = fetch_news_urls(query, max_items=max_articles)
-    articles: list[NewsArticle] = []
+    if trace is not None:
+        trace.fallback("page_unavailable")
+        trace.fallback("summary_from_rss" if rss_summary else "summary_placeholder")
+    summary = rss_summary[:400] if rss_summary else "본문을 불러오지 못했습니다. 아래 링크에서 확인하세요."
+    text_for_kw = title_from_rss + " " + rss_summary
+    article = NewsArticle(
+        title=title_from_rss or "로드 실패",
+        url=url,
+        summary=summary,
+        source=source,
+        trace=trace,
+    )
+    return article, text_for_kw, text_for_kw
 
-    for title_from_rss, url, source, rss_summary in url_tuples:
-        html = _fetch_html(url)
+
+def _article_from_html(
+    title_from_rss: str,
+    url: str,
+    source: str,
+    rss_summary: str,
+    html: str,
+    trace: Optional[ArticleTrace] = None,
+    page: Optional[PageFields] = None,
+    summarized: Optional[str] = None,
+) -> tuple[NewsArticle, str, str]:
+    """
+    기사 페이지 HTML에서 제목·요약·본문 추출 (RSS 제목·요약으로 보강).
+    page·summarized가 주어지면 이미 파싱한 결과와 배치 요약을 쓴다 (_prepare_articles).
+    Returns: (키워드 없는 기사, 키워드 추출용 텍스트, fallback 키워드용 텍스트)
+    """
+    if page is None:
+        with timed(trace, "parse_ms"):
+            page = _parse_page(html, url)
+    page_title = page.title
+    body_text = page.body_text
+    with timed(trace, "summarize_ms"):
+        page_summary = _build_summary(page.description, body_text, page_title, summarized)
+
+    title = title_from_rss if _is_generic_title(page_title) else (page_title or title_from_rss)
+    if not title:
+        title = title_from_rss or "제목 없음"
+
+    summary_fallback = ""
+    if page_summary and len(page_summary.strip()) > 50 and page_summary != title:
+        summary = page_summary[:400]
+    elif rss_summary and len(rss_summary.strip()) > 20:
+        summary = rss_summary[:400]
+        summary_fallback = "summary_from_rss"
+    else:
+        summary = (title[:200] + "... (아래 링크에서 원문 확인)") if len(title) > 80 else f"{title} – 아래 링크에서 원문 확인"
+        summary_fallback = "summary_from_title"
+
+    if trace is not None:
+        if not body_text:
+            trace.fallback("no_body")
+        if _is_generic_title(page_title):
+            trace.fallback("title_from_rss")
+        if summary_fallback:
+            trace.fallback(summary_fallback)
+
+    text_for_kw = title + "\n" + (body_text or "") + " " + (rss_summary or "")
+    fallback_text = (body_text or "") + " " + (rss_summary or "") + " " + title
+    article = NewsArticle(
+        title=title,
+        url=url,
+        summary=summary,
+        source=source,
+        raw_text=(body_text or "")[:3000],
+        trace=trace,
+    )
+    return article, text_for_kw, fallback_text
+
+
+def _prepare_article(url_tuple: tuple[str, str, str, str], html: Optional[str], trace: Optional[ArticleTrace] = None) -> tuple[NewsArticle, str, str]:
+    title_from_rss, url, source, rss_summary = url_tuple
+    if html:
+        return _article_from_html(title_from_rss, url, source, rss_summary, html, trace)
+    return _article_from_rss(title_from_rss, url, source, rss_summary, trace)
+
+
+def _prepare_articles(
+    url_tuples: list[tuple[str, str, str, str]],
+    htmls: list[Optional[str]],
+    traces: list[ArticleTrace],
+) -> list[tuple[NewsArticle, str, str]]:
+    """
+    _prepare_article의 배치 버전: 모든 페이지를 파싱한 뒤 요약이 필요한 본문을 한 번에 요약.
+    결과는 기사마다 _prepare_article을 부른 것과 같다.
+    """
+    pages: list[Optional[PageFields]] = []
+    for (_, url, _, _), html, at in zip(url_tuples, htmls, traces):
         if not html:
-            summary = rss_summary[:400] if rss_summary else "본문을 불러오지 못했습니다. 아래 링크에서 확인하세요."
-            text_for_kw = title_from_rss + " " + rss_summary
-            kw = _keywords(text_for_kw, 5) if text_for_kw.strip() else []
-            if not kw and text_for_kw:
-                from collections import Counter
-                words = re.findall(r"[가-힣a-zA-Z]{2,}", text_for_kw)
-                stop = {"있다", "하다", "된다", "그리고", "그러나", "이번", "통해", "대해", "위해", "있는", "없는"}
-                kw = [w for w, _ in Counter(words).most_common(15) if w not in stop][:5]
-            articles.append(NewsArticle(
-                title=title_from_rss or "로드 실패",
-                url=url,
-                summary=summary,
-                keywords=kw,
-                source=source,
-            ))
+            pages.append(None)
             continue
+        with timed(at, "parse_ms"):
+            pages.append(_parse_page(html, url))
+
+    need = [i for i, page in enumerate(pages) if page is not None and _needs_summarizer(page.description, page.body_text)]
+    summarized: dict[int, Optional[str]] = {}
+    if need:
+        start = time.perf_counter()
+        summarized = dict(zip(need, _summarize_batch([pages[i].body_text for i in need], 3)))
+        share_ms = (time.perf_counter() - start) * 1000 / len(need)
+        for i in need:
+            traces[i].summarize_ms = round(traces[i].summarize_ms + share_ms, 3)
+
+    prepared = []
+    for i, (title_from_rss, url, source, rss_summary) in enumerate(url_tuples):
+        if pages[i] is None:
+            prepared.append(_article_from_rss(title_from_rss, url, source, rss_summary, traces[i]))
+        else:
+            prepared.append(_article_from_html(title_from_rss, url, source, rss_summary, htmls[i], traces[i],
+                                               page=pages[i], summarized=summarized.get(i)))
+    return prepared
+
+
+def _apply_keywords(
+    prepared: list[tuple[NewsArticle, str, str]],
+    trace: Optional[CrawlTrace] = None,
+    method: Optional[str] = None,
+    provisional: bool = False,
+) -> list[NewsArticle]:
+    """
+    준비된 기사들의 키워드를 한 번의 배치로 추출해 채움.
+    provisional이면 묶음 전체로 다시 뽑을(_rescore_batch) 임시 키워드라 tfidf의 IDF 표를 갱신하지 않는다.
+    """
+    start = time.perf_counter()
+    keyword_lists = _keywords_batch([text for _, text, _ in prepared], 5, method, update=not provisional)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    if trace is not None:
+        trace.keywords_ms = round(trace.keywords_ms + elapsed_ms, 3)
+    articles: list[NewsArticle] = []
+    for (article, _, fallback_text), keywords in zip(prepared, keyword_lists):
+        article.keywords = keywords or _fallback_keywords(fallback_text)
+        if article.trace is not None:
+            article.trace.keywords_ms = round(elapsed_ms / len(prepared), 3)
+            if not keywords:
+                article.trace.fallback("keywords_frequency")
+        articles.append(article)
+    return articles
+
+
+# 중복 제거로 빠지는 몫을 채우려고 RSS에서 더 받아 두는 배수
+DEDUP_RSS_FACTOR = 2
+# "1"이면 증분 크롤이 기본 (기사 저장소에 있는 신선한 기사는 다시 받지 않음)
+INCREMENTAL_CRAWL = os.environ.get("NEWS_INCREMENTAL", "0") == "1"
+
+
+def _collect_unique_urls(
+    query: str,
+    max_articles: int,
+    trace: CrawlTrace,
+    dedup: bool = True,
+    limiter: Optional[Callable[[], None]] = None,
+) -> tuple[list[tuple[str, str, str, str]], list[list[tuple[str, str]]]]:
+    """
+    RSS 항목을 받아 다운로드 전에 제목 지문으로 중복을 묶음. limiter는 fetch_news_urls로 넘긴다.
+    Returns: (대표 항목 최대 max_articles개, 대표별 다른 매체 [(매체, URL), ...])
+    """
+    if not dedup:
+        url_tuples = fetch_news_urls(query, max_items=max_articles, trace=trace, limiter=limiter)
+        return url_tuples, [[] for _ in url_tuples]
+    candidates = fetch_news_urls(query, max_items=max_articles * DEDUP_RSS_FACTOR, trace=trace, limiter=limiter)
+    fingerprints = [title_fingerprint(t[0]) for t in candidates]
+    reps = cluster(fingerprints, TITLE_MAX_DISTANCE)
+    first_by_url: dict[str, int] = {}
+    for i, (_, url, _, _) in enumerate(candidates):
+        key = _canonical(url)
+        reps[i] = min(reps[i], first_by_url.setdefault(key, reps[i]))
+
+    kept: dict[int, int] = {}  # 후보 순번 → 결과 순번
+    url_tuples: list[tuple[str, str, str, str]] = []
+    alternates: list[list[tuple[str, str]]] = []
+    for i, (title, url, source, rss_summary) in enumerate(candidates):
+        r = reps[i]
+        if r == i:
+            if len(url_tuples) < max_articles:
+                kept[i] = len(url_tuples)
+                url_tuples.append(candidates[i])
+                alternates.append([])
+        elif r in kept:
+            if _canonical(url) != _canonical(candidates[r][1]):
+                alternates[kept[r]].append((source, url))
+            # 중복 제거가 없었다면 내려받았을 항목만 절약으로 센다
+            if i < max_articles:
+                trace.duplicates += 1
+                trace.fetches_saved += 1
+                trace.prompt_chars_saved += context_chars(title, rss_summary[:400])
+    # 내려받지 않는 다른 매체 링크는 백그라운드에서 언론사 주소를 알아 둔다
+    get_url_resolver().resolve_later(url for alts in alternates for _, url in alts)
+    return url_tuples, alternates
+
+
+def _canonical(url: str) -> str:
+    """풀어 둔 언론사 주소(모르면 원래 링크)의 정규화 URL"""
+    return canonical_url(get_url_resolver().target(url))
+
+
+def _attach_links(article: NewsArticle, alternates: list[tuple[str, str]]) -> NewsArticle:
+    """기사에 정규 주소와 다른 매체 목록(가능하면 언론사 주소로)을 붙임"""
+    article.canonical_url = _canonical(article.url)
+    article.alternates = [(source, _canonical(url)) for source, url in alternates]
+    return article
 
-        soup = BeautifulSoup(html, "lxml")
-        page_title = _get_title(soup, url)
-        body_text = _get_article_text(soup)
-        page_summary = _build_summary(soup, body_text, page_title)
 
-        title = title_from_rss if _is_generic_title(page_title) else (page_title or title_from_rss)
-        if not title:
-            title = title_from_rss or "제목 없음"
+def _merge_duplicate_bodies(prepared: list[tuple[NewsArticle, str, str]], trace: CrawlTrace) -> set[int]:
+    """
+    본문 지문이 가까운 기사들을 앞 순번 기사로 합침 (다른 매체 목록을 옮김).
+    합쳐져 빠지는 기사의 순번 집합 반환.
+    """
+    reps = cluster([body_fingerprint(article.raw_text) for article, _, _ in prepared], BODY_MAX_DISTANCE)
+    dropped: set[int] = set()
+    for i, r in enumerate(reps):
+        if r == i:
+            continue
+        article, keep = prepared[i][0], prepared[r][0]
+        keep.alternates.append((article.source, article.canonical_url or article.url))
+        keep.alternates.extend(article.alternates)
+        dropped.add(i)
+        trace.duplicates += 1
+        trace.prompt_chars_saved += context_chars(article.title, article.summary)
+        if article.trace is not None:
+            article.trace.fallback("merged_duplicate")
+    return dropped
+
 
-        if page_summary and len(page_summary.strip()) > 50 and page_summary != title:
-            summary = page_summary[:400]
-        elif rss_summary and len(rss_summary.strip()) > 20:
-            summary = rss_summary[:400]
+def _reuse_stored(
+    url_tuples: list[tuple[str, str, str, str]],
+    trace: CrawlTrace,
+    incremental: bool,
+) -> tuple[dict[int, tuple[NewsArticle, str, str]], dict[int, StoredArticle]]:
+    """
+    증분 크롤: 기사 저장소에 신선하게 남아 있는 순번은 저장된 기사로 채움.
+    Returns: (순번 → 재사용한 준비된 기사, 순번 → 오래된 저장 기사(다시 받은 뒤 내용 비교용))
+    """
+    store = get_article_store() if incremental else None
+    if store is None:
+        trace.new_articles = len(url_tuples)
+        return {}, {}
+    keys = [_canonical(t[1]) for t in url_tuples]
+    found = store.lookup(keys)
+    reused: dict[int, tuple[NewsArticle, str, str]] = {}
+    stale: dict[int, StoredArticle] = {}
+    for i, key in enumerate(keys):
+        stored = found.get(key)
+        if stored is None:
+            continue
+        if not stored.fresh:
+            stale[i] = stored
+            continue
+        at = trace.articles[i]
+        at.cache = "store"
+        article = NewsArticle(
+            title=stored.title,
+            url=url_tuples[i][1],
+            summary=stored.summary,
+            keywords=list(stored.keywords),
+            source=url_tuples[i][2] or stored.source,
+            raw_text=stored.raw_text,
+            trace=at,
+        )
+        reused[i] = (article, "", "")
+    trace.reused_articles = len(reused)
+    trace.new_articles = len(url_tuples) - len(reused)
+    return reused, stale
+
+
+def _keep_unchanged_keywords(prepared: dict[int, tuple[NewsArticle, str, str]], stale: dict[int, StoredArticle]) -> set[int]:
+    """다시 받은 기사의 내용 해시가 저장된 것과 같으면 저장된 키워드를 그대로 씀. 그런 순번 집합 반환."""
+    kept: set[int] = set()
+    for i, (article, _, _) in prepared.items():
+        stored = stale.get(i)
+        if stored is not None and stored.keywords \
+                and content_hash(article.title, article.summary, article.raw_text) == stored.content_hash:
+            article.keywords = list(stored.keywords)
+            kept.add(i)
+    return kept
+
+
+def _store_articles(articles: list[NewsArticle]) -> None:
+    """새로 처리한 기사를 저장소에 넣음 (페이지를 받지 못한 기사는 다음에 다시 시도하도록 제외)"""
+    store = get_article_store()
+    if store is None:
+        return
+    store.put_many(a for a in articles if not (a.trace is not None and "page_unavailable" in a.trace.fallbacks))
+
+
+def _prepared_from_record(url_tuple: tuple[str, str, str, str], record: PageRecord, trace: Optional[ArticleTrace]) -> tuple[NewsArticle, str, str]:
+    """
+    프로세스 풀 워커가 돌려준 레코드로 준비된 기사 구성 (기록은 부모의 ArticleTrace에 합침).
+    워커가 키워드를 뽑지 않았으면(keywords None) 키워드 없는 기사.
+    """
+    title, summary, raw_text, keywords, text_for_kw, fallback_text, parse_ms, summarize_ms, keywords_ms, fallbacks = record
+    if trace is not None:
+        trace.parse_ms = round(trace.parse_ms + parse_ms, 3)
+        trace.summarize_ms = round(trace.summarize_ms + summarize_ms, 3)
+        if keywords is not None:
+            trace.keywords_ms = keywords_ms
+        for reason in fallbacks:
+            trace.fallback(reason)
+    article = NewsArticle(
+        title=title,
+        url=url_tuple[1],
+        summary=summary,
+        keywords=keywords or [],
+        source=url_tuple[2],
+        raw_text=raw_text,
+        trace=trace,
+    )
+    return article, text_for_kw, fallback_text
+
+
+def _iter_pooled(
+    url_tuples: list[tuple[str, str, str, str]],
+    trace: CrawlTrace,
+    pool,
+    keyword_method: Optional[str] = None,
+    traces: Optional[list[ArticleTrace]] = None,
+    **fetch_options,
+) -> Iterator[tuple[int, tuple[NewsArticle, str, str]]]:
+    """
+    다운로드가 끝나는 대로 HTML을 프로세스 풀에 넘기고, 처리가 끝나는 순서대로 (순번, 준비된 기사) 반환.
+    키워드는 워커에서 뽑되, 묶음 전체가 필요한 방법(tfidf)이면 여기서 기사 하나 기준으로 임시로 뽑는다
+    (IDF 표는 호출 측이 묶음 전체로 다시 뽑을 때만 갱신).
+    풀 작업이 실패한 기사는 현재 프로세스에서 처리한다.
+    traces(기본 trace.articles)는 url_tuples와 같은 순번의 기사 기록. fetch_options는 _iter_fetched로 넘긴다.
+    """
+    traces = trace.articles if traces is None else traces
+    futures: dict[Future, int] = {}
+    finished: "queue.SimpleQueue[Future]" = queue.SimpleQueue()
+    in_worker = not _keywords_depend_on_batch(keyword_method)
+
+    def finish(fut: Optional[Future], i: int, html: Optional[str]) -> tuple[NewsArticle, str, str]:
+        at = traces[i]
+        prepared = None
+        if fut is not None:
+            try:
+                record = fut.result()
+                prepared = _prepared_from_record(url_tuples[i], record, at)
+                if record[3] is not None:
+                    trace.keywords_ms = round(trace.keywords_ms + record[8], 3)
+                    return prepared
+            except Exception:
+                prepared = None
+        if prepared is None:
+            prepared = _prepare_article(url_tuples[i], html, at)
+        _apply_keywords([prepared], trace, keyword_method, provisional=not in_worker)
+        return prepared
+
+    htmls: dict[int, Optional[str]] = {}
+    with timed(trace, "fetch_ms"):
+        for i, html in _iter_fetched([t[1] for t in url_tuples], traces=traces, **fetch_options):
+            fut = submit_page(pool, url_tuples[i], html, keyword_method if in_worker else None, in_worker)
+            if fut is None:
+                yield i, finish(None, i, html)
+                continue
+            futures[fut] = i
+            htmls[i] = html
+            fut.add_done_callback(finished.put)
+            while not finished.empty():
+                done = finished.get()
+                j = futures.pop(done)
+                yield j, finish(done, j, htmls.pop(j))
+    for fut in as_completed(list(futures)):
+        i = futures.pop(fut)
+        yield i, finish(fut, i, htmls.pop(i))
+
+
+def _rescore_batch(prepared: list[tuple[NewsArticle, str, str]], trace: CrawlTrace, keyword_method: Optional[str]) -> list[int]:
+    """
+    기사별로 따로 뽑은 키워드를 묶음 전체 기준으로 다시 뽑음 (tfidf처럼 묶음에 따라 결과가 달라지는 방법일 때).
+    키워드가 바뀐 기사의 순번 목록 반환.
+    """
+    if not prepared or not _keywords_depend_on_batch(keyword_method):
+        return []
+    before = [list(article.keywords) for article, _, _ in prepared]
+    _apply_keywords(prepared, trace, keyword_method)
+    return [i for i, ((article, _, _), old) in enumerate(zip(prepared, before)) if article.keywords != old]
+
+
+def crawl_articles(
+    query: str,
+    max_articles: int = 10,
+    workers: Optional[int] = None,
+    keyword_method: Optional[str] = None,
+    dedup: bool = True,
+    incremental: Optional[bool] = None,
+) -> CrawlResult:
+    """
+    검색 키워드로 뉴스 10개 크롤링 후 각 기사별 제목, 요약, 핵심키워드 반환.
+    RSS 제목·요약을 우선 사용하고, 페이지에서 가져온 내용으로 보강.
+    dedup이면 같은 기사를 실은 여러 매체를 하나로 합친다: 다운로드 전에는 제목 지문으로,
+    본문 추출 후에는 본문 지문으로 묶고 나머지 매체는 기사의 alternates에 남긴다.
+    페이지 수집 마감 시간은 내려받을 기사 수에 맞춰 늘린다 (_crawl_deadline).
+    incremental(기본 NEWS_INCREMENTAL)이면 기사 저장소에 신선하게 남은 기사는 내려받지 않고 채우며,
+    오래된 기사는 다시 받아 내용이 같으면 저장된 키워드를 쓴다. 새로 처리한 기사는 저장소에 넣는다.
+    workers(기본 NEWS_PARSE_WORKERS)가 1 이상이면 파싱·요약·키워드 추출을 프로세스 풀에서 하며,
+    결과는 현재 프로세스에서 처리한 것과 같다.
+    keyword_method는 summarizer.extract_keywords_batch의 method (기본 NEWS_KEYWORD_METHOD).
+    결과의 .trace에 단계별 시간과 기사별 처리 기록(CrawlTrace)이 붙는다.
+    """
+    trace = CrawlTrace(query=query, max_articles=max_articles)
+    workers = PARSE_WORKERS if workers is None else workers
+    incremental = INCREMENTAL_CRAWL if incremental is None else incremental
+    with timed(trace, "total_ms"):
+        url_tuples, alternates = _collect_unique_urls(query, max_articles, trace, dedup)
+        trace.articles = [ArticleTrace(url=t[1]) for t in url_tuples]
+        by_index, stale = _reuse_stored(url_tuples, trace, incremental)
+        todo = [i for i in range(len(url_tuples)) if i not in by_index]
+        todo_tuples = [url_tuples[i] for i in todo]
+        todo_traces = [trace.articles[i] for i in todo]
+        pool = get_parse_pool(workers) if todo else None
+        if pool is not None:
+            for k, prepared in _iter_pooled(todo_tuples, trace, pool, keyword_method, todo_traces,
+                                            deadline=_crawl_deadline(len(todo))):
+                by_index[todo[k]] = prepared
         else:
-            summary = (title[:200] + "... (아래 링크에서 원문 확인)") if len(title) > 80 else f"{title} – 아래 링크에서 원문 확인"
-
-        text_for_kw = title + "\n" + (body_text or "") + " " + (rss_summary or "")
-        keywords: list[str] = _keywords(text_for_kw, 5)
-        if not keywords and (body_text or rss_summary or title):
-            from collections import Counter
-            words = re.findall(r"[가-힣a-zA-Z]{2,}", (body_text or "") + " " + (rss_summary or "") + " " + title)
-            stop = {"있다", "하다", "된다", "그리고", "그러나", "이번", "통해", "대해", "위해", "있는", "없는"}
-            keywords = [w for w, _ in Counter(words).most_common(15) if w not in stop][:5]
-
-        articles.append(NewsArticle(
-            title=title,
+            with timed(trace, "fetch_ms"):
+                htmls = _fetch_all([t[1] for t in todo_tuples], traces=todo_traces, deadline=_crawl_deadline(len(todo)))
+            by_index.update(zip(todo, _prepare_articles(todo_tuples, htmls, todo_traces)))
+        prepared = [by_index[i] for i in range(len(url_tuples))]
+        for (article, _, _), alts in zip(prepared, alternates):
+            _attach_links(article, alts)
+        kept = _keep_unchanged_keywords(by_index, stale)
+        dropped = _merge_duplicate_bodies(prepared, trace) if dedup else set()
+        processed = [prepared[i] for i in todo if i not in dropped and i not in kept]
+        if pool is not None:
+            _rescore_batch(processed, trace, keyword_method)
+        elif processed:
+            _apply_keywords(processed, trace, keyword_method)
+        if incremental:
+            _store_articles([prepared[i][0] for i in todo if i not in dropped])
+        articles = [article for i, (article, _, _) in enumerate(prepared) if i not in dropped]
+    emit(trace)
+    return CrawlResult(articles, trace)
+
+
+def is_complete(article: NewsArticle) -> bool:
+    """iter_articles가 내보낸 기사가 완성된 기사인지 (RSS 정보만 담은 임시 기사가 아닌지)"""
+    return article.trace is not None
+
+
+def iter_articles(
+    query: str,
+    max_articles: int = 10,
+    trace: Optional[CrawlTrace] = None,
+    workers: Optional[int] = None,
+    keyword_method: Optional[str] = None,
+    dedup: bool = True,
+    incremental: Optional[bool] = None,
+) -> Iterator[tuple[int, Optional[NewsArticle]]]:
+    """
+    crawl_articles의 스트리밍 버전. (순번, 기사)를 준비되는 대로 반환.
+    먼저 RSS 정보만 담은 임시 기사(증분 모드에서 저장소에 있던 기사는 완성된 기사)를 순번마다 하나씩 내보내고,
+    이후 페이지 수집이 끝나는 순서대로 같은 순번의 완성된 기사를 내보낸다.
+    임시 기사는 .trace가 None이고 완성된 기사에는 처리 기록이 붙어 있다 (is_complete).
+    완성된 기사의 키워드는 기사 하나 기준으로 바로 뽑는다 (화면에 먼저 보이도록, KeyBERT도 기사마다 따로 임베딩).
+    tfidf처럼 묶음 전체에 따라 달라지는 방법이면 이 키워드는 임시이며 IDF 표에 넣지 않고,
+    마지막에 crawl_articles와 같은 묶음(합쳐진 중복 제외)으로 다시 뽑는다.
+    마지막에 본문 중복으로 합쳐진 순번은 (순번, None)으로 알리고, 다른 매체 목록이 늘었거나
+    다시 뽑은 키워드가 바뀐 기사를 한 번 더 내보낸다.
+    None이 아닌 순번별 마지막 기사들을 순번 순으로 모으면 crawl_articles 결과와 같다 (키워드 포함).
+    trace를 넘기면 crawl_articles와 같은 실행 기록을 채운다.
+    workers·keyword_method·dedup·incremental은 crawl_articles와 같다.
+    """
+    trace = trace if trace is not None else CrawlTrace()
+    workers = PARSE_WORKERS if workers is None else workers
+    incremental = INCREMENTAL_CRAWL if incremental is None else incremental
+    trace.query, trace.max_articles = query, max_articles
+    start = time.perf_counter()
+    url_tuples, alternates = _collect_unique_urls(query, max_articles, trace, dedup)
+    trace.articles = [ArticleTrace(url=t[1]) for t in url_tuples]
+    by_index, stale = _reuse_stored(url_tuples, trace, incremental)
+    for i, (title_from_rss, url, source, rss_summary) in enumerate(url_tuples):
+        if i in by_index:
+            yield i, _attach_links(by_index[i][0], alternates[i])
+            continue
+        placeholder = NewsArticle(
+            title=title_from_rss or "불러오는 중",
             url=url,
-            summary=summary,
-            keywords=keywords,
+            summary=rss_summary[:400],
             source=source,
-            raw_text=(body_text or "")[:3000],
-        ))
+        )
+        yield i, _attach_links(placeholder, alternates[i])
 
-    return articles
+    todo = [i for i in range(len(url_tuples)) if i not in by_index]
+    todo_tuples = [url_tuples[i] for i in todo]
+    todo_traces = [trace.articles[i] for i in todo]
+    kept: set[int] = set()
+    batch_keywords = _keywords_depend_on_batch(keyword_method)
+
+    def finish(i: int, prepared: tuple[NewsArticle, str, str]) -> tuple[NewsArticle, str, str]:
+        _attach_links(prepared[0], alternates[i])
+        kept.update(_keep_unchanged_keywords({i: prepared}, stale))
+        by_index[i] = prepared
+        return prepared
+
+    pool = get_parse_pool(workers) if todo else None
+    if pool is not None:
+        for k, prepared in _iter_pooled(todo_tuples, trace, pool, keyword_method, todo_traces,
+                                        deadline=_crawl_deadline(len(todo))):
+            yield todo[k], finish(todo[k], prepared)[0]
+    else:
+        fetch_start = time.perf_counter()
+        for k, html in _iter_fetched([t[1] for t in todo_tuples], traces=todo_traces, deadline=_crawl_deadline(len(todo))):
+            i = todo[k]
+            prepared = finish(i, _prepare_article(url_tuples[i], html, trace.articles[i]))
+            if i not in kept:
+                _apply_keywords([prepared], trace, keyword_method, provisional=batch_keywords)
+            yield i, prepared[0]
+        trace.fetch_ms = round((time.perf_counter() - fetch_start) * 1000, 3)
+
+    ordered = [by_index[i] for i in range(len(url_tuples))]
+    alternate_counts = [len(article.alternates) for article, _, _ in ordered]
+    dropped = _merge_duplicate_bodies(ordered, trace) if dedup else set()
+    for i in sorted(dropped):
+        yield i, None
+    processed = [i for i in todo if i not in dropped and i not in kept]
+    changed = {processed[k] for k in _rescore_batch([ordered[i] for i in processed], trace, keyword_method)}
+    changed.update(
+        i for i in range(len(ordered))
+        if i not in dropped and len(ordered[i][0].alternates) != alternate_counts[i]
+    )
+    for i in sorted(changed):
+        yield i, ordered[i][0]
+    if incremental:
+        _store_articles([ordered[i][0] for i in todo if i not in dropped])
+    trace.total_ms = round((time.perf_counter() - start) * 1000, 3)
+    emit(trace)
+
+
+# crawl_many가 한 번에 내려받아 처리하는 기사 수 (키워드 배치 크기이기도 함)
+MULTI_QUERY_CHUNK_SIZE = 32
+
+
+class RateLimiter:
+    """초당 rate개 요청을 허용하는 토큰 버킷 (스레드 간 공유, 호출하면 차례가 올 때까지 대기)"""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def crawl_many(
+    queries: list[tuple[str, int]],
+    concurrency: int = MAX_CONCURRENCY,
+    rate: float = 0.0,
+    workers: Optional[int] = None,
+    keyword_method: Optional[str] = None,
+    incremental: Optional[bool] = None,
+    chunk_size: int = MULTI_QUERY_CHUNK_SIZE,
+    summary: Optional[dict] = None,
+) -> Iterator[tuple[str, int, CrawlResult]]:
+    """
+    [(검색어, 기사 수), ...]를 한 번에 크롤해 검색어의 기사가 모두 준비되는 대로 (검색어, 기사 수, 결과) 반환.
+    모든 검색어의 RSS를 동시에 받은 뒤 기사 URL을 정규 주소로 합쳐 여러 검색어에 걸친 기사는 한 번만 받고,
+    기사는 chunk_size개씩 내려받아 묶음 단위로 파싱·요약·키워드 추출한다.
+    concurrency는 동시 요청 수, rate는 RSS·기사를 합친 초당 요청 수 한도 (0이면 제한 없음).
+    workers·keyword_method·incremental은 crawl_articles와 같다. 결과는 검색어마다 crawl_articles처럼
+    본문 중복을 합치고 실행 기록(.trace)을 붙인다 (공유 기사의 다운로드 기록은 검색어들이 함께 씀).
+    summary(dict)를 넘기면 기사·공유 기사·재사용·내려받은 기사 수를 RSS 수집 뒤에, 키워드 시간을 끝까지 돈 뒤에 채운다.
+    """
+    workers = PARSE_WORKERS if workers is None else workers
+    incremental = INCREMENTAL_CRAWL if incremental is None else incremental
+    start = time.perf_counter()
+    limiter = RateLimiter(rate)
+    traces = [CrawlTrace(query=q, max_articles=n) for q, n in queries]
+
+    def collect(k: int):
+        return _collect_unique_urls(queries[k][0], queries[k][1], traces[k], limiter=limiter)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(queries)))) as executor:
+        collected = list(executor.map(collect, range(len(queries))))
+
+    # 검색어들의 기사를 정규 주소로 합침: 같은 기사는 한 번만 내려받는다
+    positions: dict[str, int] = {}
+    unique: list[tuple[str, str, str, str]] = []
+    members: list[list[int]] = []
+    for url_tuples, _ in collected:
+        members.append([])
+        for t in url_tuples:
+            pos = positions.setdefault(_canonical(t[1]), len(unique))
+            if pos == len(unique):
+                unique.append(t)
+            members[-1].append(pos)
+    refs = [0] * len(unique)
+    for member in members:
+        for pos in member:
+            refs[pos] += 1
+
+    fetch_trace = CrawlTrace(query="(batch)", max_articles=len(unique))
+    fetch_trace.articles = [ArticleTrace(url=t[1]) for t in unique]
+    done, stale = _reuse_stored(unique, fetch_trace, incremental)
+    pending = list(range(len(queries)))
+    todo = [pos for pos in range(len(unique)) if pos not in done]
+    if summary is not None:
+        summary.update({
+            "articles": sum(len(m) for m in members),
+            "unique_articles": len(unique),
+            "shared_articles": sum(len(m) for m in members) - len(unique),
+            "reused_articles": fetch_trace.reused_articles,
+            "fetched_articles": len(todo),
+            "keywords_ms": 0.0,
+        })
+
+    def ready_queries() -> Iterator[tuple[str, int, CrawlResult]]:
+        """기사가 모두 준비된 검색어의 결과"""
+        for k in [k for k in pending if all(pos in done for pos in members[k])]:
+            pending.remove(k)
+            query, max_articles = queries[k]
+            trace = traces[k]
+            trace.articles = [fetch_trace.articles[pos] for pos in members[k]]
+            # 검색어마다 다른 매체 목록·중복 합치기가 다르므로 공유 기사의 사본을 씀
+            prepared = [(replace(done[pos][0], trace=None), "", "") for pos in members[k]]
+            for (article, _, _), alts in zip(prepared, collected[k][1]):
+                _attach_links(article, alts)
+            dropped = _merge_duplicate_bodies(prepared, trace)
+            articles = [article for j, (article, _, _) in enumerate(prepared) if j not in dropped]
+            trace.total_ms = round((time.perf_counter() - start) * 1000, 3)
+            emit(trace)
+            for pos in members[k]:
+                refs[pos] -= 1
+                if refs[pos] == 0:
+                    done.pop(pos, None)
+            yield query, max_articles, CrawlResult(articles, trace)
+
+    yield from ready_queries()
+    pool = get_parse_pool(workers) if todo else None
+    for c in range(0, len(todo), max(1, chunk_size)):
+        chunk = todo[c:c + chunk_size]
+        chunk_tuples = [unique[pos] for pos in chunk]
+        chunk_traces = [fetch_trace.articles[pos] for pos in chunk]
+        fetch_options = {
+            "max_workers": concurrency,
+            "limiter": limiter,
+            "deadline": max(CRAWL_DEADLINE, len(chunk) / rate * 1.5 if rate > 0 else 0),
+        }
+        if pool is not None:
+            ready = {chunk[j]: p for j, p in _iter_pooled(chunk_tuples, fetch_trace, pool, keyword_method,
+                                                          chunk_traces, **fetch_options)}
+        else:
+            htmls = _fetch_all([t[1] for t in chunk_tuples], traces=chunk_traces, **fetch_options)
+            ready = dict(zip(chunk, _prepare_articles(chunk_tuples, htmls, chunk_traces)))
+        for (article, _, _) in ready.values():
+            article.canonical_url = _canonical(article.url)
+        kept = _keep_unchanged_keywords(ready, stale)
+        processed = [ready[pos] for pos in chunk if pos not in kept]
+        if pool is not None:
+            _rescore_batch(processed, fetch_trace, keyword_method)
+        elif processed:
+            _apply_keywords(processed, fetch_trace, keyword_method)
+        if incremental:
+            _store_articles([article for article, _, _ in ready.values()])
+        done.update(ready)
+        yield from ready_queries()
+
+    if summary is not None:
+        summary["keywords_ms"] = fetch_trace.keywords_ms
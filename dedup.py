@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+중복 기사 묶기 (SimHash 지문).
+같은 통신 기사를 여러 매체가 다시 실은 경우를 찾아 하나로 합친다.
+다운로드 전에는 RSS 제목으로, 본문 추출 후에는 본문으로 64비트 SimHash를 만들고,
+지문을 16비트씩 네 구간으로 나눈 버킷에서만 후보를 비교해 전체를 선형 시간에 처리한다.
+"""
+import re
+from typing import TYPE_CHECKING, Optional
+
+# numpy는 처음 지문을 만들 때 불러온다 (crawler를 가볍게 불러오도록)
+if TYPE_CHECKING:
+    import numpy as np
+
+SIMHASH_BITS = 64
+# 해밍 거리가 이 값 이하이면 같은 기사 (네 구간 중 하나는 반드시 일치하므로 버킷 비교로 모두 찾는다)
+TITLE_MAX_DISTANCE = 3
+BODY_MAX_DISTANCE = 3
+TITLE_SHINGLE = 2
+BODY_SHINGLE = 4
+BODY_MIN_CHARS = 200  # 이보다 짧은 본문은 지문을 만들지 않음
+
+_BANDS = 4
+_BAND_BITS = SIMHASH_BITS // _BANDS
+
+# "[속보]", "(종합)" 같은 머리표와 Google 뉴스 제목 끝의 " - 매체명"
+_TITLE_TAG_RE = re.compile(r"^\s*(?:[\[\(【<][^\]\)】>]{1,12}[\]\)】>]\s*)+")
+_TITLE_SOURCE_RE = re.compile(r"\s+[-|–]\s+[^-|–]{1,30}$")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def normalize_title(title: str) -> str:
+    title = _TITLE_TAG_RE.sub("", title or "")
+    title = _TITLE_SOURCE_RE.sub("", title)
+    return _NON_WORD_RE.sub("", title).lower()
+
+
+def _mix64(x: "np.ndarray") -> "np.ndarray":
+    """splitmix64 마무리 함수 (uint64 배열, 자리 넘침은 의도된 것)"""
+    import numpy as np
+
+    x = x ^ (x >> np.uint64(30))
+    x = x * np.uint64(0xBF58476D1CE4E5B9)
+    x = x ^ (x >> np.uint64(27))
+    x = x * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def simhash(text: str, shingle: int) -> Optional[int]:
+    """글자 shingle 단위 64비트 SimHash. 공백·문장부호는 무시. 너무 짧으면 None"""
+    text = _NON_WORD_RE.sub("", text or "").lower()
+    if len(text) < shingle + 2:
+        return None
+    import numpy as np
+
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+    h = np.zeros(len(codes) - shingle + 1, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for k in range(shingle):
+            h = _mix64(h ^ codes[k:len(codes) - shingle + 1 + k])
+        bits = ((h[:, None] >> np.arange(SIMHASH_BITS, dtype=np.uint64)) & np.uint64(1)).astype(np.int32)
+    votes = bits.sum(axis=0) * 2 - len(h)
+    return int(sum(1 << i for i in np.flatnonzero(votes > 0)))
+
+
+def _find(parent: list[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster(fingerprints: list[Optional[int]], max_distance: int) -> list[int]:
+    """
+    지문 목록을 근접 중복끼리 묶음. 각 항목이 속한 묶음의 대표(가장 앞 순번)를 반환.
+    지문이 None이면 자기 자신이 대표.
+    """
+    parent = list(range(len(fingerprints)))
+    buckets: dict[tuple[int, int], list[int]] = {}
+    mask = (1 << _BAND_BITS) - 1
+    for i, fp in enumerate(fingerprints):
+        if fp is None:
+            continue
+        for band in range(_BANDS):
+            key = (band, (fp >> (band * _BAND_BITS)) & mask)
+            for j in buckets.get(key, ()):
+                if bin(fp ^ fingerprints[j]).count("1") <= max_distance:
+                    a, b = _find(parent, i), _find(parent, j)
+                    if a != b:
+                        parent[max(a, b)] = min(a, b)
+            buckets.setdefault(key, []).append(i)
+    return [_find(parent, i) for i in range(len(fingerprints))]
+
+
+def title_fingerprint(title: str) -> Optional[int]:
+    return simhash(normalize_title(title), TITLE_SHINGLE)
+
+
+def body_fingerprint(body: str) -> Optional[int]:
+    if not body or len(body) < BODY_MIN_CHARS:
+        return None
+    return simhash(body, BODY_SHINGLE)
+
+
+def context_chars(title: str, summary: str) -> int:
+    """종합 프롬프트(content_synthesis._context_blocks)에서 기사 한 건이 차지하는 대략의 글자 수 (요점 대신 요약 길이로 어림)"""
+    return len("[기사00] \n\n\n") + len(title) + len(summary)
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+언론사 도메인별 상태 기록 (SQLite에 보관, 스레드 간 공유).
+최근 응답 시간과 성공·실패를 호스트마다 모아 적응형 타임아웃을 정하고,
+계속 실패하는(User-Agent 차단, 응답 없음 등) 호스트는 차단기를 열어 한동안 요청하지 않는다.
+차단 시간이 지나면 요청 한 건만 시험으로 보내 성공하면 다시 닫는다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+HEALTH_WINDOW = 50  # 호스트별로 기억하는 최근 요청 수
+HEALTH_MIN_SAMPLES = 5  # 이보다 적게 겪은 호스트는 기본 타임아웃·차단 비율 판단 안 함
+# 적응형 타임아웃 = p95 응답 시간 × 배수 (최소값 ~ 호출 측 기본값 사이)
+TIMEOUT_MULTIPLIER = 3.0
+MIN_TIMEOUT = 2.0
+# 연속 실패 수 또는 최근 실패 비율이 이 값 이상이면 차단기를 연다
+BREAKER_FAILURES = 3
+BREAKER_FAILURE_RATE = 0.8
+BREAKER_COOLDOWN = 10 * 60  # 처음 열릴 때 차단 시간, 다시 열릴 때마다 두 배
+BREAKER_MAX_COOLDOWN = 6 * 60 * 60
+# 응답이 p90 응답 시간(최소 이 값)보다 늦으면 같은 요청을 하나 더 보낸다 (hedging)
+HEDGE_MIN_DELAY = 0.2
+
+
+def _percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class _Host:
+    latencies: deque = field(default_factory=lambda: deque(maxlen=HEALTH_WINDOW))  # 성공 응답 시간(초)
+    outcomes: deque = field(default_factory=lambda: deque(maxlen=HEALTH_WINDOW))  # 1 성공 / 0 실패
+    consecutive_failures: int = 0
+    opened_until: float = 0.0
+    opens: int = 0  # 연속으로 열린 횟수 (차단 시간 계산용)
+
+
+class DomainHealth:
+    """호스트별 응답 시간·실패율, 적응형 타임아웃, 차단기"""
+
+    def __init__(self, path: Optional[str] = None):
+        self._lock = threading.Lock()
+        self._hosts: dict[str, _Host] = {}
+        self._trials: set[str] = set()  # 차단 시간이 지나 시험 요청 중인 호스트
+        self._counters = {"requests": 0, "failures": 0, "skipped": 0, "opened": 0, "closed": 0, "hedged": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS hosts (host TEXT PRIMARY KEY, latencies TEXT, outcomes TEXT,"
+                " consecutive_failures INTEGER, opened_until REAL, opens INTEGER, updated_at REAL)"
+            )
+            self._db.commit()
+            for host, latencies, outcomes, failures, opened_until, opens, _ in self._db.execute("SELECT * FROM hosts"):
+                state = _Host(consecutive_failures=failures or 0, opened_until=opened_until or 0.0, opens=opens or 0)
+                state.latencies.extend(json.loads(latencies or "[]"))
+                state.outcomes.extend(int(c) for c in outcomes or "")
+                self._hosts[host] = state
+
+    def _host(self, host: str) -> _Host:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _Host()
+        return state
+
+    def allow(self, host: str) -> bool:
+        """이 호스트로 지금 요청해도 되는지 (차단 시간이 지났으면 시험 요청 한 건만 허용)"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or not state.opened_until:
+                return True
+            if time.time() >= state.opened_until and host not in self._trials:
+                self._trials.add(host)
+                return True
+            self._counters["skipped"] += 1
+            return False
+
+    def timeout_for(self, host: str, default: float) -> float:
+        """최근 p95 응답 시간 × TIMEOUT_MULTIPLIER (MIN_TIMEOUT ~ default). 기록이 적으면 default"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or len(state.latencies) < HEALTH_MIN_SAMPLES:
+                return default
+            p95 = _percentile(list(state.latencies), 0.95)
+        return round(min(default, max(MIN_TIMEOUT, p95 * TIMEOUT_MULTIPLIER)), 3)
+
+    def hedge_delay(self, host: str) -> Optional[float]:
+        """두 번째 요청을 보낼 대기 시간 (p90 응답 시간). 기록이 적으면 None"""
+        with self._lock:
+            state = self._hosts.get(host)
+            if state is None or len(state.latencies) < HEALTH_MIN_SAMPLES:
+                return None
+            return max(HEDGE_MIN_DELAY, _percentile(list(state.latencies), 0.9))
+
+    def record(self, host: str, seconds: float, ok: bool) -> None:
+        """요청 한 건의 결과 기록 (차단기 열고 닫기 포함)"""
+        now = time.time()
+        with self._lock:
+            state = self._host(host)
+            self._trials.discard(host)
+            self._counters["requests"] += 1
+            state.outcomes.append(1 if ok else 0)
+            if ok:
+                state.latencies.append(round(seconds, 4))
+                state.consecutive_failures = 0
+                if state.opened_until:
+                    self._counters["closed"] += 1
+                state.opened_until, state.opens = 0.0, 0
+            else:
+                self._counters["failures"] += 1
+                state.consecutive_failures += 1
+                recent = list(state.outcomes)
+                failing = state.consecutive_failures >= BREAKER_FAILURES or (
+                    len(recent) >= HEALTH_MIN_SAMPLES and recent.count(0) / len(recent) >= BREAKER_FAILURE_RATE
+                )
+                # 시험 요청이 실패했거나 실패가 이어지면 (다시) 연다
+                if failing and now >= state.opened_until:
+                    cooldown = min(BREAKER_MAX_COOLDOWN, BREAKER_COOLDOWN * (2 ** state.opens))
+                    state.opened_until = now + cooldown
+                    state.opens += 1
+                    self._counters["opened"] += 1
+            self._save(host, state, now)
+
+    def record_hedge(self) -> None:
+        with self._lock:
+            self._counters["hedged"] += 1
+
+    def _save(self, host: str, state: _Host, now: float) -> None:
+        """lock 보유 상태에서 호출"""
+        if self._db is None:
+            return
+        try:
+            self._db.execute(
+                "INSERT OR REPLACE INTO hosts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (host, json.dumps(list(state.latencies)), "".join(str(o) for o in state.outcomes),
+                 state.consecutive_failures, state.opened_until, state.opens, now),
+            )
+            self._db.commit()
+        except Exception:
+            pass
+
+    def host_stats(self, hosts: Optional[list[str]] = None, default_timeout: float = 10.0) -> list[dict]:
+        """호스트별 상태: 요청 수, p50/p95 응답 시간(ms), 실패율, 적응형 타임아웃, 차단기 상태"""
+        now = time.time()
+        with self._lock:
+            items = [(h, self._hosts[h]) for h in (hosts or sorted(self._hosts)) if h in self._hosts]
+            snapshot = [(h, list(s.latencies), list(s.outcomes), s.opened_until, h in self._trials) for h, s in items]
+        rows = []
+        for host, latencies, outcomes, opened_until, trial in snapshot:
+            if not opened_until:
+                breaker = "closed"
+            elif trial or now >= opened_until:
+                breaker = "half-open"
+            else:
+                breaker = "open"
+            rows.append({
+                "host": host,
+                "requests": len(outcomes),
+                "p50_ms": round(_percentile(latencies, 0.5) * 1000, 1) if latencies else 0.0,
+                "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1) if latencies else 0.0,
+                "failure_rate": round(outcomes.count(0) / len(outcomes), 3) if outcomes else 0.0,
+                "timeout_s": self.timeout_for(host, default_timeout),
+                "breaker": breaker,
+                "open_for_s": round(max(0.0, opened_until - now), 1) if breaker == "open" else 0.0,
+            })
+        return rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            hosts = len(self._hosts)
+        open_hosts = [row["host"] for row in self.host_stats() if row["breaker"] == "open"]
+        return {**counters, "hosts": hosts, "open": open_hosts}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._hosts.clear()
+            self._trials.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM hosts")
+                self._db.commit()
+
+
+_health: Optional[DomainHealth] = None
+_health_lock = threading.Lock()
+
+
+def get_domain_health() -> DomainHealth:
+    """프로세스 공용 도메인 상태. 디스크를 쓸 수 없으면 메모리에만 보관."""
+    global _health
+    if _health is None:
+        with _health_lock:
+            if _health is None:
+                try:
+                    from http_cache import CACHE_DIR
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    _health = DomainHealth(os.path.join(CACHE_DIR, "domains.sqlite"))
+                except Exception:
+                    _health = DomainHealth()
+    return _health
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+기사 페이지 단일 패스 추출기.
+lxml 트리를 한 번 만들고 한 번 순회하면서 제목·메타 설명·본문 후보를 모두 수집한다.
+crawler의 BeautifulSoup 기반 함수(_get_title, _get_meta_description, _get_article_text)와 같은 결과를 낸다.
+"""
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+import lxml.html
+
+# 본문 추출 전에 제거하는 태그 (crawler._get_article_text와 동일)
+REMOVED_TAGS = frozenset({"script", "style", "nav", "footer", "aside", "form"})
+# get_text가 항상 건너뛰는 문자열 컨테이너
+_SILENT_TAGS = frozenset({"script", "style", "template"})
+
+# 본문 후보 선택자 (우선순위 순): (종류, 값)
+BODY_SELECTORS = [
+    ("tag", "article"),
+    ("itemprop", "articleBody"),
+    ("class", "article_body"),
+    ("class", "news_body"),
+    ("class", "content-body"),
+    ("class", "post-content"),
+    ("class", "article-content"),
+    ("id", "articleBody"),
+    ("class", "article-view"),
+    ("class", "news_view"),
+    ("class", "news_ct"),
+    ("id", "newsct_article"),
+]
+MAX_PARAGRAPHS = 30
+
+
+@dataclass
+class PageFields:
+    """페이지에서 뽑은 요약 재료"""
+    title: str
+    description: str
+    body_text: str
+
+
+def _container(el, inherited: Optional[str]) -> Optional[str]:
+    return el.tag if el.tag in _SILENT_TAGS else inherited
+
+
+def _strings(el, prune: bool) -> list[str]:
+    """
+    BeautifulSoup get_text와 같은 순서·범위의 텍스트 조각 (prune=True면 REMOVED_TAGS 하위 제외).
+    BeautifulSoup처럼 각 문자열은 가장 가까운 script/style/template 조상에 속하며,
+    el 자신과 같은 종류의 문자열만 모은다.
+    """
+    inherited = None
+    for anc in el.iterancestors():
+        if anc.tag in _SILENT_TAGS:
+            inherited = anc.tag
+            break
+    wanted = el.tag if el.tag in _SILENT_TAGS else None
+    own = _container(el, inherited)
+
+    out = []
+    if el.text and own == wanted:
+        out.append(el.text)
+    stack = [(iter(el), own, None)]
+    while stack:
+        it, ctx, tail = stack[-1]
+        child = next(it, None)
+        if child is None:
+            stack.pop()
+            if tail:
+                out.append(tail)
+            continue
+        tag = child.tag
+        # 꼬리 텍스트는 부모 문맥에 속한다
+        child_tail = child.tail if ctx == wanted else None
+        if isinstance(tag, str) and not (prune and tag in REMOVED_TAGS):
+            child_ctx = _container(child, ctx)
+            if child.text and child_ctx == wanted:
+                out.append(child.text)
+            stack.append((iter(child), child_ctx, child_tail))
+        elif child_tail:
+            out.append(child_tail)
+    return out
+
+
+def _get_text(el, separator: str = "", prune: bool = False) -> str:
+    return separator.join(s for s in (t.strip() for t in _strings(el, prune)) if s)
+
+
+def _match_body_selector(el, kind: str, value: str) -> bool:
+    if kind == "tag":
+        return el.tag == value
+    if kind == "class":
+        return value in (el.get("class") or "").split()
+    return el.get(kind) == value
+
+
+def extract_page(html: str) -> Optional[PageFields]:
+    """
+    HTML에서 제목, 메타 설명, 본문을 한 번의 순회로 추출.
+    파싱할 수 없는 입력이면 None (호출 측에서 BeautifulSoup 경로로 대체).
+    """
+    try:
+        root = lxml.html.document_fromstring(html)
+    except Exception:
+        return None
+
+    h1 = og_title = title_el = None
+    meta_desc = og_desc = None
+    body_candidates: list = [None] * len(BODY_SELECTORS)
+    paragraphs: list = []
+
+    # 단일 순회: REMOVED_TAGS 하위 여부를 함께 추적
+    stack = [(root, False)]
+    while stack:
+        el, removed = stack.pop()
+        tag = el.tag
+        if not isinstance(tag, str):
+            continue
+        if tag == "h1":
+            if h1 is None:
+                h1 = el
+        elif tag == "title":
+            if title_el is None:
+                title_el = el
+        if og_title is None and el.get("property") == "og:title":
+            og_title = el
+        removed = removed or tag in REMOVED_TAGS
+        if not removed:
+            if tag == "meta":
+                if meta_desc is None and el.get("name") == "description":
+                    meta_desc = el
+                if og_desc is None and el.get("property") == "og:description":
+                    og_desc = el
+            elif tag == "p" and len(paragraphs) < MAX_PARAGRAPHS:
+                paragraphs.append(el)
+            for i, (kind, value) in enumerate(BODY_SELECTORS):
+                if body_candidates[i] is None and _match_body_selector(el, kind, value):
+                    body_candidates[i] = el
+        stack.extend((child, removed) for child in reversed(el))
+
+    return PageFields(
+        title=_pick_title(h1, og_title, title_el),
+        description=_pick_description(meta_desc, og_desc),
+        body_text=_pick_body(body_candidates, paragraphs),
+    )
+
+
+def _pick_title(h1, og_title, title_el) -> str:
+    if h1 is not None:
+        text = _get_text(h1)
+        if text and 5 < len(text) < 300:
+            return text[:200]
+    if og_title is not None:
+        if og_title.get("content"):
+            return og_title.get("content").strip()
+        return _get_text(og_title)[:200]
+    if title_el is not None:
+        text = _get_text(title_el)
+        if text and 5 < len(text) < 300:
+            return text[:200]
+    return "제목 없음"
+
+
+def _pick_description(meta_desc, og_desc) -> str:
+    for el in (meta_desc, og_desc):
+        if el is not None and el.get("content"):
+            return el.get("content").strip()[:500]
+    return ""
+
+
+def _pick_body(body_candidates: list, paragraphs: list) -> str:
+    for el in body_candidates:
+        if el is None:
+            continue
+        text = _get_text(el, "\n", prune=True)
+        text = re.sub(r"\n{3,}", "\n\n", text)
+        if len(text) > 100:
+            return text[:5000]
+    if paragraphs:
+        text = "\n".join(t for t in (_get_text(p, prune=True) for p in paragraphs) if t)
+        if len(text) > 80:
+            return text[:5000]
+    return ""
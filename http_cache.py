@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""
+RSS·기사 페이지 응답을 디스크(SQLite)에 저장하는 HTTP 캐시.
+ETag/Last-Modified로 조건부 재검증하고, 용량 초과 시 오래 안 쓴 항목부터 삭제.
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+CACHE_DIR = os.environ.get("NEWS_CACHE_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+# 종류별 신선도 유지 시간(초): RSS·검색 결과는 짧게, 기사 본문은 길게
+TTL_BY_KIND = {
+    "rss": 10 * 60,
+    "search": 10 * 60,
+    "article": 3 * 24 * 60 * 60,
+}
+DEFAULT_TTL = 10 * 60
+MAX_CACHE_BYTES = 200 * 1024 * 1024
+
+
+@dataclass
+class CachedResponse:
+    """캐시에 저장된 응답 한 건"""
+    url: str
+    kind: str
+    body: bytes
+    content_type: str
+    etag: str
+    last_modified: str
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def conditional_headers(self) -> dict[str, str]:
+        """재검증용 조건부 GET 헤더"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """SQLite 기반 응답 캐시 (스레드 간 공유)"""
+
+    def __init__(self, path: str, max_bytes: int = MAX_CACHE_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"hit": 0, "miss": 0, "revalidated": 0, "refreshed": 0, "stored": 0, "evicted": 0}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY, kind TEXT, body BLOB, content_type TEXT,"
+            " etag TEXT, last_modified TEXT, expires_at REAL, last_access REAL, size INTEGER)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_access ON responses(last_access)")
+        self._conn.commit()
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """URL의 캐시 항목 (만료 여부와 무관). 접근 시각을 갱신한다."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, body, content_type, etag, last_modified, expires_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        kind, body, content_type, etag, last_modified, expires_at = row
+        return CachedResponse(url, kind, bytes(body), content_type or "", etag or "", last_modified or "", expires_at)
+
+    def store(self, url: str, kind: str, body: bytes, content_type: str = "", etag: str = "", last_modified: str = "") -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, kind, sqlite3.Binary(body), content_type, etag, last_modified,
+                 now + TTL_BY_KIND.get(kind, DEFAULT_TTL), now, len(body)),
+            )
+            self._counters["stored"] += 1
+            self._evict()
+            self._conn.commit()
+
+    def refresh(self, url: str, kind: str, etag: str = "", last_modified: str = "") -> None:
+        """304 응답 후 만료 시각(및 바뀐 검증자) 갱신"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET expires_at = ?, last_access = ?,"
+                " etag = COALESCE(NULLIF(?, ''), etag), last_modified = COALESCE(NULLIF(?, ''), last_modified)"
+                " WHERE url = ?",
+                (now + TTL_BY_KIND.get(kind, DEFAULT_TTL), now, etag, last_modified, url),
+            )
+            self._conn.commit()
+
+    def record(self, event: str) -> None:
+        """hit / miss / revalidated / refreshed 카운터 증가"""
+        with self._lock:
+            self._counters[event] = self._counters.get(event, 0) + 1
+
+    def _evict(self) -> None:
+        """용량 한도를 넘으면 마지막 접근이 오래된 항목부터 삭제 (lock 보유 상태에서 호출)"""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY last_access").fetchall()
+        victims = []
+        for url, size in rows:
+            if total <= target:
+                break
+            victims.append((url,))
+            total -= size or 0
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+        self._counters["evicted"] += len(victims)
+
+    def stats(self) -> dict:
+        """카운터와 현재 저장 항목 수·용량"""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {**self._counters, "entries": entries, "bytes": size}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+_cache: Optional[HttpCache] = None
+_cache_failed = False
+_cache_lock = threading.Lock()
+
+
+def get_http_cache() -> Optional[HttpCache]:
+    """프로세스 공용 캐시. 디렉터리를 만들 수 없는 환경이면 None (캐시 없이 동작)."""
+    global _cache, _cache_failed
+    if _cache is not None or _cache_failed:
+        return _cache
+    with _cache_lock:
+        if _cache is None and not _cache_failed:
+            try:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                _cache = HttpCache(os.path.join(CACHE_DIR, "http.sqlite"))
+            except Exception:
+                _cache_failed = True
+    return _cache
@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+백그라운드 작업 관리 (프로세스 안의 모든 Streamlit 세션이 공유).
+크롤·종합을 스크립트 스레드 밖의 워커 풀에서 실행하고, 세션은 작업 id만 들고 상태·진행·결과를 조회한다.
+위젯을 바꿔 스크립트가 다시 실행되거나 브라우저를 닫아도 작업은 끝까지 진행되며,
+끝난 작업은 건수·보관 시간 제한이 있는 공용 저장소에 남는다.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Optional
+
+JOB_WORKERS = int(os.environ.get("NEWS_JOB_WORKERS", "4"))
+JOB_MAX_ENTRIES = 256  # 보관하는 끝난 작업 수 (넘으면 오래된 것부터 삭제)
+JOB_RESULT_TTL = 60 * 60  # 끝난 작업 보관 시간(초)
+
+
+@dataclass
+class Job:
+    """작업 한 건의 상태. 워커는 report()로 진행을 알리고, 세션은 snapshot()으로 읽는다."""
+    id: str
+    kind: str  # crawl / synthesis
+    key: str  # 같은 키의 작업이 진행 중이면 새로 만들지 않고 그 작업을 공유
+    status: str = "queued"  # queued / running / done / failed
+    done: int = 0
+    total: int = 0
+    partial: Any = None  # 진행 중 결과 (크롤: {순번: (완성 여부, 기사)}, 종합: 생성 중인 블로그 글)
+    result: Any = None
+    error: str = ""
+    created_at: float = field(default_factory=time.time)
+    finished_at: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def report(self, **fields) -> None:
+        """진행 상황 갱신 (done, total, partial 등)"""
+        with self._lock:
+            for name, value in fields.items():
+                setattr(self, name, value)
+
+    def snapshot(self) -> "Job":
+        """읽는 동안 바뀌지 않는 복사본 (partial이 dict면 얕게 복사)"""
+        with self._lock:
+            partial = dict(self.partial) if isinstance(self.partial, dict) else self.partial
+            return replace(self, partial=partial, _lock=threading.Lock())
+
+
+class JobManager:
+    """워커 풀 + 작업 id별 상태 저장소"""
+
+    def __init__(self, workers: int = JOB_WORKERS, max_entries: int = JOB_MAX_ENTRIES, ttl: float = JOB_RESULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._active: dict[str, str] = {}  # 키 → 진행 중인 작업 id
+        self._counters = {"submitted": 0, "joined": 0, "done": 0, "failed": 0, "evicted": 0}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="job")
+
+    def submit(self, kind: str, key: str, fn: Callable[[Job], Any]) -> str:
+        """
+        fn(job)을 워커에서 실행하고 작업 id 반환. fn의 반환값이 결과가 된다.
+        같은 키의 작업이 대기·진행 중이면 그 작업의 id를 돌려준다.
+        """
+        with self._lock:
+            active = self._active.get(key)
+            if active is not None:
+                self._counters["joined"] += 1
+                return active
+            job = Job(id=uuid.uuid4().hex, kind=kind, key=key)
+            self._jobs[job.id] = job
+            self._active[key] = job.id
+            self._counters["submitted"] += 1
+            self._prune()
+        self._executor.submit(self._run, job, fn)
+        return job.id
+
+    def _run(self, job: Job, fn: Callable[[Job], Any]) -> None:
+        job.report(status="running")
+        try:
+            result = fn(job)
+            job.report(status="done", result=result, partial=None, finished_at=time.time())
+        except Exception as e:
+            from tracing import describe_error
+            job.report(status="failed", error=describe_error(e), partial=None, finished_at=time.time())
+        with self._lock:
+            self._active.pop(job.key, None)
+            self._counters[job.status] += 1
+
+    def get(self, job_id: Optional[str]) -> Optional[Job]:
+        """작업 상태 복사본. 모르는 id거나 보관 기간이 지나 지워졌으면 None"""
+        with self._lock:
+            job = self._jobs.get(job_id or "")
+            if job is not None and job.finished and time.time() - job.finished_at >= self.ttl:
+                self._jobs.pop(job.id, None)
+                self._counters["evicted"] += 1
+                job = None
+        return job.snapshot() if job is not None else None
+
+    def _prune(self) -> None:
+        """보관 기간이 지났거나 건수 한도를 넘는 끝난 작업 삭제, 오래된 것부터 (lock 보유 상태에서 호출)"""
+        now = time.time()
+        finished = [j for j in self._jobs.values() if j.finished]
+        excess = len(self._jobs) - self.max_entries
+        for job in finished:
+            if excess <= 0 and now - job.finished_at < self.ttl:
+                continue
+            self._jobs.pop(job.id, None)
+            self._counters["evicted"] += 1
+            excess -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "queued": sum(1 for j in jobs if j.status == "queued"),
+            "running": sum(1 for j in jobs if j.status == "running"),
+            "entries": len(jobs),
+        }
+
+
+_manager: Optional[JobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager() -> JobManager:
+    """프로세스 공용 작업 관리자"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
+
+
+def submit_crawl(query: str, max_articles: int) -> str:
+    """
+    검색어 크롤 작업 (검색어 결과 캐시를 거침). 진행 중에는 partial에 {순번: (완성 여부, 기사)},
+    done/total에 완성된 기사 수/전체 기사 수를 남긴다. 결과는 CrawlResult.
+    """
+    from crawler import is_complete
+    from result_cache import get_query_cache
+
+    def run(job: Job):
+        by_index: dict = {}
+        done: set[int] = set()
+
+        def on_article(i: int, article) -> None:
+            if article is None:  # 다른 기사와 같은 기사로 합쳐짐
+                by_index.pop(i, None)
+                done.discard(i)
+            else:
+                # 증분 크롤에서 저장소로 채운 기사는 처음부터 완성된 기사로 한 번만 온다
+                if is_complete(article):
+                    done.add(i)
+                by_index[i] = (i in done, article)
+            job.report(partial=dict(by_index), done=len(done), total=len(by_index))
+
+        return get_query_cache().get(query, max_articles, on_article=on_article)
+
+    cache_key = get_query_cache().key(query, max_articles)
+    return get_job_manager().submit("crawl", f"crawl\x1f{cache_key}", run)
+
+
+def submit_synthesis(articles: list, key: str) -> str:
+    """
+    기사 목록 종합 작업. key는 기사 목록을 구분하는 값(크롤 작업 id 등).
+    진행 중에는 partial에 생성 중인 블로그 글을 남긴다. 결과는 SynthesizedContent.
+    """
+    from content_synthesis import synthesize
+
+    def run(job: Job):
+        return synthesize(articles, on_blog=lambda blog: job.report(partial=blog))
+
+    return get_job_manager().submit("synthesis", f"synthesis\x1f{key}", run)
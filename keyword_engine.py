@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+TF-IDF 키워드 엔진과 공용 불용어·토큰화.
+한 번에 크롤한 기사 묶음 전체에서 단어·두 단어 묶음(n-gram)을 희소 행렬로 세어 TF-IDF로 점수를 매긴다.
+IDF는 지난 크롤들로 쌓은 문서 빈도 표(SQLite)와 이번 묶음을 합쳐 계산하고, 새 문서만 표에 더한다.
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+IDF_MAX_TERMS = 200_000  # 넘으면 문서 빈도가 낮은 항목부터 삭제
+IDF_MAX_DOCS = 100_000  # 이미 센 문서 해시 보관 수 (넘으면 오래된 것부터 삭제)
+TFIDF_MAX_CHARS = 3000
+# 토큰화 규칙이 바뀌면 올린다: 저장된 문서 빈도 표가 다른 규칙으로 센 것이면 비우고 다시 쌓는다
+TOKENIZER_VERSION = 2
+TFIDF_COUNTS_CACHE = 4096  # 문서별 항목 빈도 보관 수 (같은 본문은 다시 토큰화하지 않음)
+
+# 한국어·영어 공용 불용어 (빈도·TF-IDF 키워드 모두 사용)
+STOPWORDS = frozenset({
+    # 용언·부사·접속어
+    "있다", "하다", "된다", "되다", "이다", "않다", "없다", "같다", "있는", "없는", "하는", "되는", "했다", "한다",
+    "밝혔다", "말했다", "전했다", "설명했다", "강조했다", "덧붙였다", "예정이다", "것으로", "것이다", "것은", "것을",
+    "그리고", "그러나", "하지만", "또한", "또는", "및", "등", "이번", "지난", "오는", "최근", "현재", "올해", "내년",
+    "통해", "대해", "위해", "위한", "대한", "따라", "관련", "가운데", "이후", "이전", "이상", "이하", "정도", "경우",
+    "우리", "그는", "그녀는", "이날", "오늘", "어제", "기자", "뉴스", "무단", "배포", "금지", "저작권",
+    # 영어
+    "the", "and", "for", "that", "with", "this", "from", "are", "was", "were", "has", "have", "had", "its", "not",
+    "but", "said", "will", "would", "could", "also", "than", "into", "over", "about", "after", "more", "their",
+    "they", "which", "been", "who", "what", "when", "can", "our", "you", "all", "one", "new", "news",
+    "to", "of", "in", "on", "at", "by", "as", "is", "it", "be", "an", "or", "if", "so", "we", "he", "she", "his",
+    "her", "there", "these", "those", "such", "while", "where", "how", "may", "might", "should", "just", "some",
+})
+
+_WORD_RE = re.compile(r"[가-힣a-zA-Z]{2,}")
+# n-gram은 문장·줄 안에서만 만든다
+_SEGMENT_RE = re.compile(r"[.!?。\n]+")
+# 흔한 조사: 가장 긴 조사부터 떼되 어간은 두 글자 이상 남긴다
+_JOSA_RE = re.compile(r"^([가-힣]{2,}?)(?:이라고|에서|으로|에게|까지|부터|라고|은|는|이|가|을|를|의|에|로|와|과|도|만)$")
+# 명사 끝 음절과 모양이 같은 한 글자 조사 (사전 없이 떼면 민주주의→민주주, 전문가→전문이 된다)
+_AMBIGUOUS_JOSA = frozenset("이가의도로과만")
+# 끝 음절이 위 조사와 같은 세 글자 이상 명사: 이 단어 자체에서는 조사를 떼지 않는다 (두 글자 명사는 어간 길이 조건으로 보존)
+JOSA_LIKE_NOUNS = frozenset({
+    "어린이", "고양이", "원숭이", "호랑이", "맞벌이", "돈벌이",
+    "전문가", "평론가", "정치가", "사업가", "기업가", "자본가", "예술가", "소설가", "작곡가", "건축가",
+    "활동가", "운동가", "전략가", "분양가", "판매가", "공시가", "매매가", "전세가",
+    "경기도", "강원도", "제주도", "충청도", "전라도", "경상도", "충청남도", "충청북도", "전라남도", "전라북도",
+    "경상남도", "경상북도", "울릉도", "한반도",
+    "역효과",
+})
+# 이 끝말로 끝나는 네 글자 이상 단어도 명사로 본다 (민주주의·자본주의, 고속도로·고가도로)
+_JOSA_LIKE_SUFFIXES = ("주의", "도로")
+# 서술어 활용형(했다, 한다, 밝혔다고, 마련하기 등)은 키워드로 쓰지 않는다.
+# '다' 앞 음절로 용언을 가린다: 받침 ㅆ(과거형 했·됐·었·았…), 흔한 현재형(한·된·인…), 있·없, 어간 뒤의 이·하·되.
+# 바다·캐나다·판다·르완다 같은 명사는 앞 음절이 이에 해당하지 않아 남는다. '할'은 세 글자 이상(발표할)만.
+_PAST_SYLLABLES = "".join(chr(c) for c in range(0xAC00, 0xD7A4) if (c - 0xAC00) % 28 == 20)
+_PREDICATE_RE = re.compile(
+    rf"^(?:[가-힣]*(?:[{_PAST_SYLLABLES}없한된인진는난준운친킨낸본]|(?<=[가-힣])[이하되])다(?:고|며|는)?"
+    r"|[가-힣]*(?:으며|하며|하고|했고|하는|되는|하기|해야)|[가-힣]{2,}할)$"
+)
+
+
+def _is_josa_like_noun(word: str) -> bool:
+    return word in JOSA_LIKE_NOUNS or (len(word) >= 4 and word.endswith(_JOSA_LIKE_SUFFIXES))
+
+
+@lru_cache(maxsize=65536)
+def _token(word: str) -> Optional[str]:
+    """단어 → 색인어 (조사 제거). 불용어·서술어면 None"""
+    if _PREDICATE_RE.match(word):
+        return None
+    m = _JOSA_RE.match(word)
+    if m and not (len(word) - len(m.group(1)) == 1 and word[-1] in _AMBIGUOUS_JOSA and _is_josa_like_noun(word)):
+        word = m.group(1)
+    return None if word.lower() in STOPWORDS else word
+
+
+def tokenize(text: str) -> List[str]:
+    """2글자 이상 한글·영어 단어 (한글은 조사 제거), 불용어·서술어 제외"""
+    return [t for t in map(_token, _WORD_RE.findall(text)) if t]
+
+
+def frequency_keywords(text: str, top_n: int = 5) -> List[str]:
+    """빈도 기반 키워드 (다른 방법을 쓸 수 없을 때)"""
+    return [w for w, _ in Counter(tokenize(text)).most_common(top_n)]
+
+
+def _doc_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class IdfTable:
+    """
+    지난 크롤 문서들의 문서 빈도(df) 표. 메모리에 두고 SQLite에 덧붙여 저장한다.
+    같은 문서(본문 해시)는 한 번만 센다. 저장된 표의 토큰화 규칙 버전이 다르면 비우고 시작한다.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_terms: int = IDF_MAX_TERMS, max_docs: int = IDF_MAX_DOCS):
+        self.max_terms = max_terms
+        self.max_docs = max_docs
+        self._lock = threading.Lock()
+        self._df: dict[str, int] = {}
+        self._docs: dict[str, float] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS df (term TEXT PRIMARY KEY, df INTEGER NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS docs (hash TEXT PRIMARY KEY, seen_at REAL NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'tokenizer'").fetchone()
+            if row is None or row[0] != str(TOKENIZER_VERSION):
+                self._conn.execute("DELETE FROM df")
+                self._conn.execute("DELETE FROM docs")
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('tokenizer', ?)", (str(TOKENIZER_VERSION),))
+            self._conn.commit()
+            self._df = dict(self._conn.execute("SELECT term, df FROM df"))
+            self._docs = dict(self._conn.execute("SELECT hash, seen_at FROM docs"))
+
+    @property
+    def doc_count(self) -> int:
+        return len(self._docs)
+
+    def seen(self, doc_hash: str) -> bool:
+        return doc_hash in self._docs
+
+    def df(self, terms: Iterable[str]) -> List[int]:
+        get = self._df.get
+        return [get(t, 0) for t in terms]
+
+    def add(self, docs: dict[str, Iterable[str]]) -> None:
+        """{문서 해시: 문서의 고유 단어들} 중 처음 보는 문서만 df에 더함"""
+        now = time.time()
+        with self._lock:
+            new_docs = {h: terms for h, terms in docs.items() if h not in self._docs}
+            if not new_docs:
+                return
+            counts: Counter = Counter()
+            for terms in new_docs.values():
+                counts.update(terms)
+            for term, n in counts.items():
+                self._df[term] = self._df.get(term, 0) + n
+            for h in new_docs:
+                self._docs[h] = now
+            dropped_terms = self._prune_terms()
+            dropped_docs = self._prune_docs()
+            if self._conn is None:
+                return
+            try:
+                self._conn.executemany(
+                    "INSERT INTO df VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = excluded.df",
+                    [(t, self._df[t]) for t in counts if t in self._df],
+                )
+                self._conn.executemany("INSERT OR REPLACE INTO docs VALUES (?, ?)", [(h, now) for h in new_docs])
+                if dropped_terms:
+                    self._conn.executemany("DELETE FROM df WHERE term = ?", [(t,) for t in dropped_terms])
+                if dropped_docs:
+                    self._conn.executemany("DELETE FROM docs WHERE hash = ?", [(h,) for h in dropped_docs])
+                self._conn.commit()
+            except Exception:
+                pass
+
+    def _prune_terms(self) -> List[str]:
+        if len(self._df) <= self.max_terms:
+            return []
+        keep = int(self.max_terms * 0.9)
+        dropped = sorted(self._df, key=self._df.get)[:len(self._df) - keep]
+        for t in dropped:
+            del self._df[t]
+        return dropped
+
+    def _prune_docs(self) -> List[str]:
+        if len(self._docs) <= self.max_docs:
+            return []
+        keep = int(self.max_docs * 0.9)
+        dropped = sorted(self._docs, key=self._docs.get)[:len(self._docs) - keep]
+        for h in dropped:
+            del self._docs[h]
+        return dropped
+
+    def stats(self) -> dict:
+        return {"docs": len(self._docs), "terms": len(self._df)}
+
+
+_idf_table: Optional[IdfTable] = None
+_idf_table_lock = threading.Lock()
+
+
+def get_idf_table() -> IdfTable:
+    """프로세스 공용 IDF 표 (HTTP 캐시와 같은 디렉터리). 디스크를 쓸 수 없으면 메모리에만 보관."""
+    global _idf_table
+    if _idf_table is None:
+        with _idf_table_lock:
+            if _idf_table is None:
+                try:
+                    import http_cache
+                    os.makedirs(http_cache.CACHE_DIR, exist_ok=True)
+                    _idf_table = IdfTable(os.path.join(http_cache.CACHE_DIR, "idf.sqlite"))
+                except Exception:
+                    _idf_table = IdfTable()
+    return _idf_table
+
+
+_counts_cache: "OrderedDict[tuple[str, int], tuple[tuple[str, ...], tuple[int, ...]]]" = OrderedDict()
+_counts_cache_lock = threading.Lock()
+
+
+def _term_counts(text: str, doc_hash: str, max_ngram: int) -> tuple[tuple[str, ...], tuple[int, ...]]:
+    """
+    문서의 (항목들, 빈도들), 항목은 문서 안 첫 등장 순서. 단어와 n-gram은 문장·줄 안에서만 만든다.
+    크롤마다 같은 기사를 다시 점수 매기므로(_rescore_batch) 본문 해시별로 보관해 토큰화를 건너뛴다.
+    """
+    key = (doc_hash, max_ngram)
+    with _counts_cache_lock:
+        found = _counts_cache.get(key)
+        if found is not None:
+            _counts_cache.move_to_end(key)
+            return found
+    grams: List[str] = []
+    for segment in _SEGMENT_RE.split(text):
+        tokens = tokenize(segment)
+        grams += tokens
+        for n in range(2, max_ngram + 1):
+            grams += map(" ".join, zip(*(tokens[k:] for k in range(n))))
+    counts = Counter(grams)
+    found = (tuple(counts), tuple(counts.values()))
+    with _counts_cache_lock:
+        _counts_cache[key] = found
+        while len(_counts_cache) > TFIDF_COUNTS_CACHE:
+            _counts_cache.popitem(last=False)
+    return found
+
+
+def tfidf_keywords_batch(
+    texts: List[str],
+    top_n: int = 5,
+    max_ngram: int = 2,
+    table: Optional[IdfTable] = None,
+    update: bool = True,
+) -> List[List[str]]:
+    """
+    기사 묶음의 TF-IDF 키워드.
+    단어와 이웃 단어 묶음(최대 max_ngram개)을 (문서, 항목) 희소 좌표로 센 뒤 NumPy로 한 번에 점수를 낸다.
+    문서별 빈도는 본문 해시로 캐시하므로 다시 점수 매길 때는 토큰화를 하지 않는다.
+    IDF = log((1 + N) / (1 + df)) + 1, N·df는 표의 문서와 이번 묶음에서 처음 보는 문서를 합친 값.
+    같은 문서 묶음이면 표에 이미 들어 있어도 결과가 같다.
+    """
+    import numpy as np
+
+    table = table if table is not None else get_idf_table()
+    docs = [(t or "")[:TFIDF_MAX_CHARS] for t in texts]
+    hashes = [_doc_hash(text) for text in docs]
+    # 문서별 빈도(본문 해시로 캐시)를 (문서, 항목) 희소 좌표로 이어 붙인다
+    grams_all: List[str] = []
+    counts_all: List[int] = []
+    doc_sizes: List[int] = []
+    for text, h in zip(docs, hashes):
+        grams, counts = _term_counts(text, h, max_ngram)
+        grams_all.extend(grams)
+        counts_all.extend(counts)
+        doc_sizes.append(len(grams))
+    if not grams_all:
+        return [[] for _ in docs]
+
+    terms = list(dict.fromkeys(grams_all))
+    index = {g: i for i, g in enumerate(terms)}
+    n_terms = len(terms)
+    pair_term = np.fromiter(map(index.__getitem__, grams_all), dtype=np.int64, count=len(grams_all))
+    pair_doc = np.repeat(np.arange(len(docs)), doc_sizes)
+    counts = np.array(counts_all, dtype=np.float64)
+    # 문서 안 첫 등장 순서 (동점일 때 앞에 나온 항목 우선)
+    first_pos = np.arange(len(grams_all)) - np.repeat(np.cumsum(doc_sizes) - doc_sizes, doc_sizes)
+    # 한 번만 나온 n-gram은 우연한 조합으로 보고 제외
+    is_unigram = np.fromiter((" " not in g for g in terms), dtype=bool, count=n_terms)
+    keep = is_unigram[pair_term] | (counts >= 2)
+
+    # 표에 없는 문서만 새로 센다 (묶음 안의 같은 문서는 한 번)
+    counted: set[str] = set()
+    new_doc = np.zeros(len(docs), dtype=bool)
+    for d, (text, h) in enumerate(zip(docs, hashes)):
+        if text and h not in counted and not table.seen(h):
+            counted.add(h)
+            new_doc[d] = True
+    batch_new_df = np.bincount(pair_term[new_doc[pair_doc] & keep], minlength=n_terms)
+    n_docs = table.doc_count + len(counted)
+    df = np.array(table.df(terms), dtype=np.float64) + batch_new_df
+    idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+    scores = np.where(keep, (1.0 + np.log(counts)) * idf[pair_term], -np.inf)
+
+    order = np.lexsort((first_pos, -scores, pair_doc))
+    order = order[keep[order]]
+    sorted_doc = pair_doc[order]
+    starts = np.searchsorted(sorted_doc, np.arange(len(docs)), side="left")
+    ends = np.searchsorted(sorted_doc, np.arange(len(docs)), side="right")
+    results = [[terms[pair_term[k]] for k in order[s:min(e, s + top_n)]] for s, e in zip(starts, ends)]
+
+    if update and counted:
+        # 좌표는 문서 순서대로 이어 붙였으므로 문서별 구간이 연속 (제외한 n-gram은 표에 넣지 않음)
+        doc_ends = np.cumsum(doc_sizes)
+        doc_starts = doc_ends - doc_sizes
+        table.add({
+            hashes[d]: [terms[t] for t in pair_term[doc_starts[d]:doc_ends[d]][keep[doc_starts[d]:doc_ends[d]]]]
+            for d in np.flatnonzero(new_doc)
+        })
+    return results
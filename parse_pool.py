@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+"""
+기사 페이지 파싱·요약·키워드 추출용 프로세스 풀 (선택 사용).
+GIL 때문에 한 코어만 쓰는 HTML 파싱과 요약을 여러 코어로 나눈다.
+워커는 기동 시 summarizer 모델을 한 번 불러 두고(warm), 원본 HTML을 받아
+제목·요약·본문·키워드만 담은 작은 레코드를 돌려준다.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+
+# 0이면 프로세스 풀 없이 현재 프로세스에서 처리 (기본값)
+PARSE_WORKERS = int(os.environ.get("NEWS_PARSE_WORKERS", "0") or 0)
+
+# (제목, 요약, 본문, 키워드 또는 None, 키워드용 텍스트, 대체 키워드용 텍스트,
+#  parse_ms, summarize_ms, keywords_ms, fallbacks)
+PageRecord = tuple[str, str, str, Optional[list[str]], str, str, float, float, float, list[str]]
+
+
+def _warm_worker() -> None:
+    """워커 초기화: 무거운 모듈과 키워드 모델을 미리 로드"""
+    from startup import warm_models
+    warm_models()
+
+
+def _ping() -> int:
+    # 한 워커가 모든 요청을 가져가지 않도록 잠시 붙잡아 둠
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def process_page(
+    url_tuple: tuple[str, str, str, str],
+    html: Optional[str],
+    keyword_method: Optional[str] = None,
+    with_keywords: bool = True,
+) -> PageRecord:
+    """
+    워커에서 실행: 현재 프로세스 경로(_prepare_article → _apply_keywords)와 같은 처리를 하고
+    NewsArticle 대신 필드만 돌려준다.
+    with_keywords=False면 키워드는 부모가 묶음 단위로 뽑는다 (keywords None).
+    """
+    from crawler import _apply_keywords, _prepare_article
+    from tracing import ArticleTrace
+
+    trace = ArticleTrace(url=url_tuple[1])
+    article, text_for_kw, fallback_text = prepared = _prepare_article(url_tuple, html, trace)
+    if with_keywords:
+        _apply_keywords([prepared], method=keyword_method)
+    return (
+        article.title, article.summary, article.raw_text, article.keywords if with_keywords else None,
+        text_for_kw, fallback_text,
+        trace.parse_ms, trace.summarize_ms, trace.keywords_ms, trace.fallbacks,
+    )
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    workers개 워커의 공용 프로세스 풀 (요청 수가 바뀌면 새로 만듦).
+    spawn으로 시작해 부모의 스레드·연결 상태를 물려받지 않는다. 만들 수 없으면 None.
+    """
+    global _pool, _pool_workers
+    if workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False, cancel_futures=True)
+            try:
+                _pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+                _pool_workers = workers
+            except Exception:
+                _pool, _pool_workers = None, 0
+        return _pool
+
+
+def warm_parse_pool(workers: int = PARSE_WORKERS) -> int:
+    """워커를 모두 기동하고 초기화가 끝날 때까지 대기. 기동된 워커 프로세스 수 반환."""
+    pool = get_parse_pool(workers)
+    if pool is None:
+        return 0
+    try:
+        return len({f.result() for f in [pool.submit(_ping) for _ in range(workers * 2)]})
+    except Exception:
+        discard_parse_pool()
+        return 0
+
+
+def submit_page(
+    pool: ProcessPoolExecutor,
+    url_tuple: tuple[str, str, str, str],
+    html: Optional[str],
+    keyword_method: Optional[str] = None,
+    with_keywords: bool = True,
+) -> Optional[Future]:
+    try:
+        return pool.submit(process_page, url_tuple, html, keyword_method, with_keywords)
+    except Exception:
+        # 풀이 깨졌으면(워커 비정상 종료 등) 버리고 다음 호출에서 새로 만든다
+        discard_parse_pool()
+        return None
+
+
+def discard_parse_pool() -> None:
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool, _pool_workers = None, 0
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+검색어 단위 크롤 결과 캐시 (프로세스 안의 모든 Streamlit 세션이 공유).
+(정규화한 검색어, 기사 수)를 키로 TTL 동안 결과를 재사용하고,
+같은 요청이 동시에 들어오면 크롤 한 번만 실행해 모두 그 결과를 기다린다(single-flight).
+TTL이 지난 결과는 STALE_TTL까지는 그대로 돌려주면서 백그라운드에서 새로 고친다.
+SQLite에 저장해 재시작 후에도 유지할 수 있다.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from crawler import CrawlResult, NewsArticle, crawl_articles, iter_articles
+from tracing import CrawlTrace
+
+QUERY_CACHE_TTL = 10 * 60
+QUERY_CACHE_STALE_TTL = 60 * 60
+QUERY_CACHE_MAX_ENTRIES = 256
+# "0"이면 메모리에만 보관
+QUERY_CACHE_PERSIST = os.environ.get("NEWS_QUERY_CACHE_PERSIST", "1") != "0"
+
+# (순번, 기사) — 기사가 None이면 그 순번은 중복으로 합쳐져 빠짐
+ArticleCallback = Callable[[int, Optional[NewsArticle]], None]
+
+
+def normalize_query(query: str) -> str:
+    """공백·유니코드 정규화와 대소문자 무시"""
+    return " ".join(unicodedata.normalize("NFC", query).split()).casefold()
+
+
+def crawl_with_progress(query: str, max_articles: int, on_article: Optional[ArticleCallback] = None) -> CrawlResult:
+    """on_article이 있으면 iter_articles로 진행 상황을 알리며 크롤, 없으면 crawl_articles"""
+    if on_article is None:
+        return crawl_articles(query, max_articles=max_articles)
+    trace = CrawlTrace()
+    by_index: dict[int, NewsArticle] = {}
+    for i, article in iter_articles(query, max_articles=max_articles, trace=trace):
+        if article is None:
+            by_index.pop(i, None)
+        else:
+            by_index[i] = article
+        on_article(i, article)
+    return CrawlResult([by_index[i] for i in sorted(by_index)], trace)
+
+
+@dataclass
+class _Entry:
+    value: CrawlResult
+    created_at: float
+
+
+class _Flight:
+    """진행 중인 크롤 한 건 (대기자들이 event로 완료를 기다림)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Optional[CrawlResult] = None
+        self.error: Optional[BaseException] = None
+
+
+class QueryResultCache:
+    """검색어 결과 캐시 + single-flight 중복 제거"""
+
+    def __init__(
+        self,
+        loader: Callable[[str, int, Optional[ArticleCallback]], CrawlResult] = crawl_with_progress,
+        ttl: float = QUERY_CACHE_TTL,
+        stale_ttl: float = QUERY_CACHE_STALE_TTL,
+        max_entries: int = QUERY_CACHE_MAX_ENTRIES,
+        db_path: Optional[str] = None,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.stale_ttl = max(stale_ttl, ttl)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self._counters = {"hit": 0, "stale": 0, "miss": 0, "joined": 0, "refresh": 0, "error": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, created_at REAL, payload BLOB)")
+            self._db.commit()
+
+    @staticmethod
+    def key(query: str, max_articles: int) -> str:
+        return f"{normalize_query(query)}\x1f{max_articles}"
+
+    def get(self, query: str, max_articles: int, on_article: Optional[ArticleCallback] = None) -> CrawlResult:
+        """
+        캐시된 결과 또는 새 크롤 결과.
+        이 호출이 크롤을 맡게 되면 on_article로 진행 상황을 알린다 (다른 요청의 크롤을 기다리는 경우는 제외).
+        """
+        key = self.key(query, max_articles)
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                age = time.time() - entry.created_at
+                if age < self.ttl:
+                    self._counters["hit"] += 1
+                    return entry.value
+                if age < self.stale_ttl:
+                    self._counters["stale"] += 1
+                    self._refresh_in_background(key, query, max_articles)
+                    return entry.value
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counters["miss"] += 1
+            else:
+                self._counters["joined"] += 1
+        if leader:
+            self._run(key, flight, query, max_articles, on_article)
+        else:
+            flight.event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def put(self, query: str, max_articles: int, value: CrawlResult) -> None:
+        """다른 곳(배치 크롤 등)에서 얻은 결과를 미리 넣어 둠. 빈 결과는 넣지 않는다."""
+        if value:
+            self._store(self.key(query, max_articles), value)
+
+    def _lookup(self, key: str) -> Optional[_Entry]:
+        """메모리 → SQLite 순으로 조회 (lock 보유 상태에서 호출)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            return entry
+        if self._db is None:
+            return None
+        try:
+            row = self._db.execute("SELECT created_at, payload FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = _Entry(pickle.loads(row[1]), row[0])
+        except Exception:
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def _remember(self, key: str, entry: _Entry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _store(self, key: str, value: CrawlResult) -> None:
+        entry = _Entry(value, time.time())
+        with self._lock:
+            self._remember(key, entry)
+            if self._db is None:
+                return
+            try:
+                self._db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                 (key, entry.created_at, sqlite3.Binary(pickle.dumps(value))))
+                self._db.execute("DELETE FROM results WHERE created_at < ?", (entry.created_at - self.stale_ttl,))
+                self._db.commit()
+            except Exception:
+                pass
+
+    def _run(self, key: str, flight: _Flight, query: str, max_articles: int, on_article: Optional[ArticleCallback]) -> None:
+        try:
+            flight.value = self.loader(query, max_articles, on_article)
+            # 빈 결과(RSS 실패 등)는 저장하지 않아 다음 요청이 다시 시도하게 함
+            if flight.value:
+                self._store(key, flight.value)
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self._counters["error"] += 1
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.event.set()
+
+    def _refresh_in_background(self, key: str, query: str, max_articles: int) -> None:
+        """만료된 항목 새로 고침 (이미 진행 중이면 생략, lock 보유 상태에서 호출)"""
+        if key in self._flights:
+            return
+        flight = self._flights[key] = _Flight()
+        self._counters["refresh"] += 1
+        threading.Thread(target=self._run, args=(key, flight, query, max_articles, None), daemon=True).start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "entries": len(self._entries), "in_flight": len(self._flights)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+
+_query_cache: Optional[QueryResultCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> QueryResultCache:
+    """프로세스 공용 검색어 캐시. 디스크를 쓸 수 없으면 메모리에만 보관."""
+    global _query_cache
+    if _query_cache is None:
+        with _query_cache_lock:
+            if _query_cache is None:
+                db_path = None
+                if QUERY_CACHE_PERSIST:
+                    try:
+                        from http_cache import CACHE_DIR
+                        os.makedirs(CACHE_DIR, exist_ok=True)
+                        db_path = os.path.join(CACHE_DIR, "queries.sqlite")
+                    except Exception:
+                        db_path = None
+                try:
+                    _query_cache = QueryResultCache(db_path=db_path)
+                except Exception:
+                    _query_cache = QueryResultCache()
+    return _query_cache
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+앱 기동 준비: 무거운 모듈 지연 로드와 백그라운드 예열.
+app.py·crawler.py는 가볍게 불러오고, 앱이 뜨자마자 백그라운드 스레드에서 HTTP·파싱 라이브러리,
+요약(numpy), 키워드 모델(KeyBERT), OpenAI 클라이언트를 미리 불러 첫 검색이 기다리지 않게 한다.
+선택 의존성은 한 번 불러 본 결과(성공·실패)를 기억해 호출마다 다시 시도하지 않고,
+불러오기·예열에 걸린 시간을 단계별로 기록한다.
+
+    python startup.py      # 예열을 바로 실행하고 단계별 시간을 JSON으로 출력
+"""
+import importlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from types import ModuleType
+from typing import Iterator, Optional
+
+# "0"이면 앱 기동 시 백그라운드 예열을 하지 않음 (첫 검색에서 필요한 것만 불러옴)
+WARMUP_ON_START = os.environ.get("NEWS_WARMUP", "1") != "0"
+
+# 예열할 때 요약·키워드 모델에 한 번 넣어 보는 문장
+_WARMUP_TEXT = (
+    "정부는 인공지능 산업 육성을 위한 새로운 법안을 발표했다. "
+    "업계는 규제 완화와 투자 확대를 환영했다. "
+    "전문가들은 데이터 보호 장치도 함께 마련해야 한다고 지적했다. "
+    "법안은 다음 달 국회에서 논의될 예정이다."
+)
+
+_lock = threading.Lock()
+_modules: dict[str, Optional[ModuleType]] = {}
+_steps: dict[str, dict] = {}  # 단계 이름 → {"ms", "ok", "error"}
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_done = threading.Event()
+_loaded_at = time.time()
+
+
+def _record(step: str, ms: float, ok: bool = True, error: str = "") -> None:
+    """단계 시간 기록 (같은 단계는 처음 한 번만)"""
+    with _lock:
+        if step not in _steps:
+            _steps[step] = {"ms": round(ms, 1), "ok": ok, "error": error[:200]}
+
+
+@contextmanager
+def timed_step(step: str) -> Iterator[None]:
+    """블록 실행 시간을 step 이름으로 기록. 예외는 실패로 기록하고 다시 던진다."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        _record(step, (time.perf_counter() - start) * 1000, False, f"{type(e).__name__}: {e}")
+        raise
+    _record(step, (time.perf_counter() - start) * 1000)
+
+
+def optional_module(name: str) -> Optional[ModuleType]:
+    """
+    선택 의존성 모듈. 없거나 불러오기에 실패하면 None.
+    결과를 기억해 다시 시도하지 않으며, 처음 불러올 때 걸린 시간을 import:<이름>으로 기록한다.
+    """
+    if name in _modules:
+        return _modules[name]
+    start = time.perf_counter()
+    try:
+        module: Optional[ModuleType] = importlib.import_module(name)
+        error = ""
+    except Exception as e:
+        module, error = None, f"{type(e).__name__}: {e}"
+    _record(f"import:{name}", (time.perf_counter() - start) * 1000, module is not None, error)
+    with _lock:
+        return _modules.setdefault(name, module)
+
+
+def available(name: str) -> bool:
+    """선택 의존성을 쓸 수 있는지 (결과는 기억됨)"""
+    return optional_module(name) is not None
+
+
+def warm_models() -> None:
+    """HTTP·파싱 라이브러리와 요약·키워드 모델을 불러 한 번씩 돌려 봄 (파싱 풀 워커 초기화에도 사용)"""
+    for name in ("requests", "bs4", "lxml.html", "numpy"):
+        optional_module(name)
+    crawler = optional_module("crawler")
+    if crawler is not None:
+        crawler._get_session()
+
+    summarizer = optional_module("summarizer")
+    if summarizer is not None:
+        try:
+            with timed_step("warm:summarizer"):
+                summarizer.summarize_text(_WARMUP_TEXT)
+        except Exception:
+            pass
+        try:
+            with timed_step("warm:keywords"):
+                method = summarizer.resolve_keyword_method()
+                if method == "keybert":
+                    # 첫 추론에서 드는 지연까지 미리 치름 (IDF 표는 건드리지 않음)
+                    summarizer.get_keybert_model().extract_keywords(_WARMUP_TEXT, top_n=3)
+                elif method == "tfidf":
+                    importlib.import_module("keyword_engine").get_idf_table()
+        except Exception:
+            pass
+
+
+def warm_up() -> None:
+    """
+    무거운 모듈과 모델을 차례로 불러 둠 (현재 스레드에서 실행): warm_models, OpenAI 클라이언트, 파싱 프로세스 풀.
+    단계마다 실패해도 다음 단계로 넘어가며, 실패한 백엔드는 이후 호출에서 다시 시도하지 않는다.
+    """
+    warm_models()
+    synthesis = optional_module("content_synthesis")
+    if synthesis is not None and synthesis._read_api_key():
+        try:
+            with timed_step("warm:openai"):
+                synthesis._get_openai_client()
+        except Exception:
+            pass
+
+    parse_pool = optional_module("parse_pool")
+    if parse_pool is not None and parse_pool.PARSE_WORKERS:
+        try:
+            with timed_step("warm:parse_pool"):
+                parse_pool.warm_parse_pool(parse_pool.PARSE_WORKERS)
+        except Exception:
+            pass
+
+
+def _run_warmup() -> None:
+    try:
+        with timed_step("warmup"):
+            warm_up()
+    except Exception:
+        pass
+    finally:
+        _warmup_done.set()
+
+
+def start_warmup() -> bool:
+    """
+    백그라운드 예열 스레드 시작 (프로세스당 한 번, NEWS_WARMUP=0이면 안 함).
+    이번 호출에서 시작했으면 True.
+    """
+    global _warmup_thread
+    if not WARMUP_ON_START or _warmup_thread is not None:
+        return False
+    with _lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup_thread = threading.Thread(target=_run_warmup, name="warmup", daemon=True)
+    _warmup_thread.start()
+    return True
+
+
+def wait_for_warmup(timeout: Optional[float] = None) -> bool:
+    """예열이 끝날 때까지 기다림. 끝났으면 True (예열을 시작하지 않았으면 바로 False)"""
+    if _warmup_thread is None:
+        return False
+    return _warmup_done.wait(timeout)
+
+
+def startup_stats() -> dict:
+    """예열 상태, 단계별 시간(ms), 선택 백엔드 사용 가능 여부"""
+    with _lock:
+        steps = {name: dict(info) for name, info in _steps.items()}
+        backends = {name: module is not None for name, module in _modules.items()}
+    if _warmup_done.is_set():
+        state = "ready"
+    else:
+        state = "warming" if _warmup_thread is not None else "off"
+    return {"warmup": state, "uptime_s": round(time.time() - _loaded_at, 1), "steps": steps, "backends": backends}
+
+
+if __name__ == "__main__":
+    import json
+
+    # crawler 등이 불러오는 startup 모듈과 같은 상태를 쓰도록 모듈로 다시 불러 실행
+    import startup
+    startup._run_warmup()
+    print(json.dumps(startup.startup_stats(), ensure_ascii=False, indent=2))
@@ -2,60 +2,254 @@
 """
 한국어 텍스트 요약 및 핵심키워드 추출 (KeyBERT 등 활용)
 """
+import os
 import re
-from typing import List
+import threading
+from typing import List, Optional
 
+from startup import optional_module, timed_step
 
-def summarize_text(text: str, max_sentences: int = 3) -> str:
+KEYBERT_MODEL_NAME = "paraphrase-multilingual-MiniLM-L12-v2"
+KEYWORD_METHODS = ("auto", "keybert", "tfidf", "frequency")
+KEYWORD_METHOD = os.environ.get("NEWS_KEYWORD_METHOD", "auto")
+
+_kw_model = None
+_kw_model_failed = False
+_kw_model_lock = threading.Lock()
+
+
+def get_keybert_model():
     """
-    본문 요약. sumy 사용 시 추출적 요약, 없으면 앞문장 N개.
+    KeyBERT 모델을 프로세스당 한 번만 지연 로드해 공유.
+    keybert 미설치 또는 로드 실패 시 None (실패 결과도 캐시해 재시도하지 않음).
     """
-    if not text or len(text.strip()) < 50:
-        return text.strip()[:400]
-    text = text.strip()
-    # 문장 단위 분리 (한국어 마침표 등)
+    global _kw_model, _kw_model_failed
+    if _kw_model is not None or _kw_model_failed:
+        return _kw_model
+    with _kw_model_lock:
+        if _kw_model is None and not _kw_model_failed:
+            keybert = optional_module("keybert")
+            if keybert is not None:
+                try:
+                    with timed_step("load:keybert_model"):
+                        _kw_model = keybert.KeyBERT(model=KEYBERT_MODEL_NAME)
+                except Exception:
+                    _kw_model = None
+            _kw_model_failed = _kw_model is None
+    return _kw_model
+
+
+SUMMARY_MAX_CHARS = 400
+TEXTRANK_DAMPING = 0.85
+TEXTRANK_MAX_ITER = 50
+TEXTRANK_TOL = 1e-6
+TEXTRANK_VOCAB_BLOCK = 2048  # 문장-단어 행렬을 이만큼의 단어 열씩 나눠 만든다 (메모리: 문장 수 × 이 값)
+
+_TERM_RE = re.compile(r"[가-힣]+|[a-z]+|[0-9]+")
+
+
+def _split_sentences(text: str) -> List[str]:
+    """문장 단위 분리 (한국어 마침표 등), 10자 이하 조각은 버림"""
     sentences = re.split(r"(?<=[.!?。])\s+", text)
-    sentences = [s.strip() for s in sentences if len(s.strip()) > 10]
-    if not sentences:
-        return text[:400]
-    try:
-        from sumy.nlp.tokenizers import Tokenizer
-        from sumy.parsers.plaintext import PlaintextParser
-        from sumy.summarizers.text_rank import TextRankSummarizer
-        from sumy.nlp.stemmers import Stemmer
-        # sumy는 영어 위주이므로 한국어는 앞문장 사용
-        lang = "korean" if re.search(r"[가-힣]", text) else "english"
-        parser = PlaintextParser.from_string(text, Tokenizer(lang))
-        summarizer = TextRankSummarizer()
-        summary_sentences = summarizer(parser.document, max_sentences)
-        return " ".join(str(s) for s in summary_sentences)[:400]
-    except Exception:
-        return " ".join(sentences[:max_sentences])[:400]
-
-
-def extract_keywords(text: str, top_n: int = 5) -> List[str]:
-    """
-    핵심키워드 추출. KeyBERT multilingual 사용, 없으면 빈 리스트.
-    """
-    if not text or len(text.strip()) < 20:
-        return []
-    text = (text or "")[:3000]
-    try:
-        from keybert import KeyBERT
-        kw_model = KeyBERT(model="paraphrase-multilingual-MiniLM-L12-v2")
-        keywords = kw_model.extract_keywords(
-            text,
-            keyphrase_ngram_range=(1, 2),
-            stop_words="english",
-            top_n=top_n,
-            use_mmr=True,
-            diversity=0.6,
-        )
-        return [k for k, _ in keywords if k and len(k.strip()) > 0][:top_n]
-    except Exception:
-        pass
-    # fallback: 2글자 이상 한글/영어 빈도
-    from collections import Counter
-    words = re.findall(r"[가-힣a-zA-Z]{2,}", text)
-    stop = {"있다", "하다", "된다", "그리고", "그러나", "이번", "통해", "대해", "위해", "있는", "없는", "같다", "위한"}
-    return [w for w, _ in Counter(words).most_common(20) if w not in stop][:top_n]
+    return [s.strip() for s in sentences if len(s.strip()) > 10]
+
+
+def _sentence_terms(sentence: str) -> List[str]:
+    """
+    문장의 색인어. 한글은 조사·어미가 붙어도 겹치도록 글자 바이그램으로,
+    영문·숫자는 소문자 단어 그대로 쓴다.
+    """
+    terms: List[str] = []
+    for tok in _TERM_RE.findall(sentence.lower()):
+        if len(tok) > 1 and "가" <= tok[0] <= "힣":
+            terms.extend(tok[i:i + 2] for i in range(len(tok) - 1))
+        else:
+            terms.append(tok)
+    return terms
+
+
+def _textrank_scores(docs: List[List[str]]):
+    """
+    여러 문서의 문장 점수를 한 번에 계산.
+    문서별 (문장, 단어) 빈도를 희소 좌표로 모아 정규화한 뒤, 단어 열을 TEXTRANK_VOCAB_BLOCK개씩 나눈
+    밀집 블록의 곱을 더해 코사인 유사도를 구한다 (문장 × 전체 어휘 행렬은 만들지 않음).
+    문서들을 (문서 수 × 최대 문장 수²) 텐서로 쌓아 PageRank 반복을 한꺼번에 돌린다.
+    Returns: 문서별 문장 점수 배열 리스트
+    """
+    import numpy as np
+
+    n_docs = len(docs)
+    sizes = np.array([len(d) for d in docs])
+    n_max = int(sizes.max())
+    sim = np.zeros((n_docs, n_max, n_max), dtype=np.float64)
+    for b, sentences in enumerate(docs):
+        vocab: dict[str, int] = {}
+        rows: List[int] = []
+        cols: List[int] = []
+        for r, sentence in enumerate(sentences):
+            for term in _sentence_terms(sentence):
+                rows.append(r)
+                cols.append(vocab.setdefault(term, len(vocab)))
+        if not vocab:
+            continue
+        n, n_terms = len(sentences), len(vocab)
+        # 같은 (문장, 단어) 좌표를 합쳐 빈도로, 단어 순으로 정렬해 블록별로 자른다
+        coords, counts = np.unique(np.array(rows, dtype=np.int64) * n_terms + np.array(cols), return_counts=True)
+        r, c = coords // n_terms, coords % n_terms
+        norms = np.sqrt(np.bincount(r, weights=counts.astype(np.float64) ** 2, minlength=n))
+        weights = counts / norms[r]
+        order = np.argsort(c, kind="stable")
+        r, c, weights = r[order], c[order], weights[order]
+        bounds = np.searchsorted(c, np.arange(0, n_terms + TEXTRANK_VOCAB_BLOCK, TEXTRANK_VOCAB_BLOCK))
+        gram = np.zeros((n, n))
+        for lo, (start, end) in enumerate(zip(bounds, bounds[1:])):
+            if start == end:
+                continue
+            block = np.zeros((n, TEXTRANK_VOCAB_BLOCK))
+            block[r[start:end], c[start:end] - lo * TEXTRANK_VOCAB_BLOCK] = weights[start:end]
+            gram += block @ block.T
+        sim[b, :n, :n] = gram
+
+    idx = np.arange(n_max)
+    sim[:, idx, idx] = 0.0
+    valid = (idx[None, :] < sizes[:, None]).astype(np.float64)  # (문서, 문장) 실제 문장 여부
+    # 열 j에서 나가는 가중치 합으로 정규화; 연결이 없는 문장은 같은 문서의 모든 문장으로 균등 분배
+    out_weight = sim.sum(axis=1, keepdims=True)
+    uniform = valid[:, :, None] / sizes[:, None, None]
+    transition = np.where(out_weight > 0, sim / np.where(out_weight > 0, out_weight, 1.0), uniform)
+    teleport = (1 - TEXTRANK_DAMPING) * valid / sizes[:, None]
+    scores = valid / sizes[:, None]
+    for _ in range(TEXTRANK_MAX_ITER):
+        updated = teleport + TEXTRANK_DAMPING * np.einsum("bij,bj->bi", transition, scores)
+        if np.abs(updated - scores).max() < TEXTRANK_TOL:
+            scores = updated
+            break
+        scores = updated
+    return [scores[b, :len(d)] for b, d in enumerate(docs)]
+
+
+def summarize_texts(texts: List[str], max_sentences: int = 3) -> List[str]:
+    """
+    여러 본문을 한 번에 추출 요약 (NumPy TextRank).
+    결과는 텍스트마다 summarize_text를 따로 호출한 것과 같다.
+    numpy가 없으면 앞문장 N개.
+    """
+    results: List[Optional[str]] = [None] * len(texts)
+    ranked: List[List[str]] = []
+    ranked_idx: List[int] = []
+    for i, text in enumerate(texts):
+        if not text or len(text.strip()) < 50:
+            results[i] = (text or "").strip()[:SUMMARY_MAX_CHARS]
+            continue
+        text = text.strip()
+        sentences = _split_sentences(text)
+        if not sentences:
+            results[i] = text[:SUMMARY_MAX_CHARS]
+        elif len(sentences) <= max_sentences:
+            results[i] = " ".join(sentences)[:SUMMARY_MAX_CHARS]
+        else:
+            ranked.append(sentences)
+            ranked_idx.append(i)
+
+    if ranked:
+        try:
+            all_scores = _textrank_scores(ranked)
+        except Exception:
+            all_scores = None
+        for k, (i, sentences) in enumerate(zip(ranked_idx, ranked)):
+            if all_scores is None:
+                picked = range(max_sentences)
+            else:
+                # 점수 내림차순(동점이면 앞 문장), 원문 순서로 다시 정렬
+                order = sorted(range(len(sentences)), key=lambda j: (-all_scores[k][j], j))
+                picked = sorted(order[:max_sentences])
+            results[i] = " ".join(sentences[j] for j in picked)[:SUMMARY_MAX_CHARS]
+    return results
+
+
+def summarize_text(text: str, max_sentences: int = 3) -> str:
+    """
+    본문 요약. 문장 그래프 TextRank로 중요한 문장 N개를 원문 순서대로 뽑는다.
+    """
+    return summarize_texts([text], max_sentences=max_sentences)[0]
+
+
+def resolve_keyword_method(method: Optional[str] = None) -> str:
+    """
+    키워드 추출 방법 결정: keybert / tfidf / frequency.
+    None이면 NEWS_KEYWORD_METHOD(기본 auto), auto는 KeyBERT를 쓸 수 있으면 keybert, 아니면 tfidf.
+    """
+    method = (method or KEYWORD_METHOD or "auto").lower()
+    if method not in KEYWORD_METHODS:
+        method = "auto"
+    if method == "auto":
+        return "keybert" if get_keybert_model() is not None else "tfidf"
+    return method
+
+
+def extract_keywords(text: str, top_n: int = 5, method: Optional[str] = None) -> List[str]:
+    """
+    핵심키워드 추출. KeyBERT multilingual 사용, 없으면 TF-IDF (method로 직접 지정 가능).
+    """
+    return extract_keywords_batch([text], top_n=top_n, method=method)[0]
+
+
+def extract_keywords_batch(
+    texts: List[str], top_n: int = 5, method: Optional[str] = None, update: bool = True
+) -> List[List[str]]:
+    """
+    여러 텍스트의 핵심키워드를 한 번에 추출.
+    keybert: 문서 리스트를 한 번의 배치로 임베딩하며, 결과는 텍스트마다 따로 호출한 것과 같다.
+    tfidf: 묶음 전체와 지난 크롤들의 IDF 표로 점수를 매기므로 묶음 구성에 따라 결과가 달라진다.
+    update=False면 IDF 표에 문서를 더하지 않는다 (나중에 묶음 전체로 다시 뽑을 임시 키워드).
+    frequency: 문서 안 빈도 순.
+    KeyBERT가 실패한 텍스트는 TF-IDF로 대신한다.
+    """
+    from keyword_engine import frequency_keywords, tfidf_keywords_batch
+
+    results: List[Optional[List[str]]] = [None] * len(texts)
+    docs: List[str] = []
+    doc_idx: List[int] = []
+    for i, text in enumerate(texts):
+        if not text or len(text.strip()) < 20:
+            results[i] = []
+            continue
+        docs.append(text[:3000])
+        doc_idx.append(i)
+    if not docs:
+        return results
+
+    method = resolve_keyword_method(method)
+    if method == "frequency":
+        for i, text in zip(doc_idx, docs):
+            results[i] = frequency_keywords(text, top_n)
+        return results
+
+    kw_model = get_keybert_model() if method == "keybert" else None
+    if kw_model is not None:
+        try:
+            batch = kw_model.extract_keywords(
+                docs,
+                keyphrase_ngram_range=(1, 2),
+                stop_words="english",
+                top_n=top_n,
+                use_mmr=True,
+                diversity=0.6,
+            )
+            # 문서가 하나면 KeyBERT는 중첩 없는 리스트를 반환
+            if len(docs) == 1:
+                batch = [batch]
+            for i, keywords in zip(doc_idx, batch):
+                results[i] = [k for k, _ in keywords if k and len(k.strip()) > 0][:top_n]
+        except Exception:
+            pass
+
+    pending = [k for k, i in enumerate(doc_idx) if results[i] is None]
+    if pending:
+        try:
+            scored = tfidf_keywords_batch([docs[k] for k in pending], top_n=top_n, update=update)
+        except Exception:
+            scored = [frequency_keywords(docs[k], top_n) for k in pending]
+        for k, keywords in zip(pending, scored):
+            results[doc_idx[k]] = keywords
+    return results
@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+크롤 → 요약 → 종합 파이프라인 실행 추적.
+기사별 다운로드·파싱·요약·키워드 시간과 대체(fallback) 사유, 종합 단계의 프롬프트 크기·시간을 기록하고
+JSON Lines로 내보낸다. NEWS_TRACE_LOG 환경 변수가 있으면 그 파일에 자동으로 덧붙인다.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import IO, Iterable, Union
+
+TRACE_LOG_PATH = os.environ.get("NEWS_TRACE_LOG", "")
+
+_log_lock = threading.Lock()
+
+
+@contextmanager
+def timed(obj, attr: str):
+    """블록 소요 시간(ms)을 obj.attr에 더함 (obj가 None이면 측정만 생략)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if obj is not None:
+            setattr(obj, attr, round(getattr(obj, attr) + (time.perf_counter() - start) * 1000, 3))
+
+
+@dataclass
+class ArticleTrace:
+    """기사 한 건의 처리 기록"""
+    url: str
+    download_bytes: int = 0
+    download_ms: float = 0.0
+    http_status: int = 0
+    timeout_s: float = 0.0  # 적용한 요청 타임아웃 (도메인별 적응형)
+    cache: str = ""  # hit / miss / revalidated / refreshed / store(기사 저장소에서 재사용) / ""(캐시 없음)
+    parse_ms: float = 0.0
+    summarize_ms: float = 0.0
+    keywords_ms: float = 0.0  # 배치 추출 시간을 기사 수로 나눈 몫
+    error: str = ""
+    fallbacks: list[str] = field(default_factory=list)
+
+    def fallback(self, reason: str) -> None:
+        if reason not in self.fallbacks:
+            self.fallbacks.append(reason)
+
+
+@dataclass
+class CrawlTrace:
+    """크롤 한 번의 처리 기록"""
+    query: str = ""
+    max_articles: int = 0
+    started_at: float = field(default_factory=time.time)
+    rss_ms: float = 0.0
+    rss_items: int = 0
+    rss_source: str = ""  # rss / html / ""(결과 없음)
+    rss_feeds: int = 0  # 읽은 RSS 피드 수 (기본 + 기간·언어판 변형)
+    rss_error: str = ""
+    fetch_ms: float = 0.0
+    keywords_ms: float = 0.0
+    total_ms: float = 0.0
+    duplicates: int = 0  # 다른 기사에 합친 중복 기사 수 (다운로드 전 + 본문 비교)
+    fetches_saved: int = 0  # 다운로드 전에 걸러 아낀 페이지 요청 수
+    prompt_chars_saved: int = 0  # 종합 프롬프트에서 빠진 중복 기사 분량 (대략)
+    new_articles: int = 0  # 증분 크롤: 새로 내려받아 처리한 기사 수
+    reused_articles: int = 0  # 증분 크롤: 기사 저장소에서 채운 기사 수
+    articles: list[ArticleTrace] = field(default_factory=list)
+
+    @property
+    def fallback_count(self) -> int:
+        return sum(1 for a in self.articles if a.fallbacks)
+
+    def to_dict(self) -> dict:
+        return {"type": "crawl", **asdict(self)}
+
+
+@dataclass
+class SynthesisTrace:
+    """종합 콘텐츠 생성 한 번의 처리 기록"""
+    backend: str = ""  # openai / template
+    model: str = ""
+    articles: int = 0
+    prompt_chars: int = 0  # 결과물별 요청 프롬프트 글자 수 합
+    prompt_tokens: int = 0  # 같은 합의 대략 토큰 수
+    completion_chars: int = 0
+    requests: int = 0  # 결과물별로 나눠 동시에 보낸 요청 수
+    digests: int = 0  # 프롬프트에 요점을 담은 기사 수 (토큰 예산 안)
+    digest_ms: float = 0.0  # 기사 요점 추출·예산 맞춤 시간
+    cache: str = ""  # hit / miss / ""(캐시 미사용)
+    streamed: bool = False
+    first_token_ms: float = 0.0
+    total_ms: float = 0.0
+    started_at: float = field(default_factory=time.time)
+    error: str = ""
+
+    def to_dict(self) -> dict:
+        return {"type": "synthesis", **asdict(self)}
+
+
+def describe_error(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"[:300]
+
+
+def write_jsonl(traces: Iterable[Union[CrawlTrace, SynthesisTrace]], target: Union[str, IO[str]]) -> None:
+    """추적 기록을 한 줄에 하나씩 JSON으로 기록 (경로면 덧붙이기)"""
+    lines = to_jsonl(traces)
+    if isinstance(target, str):
+        with _log_lock, open(target, "a", encoding="utf-8") as f:
+            f.write(lines)
+    else:
+        target.write(lines)
+
+
+def to_jsonl(traces: Iterable[Union[CrawlTrace, SynthesisTrace]]) -> str:
+    return "".join(json.dumps(t.to_dict(), ensure_ascii=False) + "\n" for t in traces)
+
+
+def emit(trace: Union[CrawlTrace, SynthesisTrace]) -> None:
+    """NEWS_TRACE_LOG가 설정돼 있으면 모니터링용 로그 파일에 덧붙임 (실패는 무시)"""
+    if not TRACE_LOG_PATH:
+        return
+    try:
+        write_jsonl([trace], TRACE_LOG_PATH)
+    except Exception:
+        pass
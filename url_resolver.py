@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Google 뉴스 링크 → 언론사 기사 URL 변환 (디스크에 보관하는 대응표).
+RSS 링크(news.google.com/rss/articles/<id>)와 검색 결과 링크(news.google.com/articles/<id>)는
+같은 기사 id를 쓰므로 id를 키로 최종 주소를 기억해 두고, 다음 크롤부터는 언론사로 바로 요청한다.
+대응표는 기사를 내려받을 때 따라간 리다이렉트로 배우거나, 내려받지 않은 링크는 백그라운드에서 푼다.
+"""
+import base64
+import binascii
+import os
+import re
+import sqlite3
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+RESOLVER_MAX_ENTRIES = 50_000
+RESOLVE_TIMEOUT = 5
+RESOLVE_WORKERS = 2
+# 리다이렉트 없이 뉴스 페이지가 열리면 이만큼 읽어 언론사 링크를 찾는다
+RESOLVE_READ_BYTES = 64 * 1024
+
+NEWS_HOSTS = ("news.google.com",)
+
+_ARTICLE_PATH_RE = re.compile(r"^/(?:rss/)?articles/([A-Za-z0-9_-]+)")
+_TRACKING_PARAMS_RE = re.compile(r"^(?:utm_\w+|fbclid|gclid|ocid|cmpid)$", re.I)
+_LEGACY_URL_RE = re.compile(rb"https?://[\x21-\x7e]+")
+# Google 뉴스 중간 페이지의 언론사 주소 / meta refresh
+_DATA_AU_RE = re.compile(rb'data-n-au="(https?://[^"]+)"')
+_META_REFRESH_RE = re.compile(rb"<meta[^>]+http-equiv=[\"']?refresh[^>]+url=([^\"'>\s]+)", re.I)
+
+
+def canonical_url(url: str) -> str:
+    """
+    같은 기사를 같은 문자열로: 스킴·호스트 소문자, 기본 포트·#조각·추적용 쿼리(utm_* 등) 제거.
+    """
+    if not url:
+        return ""
+    parts = urllib.parse.urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = "&".join(
+        pair for pair in parts.query.split("&")
+        if pair and not _TRACKING_PARAMS_RE.match(pair.split("=", 1)[0])
+    )
+    return urllib.parse.urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+def _decode_article_id(article_id: str) -> Optional[str]:
+    """예전 형식의 기사 id(CBMi...)는 base64로 감싼 원문 URL을 그대로 담고 있다"""
+    try:
+        raw = base64.urlsafe_b64decode(article_id + "=" * (-len(article_id) % 4))
+    except (ValueError, binascii.Error):
+        return None
+    m = _LEGACY_URL_RE.search(raw)
+    return m.group(0).decode("ascii") if m else None
+
+
+class UrlResolver:
+    """뉴스 링크 id → 최종 기사 URL 대응표 (메모리 + SQLite, 스레드 간 공유)"""
+
+    def __init__(self, db_path: Optional[str] = None, hosts: Iterable[str] = NEWS_HOSTS,
+                 max_entries: int = RESOLVER_MAX_ENTRIES):
+        self.hosts = {h.lower() for h in hosts if h}
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._urls: "OrderedDict[str, str]" = OrderedDict()
+        self._pending: set[str] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._counters = {"hit": 0, "miss": 0, "learned": 0, "decoded": 0, "resolved": 0, "failed": 0, "evicted": 0}
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS redirects (key TEXT PRIMARY KEY, url TEXT, resolved_at REAL)")
+            self._db.commit()
+            for key, url in self._db.execute("SELECT key, url FROM redirects ORDER BY resolved_at"):
+                self._urls[key] = url
+
+    def key(self, url: str) -> Optional[str]:
+        """뉴스 링크면 기사 id, 아니면 None"""
+        parts = urllib.parse.urlsplit(url or "")
+        if parts.netloc.lower() not in self.hosts:
+            return None
+        m = _ARTICLE_PATH_RE.match(parts.path)
+        return m.group(1) if m else None
+
+    def lookup(self, url: str) -> Optional[str]:
+        """알고 있는 최종 기사 URL. 뉴스 링크가 아니거나 아직 모르면 None"""
+        key = self.key(url)
+        if key is None:
+            return None
+        with self._lock:
+            found = self._urls.get(key)
+            self._counters["hit" if found else "miss"] += 1
+        return found
+
+    def target(self, url: str) -> str:
+        """실제로 요청할 주소: 풀린 뉴스 링크는 언론사 URL, 그 외는 그대로"""
+        return self.lookup(url) or url
+
+    def learn(self, url: str, final_url: str, event: str = "learned") -> None:
+        """url을 따라가 final_url에 도착했음을 기록 (뉴스 링크가 아니거나 아직 뉴스 링크에 머물렀으면 무시)"""
+        key = self.key(url)
+        if key is None or not final_url or self.key(final_url) is not None:
+            return
+        with self._lock:
+            if self._urls.get(key) == final_url:
+                return
+            self._urls[key] = final_url
+            self._urls.move_to_end(key)
+            self._counters[event] += 1
+            evicted = []
+            while len(self._urls) > self.max_entries:
+                evicted.append(self._urls.popitem(last=False)[0])
+            self._counters["evicted"] += len(evicted)
+            if self._db is None:
+                return
+            try:
+                self._db.execute("INSERT OR REPLACE INTO redirects VALUES (?, ?, ?)", (key, final_url, time.time()))
+                self._db.executemany("DELETE FROM redirects WHERE key = ?", [(k,) for k in evicted])
+                self._db.commit()
+            except Exception:
+                pass
+
+    def resolve(self, url: str) -> Optional[str]:
+        """
+        뉴스 링크를 바로 풀어 최종 URL 반환 (네트워크 사용 가능, 실패 시 None).
+        예전 형식 id는 디코드만으로, 그 외에는 리다이렉트를 따라가고
+        리다이렉트 없이 중간 페이지가 열리면 그 안의 언론사 링크를 찾는다.
+        """
+        key = self.key(url)
+        if key is None:
+            return None
+        known = self.lookup(url)
+        if known:
+            return known
+        decoded = _decode_article_id(key)
+        if decoded:
+            self.learn(url, decoded, "decoded")
+            return decoded
+        try:
+            from crawler import _get_session
+            with _get_session().get(url, timeout=RESOLVE_TIMEOUT, stream=True, allow_redirects=True) as r:
+                final = r.url
+                if final == url and r.ok:
+                    head = r.raw.read(RESOLVE_READ_BYTES, decode_content=True) or b""
+                    m = _DATA_AU_RE.search(head) or _META_REFRESH_RE.search(head)
+                    if m:
+                        final = urllib.parse.urljoin(url, m.group(1).decode("ascii", "ignore"))
+                elif not r.ok:
+                    raise ValueError(f"HTTP {r.status_code}")
+        except Exception:
+            with self._lock:
+                self._counters["failed"] += 1
+            return None
+        self.learn(url, final, "resolved")
+        return final
+
+    def resolve_later(self, urls: Iterable[str]) -> None:
+        """모르는 뉴스 링크를 백그라운드 스레드에서 풀어 둠 (이미 진행 중인 것은 생략)"""
+        with self._lock:
+            todo = []
+            for url in urls:
+                key = self.key(url)
+                if key is None or key in self._urls or key in self._pending:
+                    continue
+                self._pending.add(key)
+                todo.append((key, url))
+            if not todo:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=RESOLVE_WORKERS, thread_name_prefix="url-resolver")
+            executor = self._executor
+        for key, url in todo:
+            executor.submit(self._resolve_pending, key, url)
+
+    def _resolve_pending(self, key: str, url: str) -> None:
+        try:
+            self.resolve(url)
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {**self._counters, "entries": len(self._urls), "pending": len(self._pending)}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._urls.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM redirects")
+                self._db.commit()
+
+
+_resolver: Optional[UrlResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_url_resolver() -> UrlResolver:
+    """
+    프로세스 공용 대응표. NEWS_BASE_URL(벤치마크 대역 서버 등)의 호스트도 뉴스 링크로 본다.
+    디스크를 쓸 수 없으면 메모리에만 보관.
+    """
+    global _resolver
+    if _resolver is None:
+        with _resolver_lock:
+            if _resolver is None:
+                hosts = list(NEWS_HOSTS)
+                base = os.environ.get("NEWS_BASE_URL")
+                if base:
+                    hosts.append(urllib.parse.urlsplit(base).netloc)
+                db_path = None
+                try:
+                    from http_cache import CACHE_DIR
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    db_path = os.path.join(CACHE_DIR, "redirects.sqlite")
+                except Exception:
+                    db_path = None
+                try:
+                    _resolver = UrlResolver(db_path, hosts)
+                except Exception:
+                    _resolver = UrlResolver(hosts=hosts)
+    return _resolver